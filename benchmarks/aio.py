@@ -0,0 +1,63 @@
+"""
+Benchmark of many concurrent searches with `AsyncSearcher`.
+
+Run it, with deepintest installed, from the root of the repository with:
+
+    python benchmarks/aio.py --searches 500 --files 50 --size 100
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+import click
+
+from corpus import generate_corpus
+from deepintest.aio import AsyncSearcher
+
+
+async def _run_searches(searcher, paths):
+    """Runs all the searches concurrently and returns the latency of each."""
+
+    async def timed_search(path):
+        start = time.perf_counter()
+        lines = await searcher.search_lines(path)
+        return time.perf_counter() - start, len(lines)
+
+    return await asyncio.gather(*map(timed_search, paths))
+
+
+# pylint: disable=no-value-for-parameter
+@click.command()
+@click.option("--searches", default=500, help="number of concurrent searches")
+@click.option("--files", default=50, help="number of distinct files searched")
+@click.option("--size", default=100, help="size of each file in KB")
+@click.option(
+    "--max-concurrency", default=64, help="maximum number of running searches"
+)
+def main(searches, files, size, max_concurrency):
+    """Times SEARCHES concurrent searches over FILES generated files."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for seed in range(files):
+            paths.append(os.path.join(tmp_dir, f"corpus{seed}.txt"))
+            generate_corpus(paths[-1], size * 1000, seed=seed)
+
+        searcher = AsyncSearcher(max_concurrency=max_concurrency)
+        paths = [paths[i % files] for i in range(searches)]
+
+        start = time.perf_counter()
+        results = asyncio.run(_run_searches(searcher, paths))
+        seconds = time.perf_counter() - start
+
+        latencies = sorted(latency for latency, _ in results)
+        print(f"searches: {searches} in {seconds:.2f} s ({searches / seconds:.1f}/s)")
+        print(f"matched lines: {sum(count for _, count in results)}")
+        print(f"throughput: {searches * size / 1000 / seconds:.1f} MB/s")
+        print(f"latency p50: {latencies[len(latencies) // 2] * 1000:.1f} ms")
+        print(f"latency p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
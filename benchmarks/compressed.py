@@ -0,0 +1,80 @@
+"""
+Benchmark of `solution` on compressed files against the decompressed file.
+
+Run it, with deepintest installed, from the root of the repository with:
+
+    python benchmarks/compressed.py --size 100
+"""
+
+import bz2
+import contextlib
+import gzip
+import lzma
+import os
+import tempfile
+import time
+
+import click
+
+from corpus import generate_corpus
+from deepintest.scripts.solution import SearchOptions, solution
+
+# the compressed formats read by TextFileReader, with their usual extension
+COMPRESSIONS = [("gzip", "gz", gzip), ("bz2", "bz2", bz2), ("xz", "xz", lzma)]
+
+
+def _time_solution(path, size):
+    """Returns the time taken by solution in seconds, its output is discarded."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            solution(path, SearchOptions(max_size=size * 2))
+            return time.perf_counter() - start
+
+
+def _compress(path, module, compressed_path):
+    """Compresses a file by chunks with a module of the standard library."""
+    with open(path, "rb") as file_obj:
+        with module.open(compressed_path, "wb") as compressed_obj:
+            for chunk in iter(lambda: file_obj.read(1 << 20), b""):
+                compressed_obj.write(chunk)
+
+
+# pylint: disable=no-value-for-parameter
+@click.command()
+@click.option("--size", default=100, help="corpus size in MB")
+@click.option("--selectivity", default=0.01, help="fraction of matched lines")
+@click.option("--repeat", default=3, help="runs of each file, the best is kept")
+def main(size, selectivity, repeat):
+    """
+    Times solution on a generated corpus, decompressed and compressed with each
+    format. The MB/s are those of the decompressed content.
+    """
+    size = size * 1000000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "corpus.txt")
+        generate_corpus(path, size, selectivity=selectivity)
+        size = os.path.getsize(path)
+        files = [("none", path)]
+
+        for name, extension, module in COMPRESSIONS:
+            compressed_path = f"{path}.{extension}"
+            _compress(path, module, compressed_path)
+            files.append((name, compressed_path))
+
+        reference = None
+        print(f"{'format':>6} {'ratio':>6} {'seconds':>8} {'MB/s':>8} {'slowdown':>8}")
+
+        for name, file_path in files:
+            seconds = min(_time_solution(file_path, size) for _ in range(repeat))
+            reference = reference or seconds
+            print(
+                f"{name:>6} {size / os.path.getsize(file_path):>6.1f} "
+                f"{seconds:>8.2f} {size / seconds / 1e6:>8.1f} "
+                f"{seconds / reference:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
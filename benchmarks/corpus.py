@@ -0,0 +1,124 @@
+"""
+Deterministic generation of corpora for the benchmarks.
+"""
+
+import random
+
+# words made of ASCII letters
+ASCII_WORDS = [
+    "the",
+    "lazy",
+    "dog",
+    "cat",
+    "sees",
+    "mary",
+    "likes",
+    "trees",
+    "up",
+    "hill",
+    "le",
+    "chat",
+    "marche",
+    "en",
+    "over",
+    "brown",
+    "fox",
+    "jumps",
+    "river",
+    "a",
+]
+
+# words with accents of the Latin-1 charset, supported by the solution
+ACCENTED_WORDS = [
+    "été",
+    "manège",
+    "enchanté",
+    "garçon",
+    "naïve",
+    "déjà",
+    "über",
+    "señor",
+    "Ærø",
+    "crème",
+    "brûlée",
+    "façade",
+]
+
+# words with characters not supported by the solution
+UNSUPPORTED_WORDS = ["9!", "--", "$$", "42", "#@", "(x)", "€", "→", "ûn", "½"]
+
+# number of distinct lines the corpus is drawn from
+POOL_SIZE = 4096
+
+# number of lines written at once
+BATCH_SIZE = 4096
+
+
+def _generate_line(rand, line_length, accent_ratio, unsupported_ratio):
+    """
+    Returns a line of random words of about `line_length` characters (between
+    half and one and a half times `line_length`).
+    """
+    length = rand.randint(max(1, line_length // 2), max(1, line_length * 3 // 2))
+    words = []
+    written = -1
+
+    while written < length:
+        draw = rand.random()
+        if draw < unsupported_ratio:
+            words.append(rand.choice(UNSUPPORTED_WORDS))
+        elif draw < unsupported_ratio + accent_ratio:
+            words.append(rand.choice(ACCENTED_WORDS))
+        else:
+            words.append(rand.choice(ASCII_WORDS))
+        written += len(words[-1]) + 1
+
+    return words
+
+
+def generate_corpus(
+    path,
+    size,
+    search_term="needle",
+    selectivity=0.01,
+    seed=0,
+    line_length=60,
+    accent_ratio=0.15,
+    unsupported_ratio=0.15,
+):
+    """
+    Writes a file of about `size` bytes made of random lines of words, followed
+    by the search term.
+
+    About `selectivity` of the lines contain the search term. The lines have
+    about `line_length` characters, about `accent_ratio` of their words have
+    accents (Latin-1) and about `unsupported_ratio` of their words have
+    characters not supported by the solution.
+
+    The lines are drawn from a pool of lines generated first, so files of
+    several GB are written at the speed of the disk. The same parameters always
+    give the same file.
+    """
+    rand = random.Random(seed)
+
+    pools = []
+    for has_term in [False, True]:
+        pool = []
+        for _ in range(POOL_SIZE):
+            words = _generate_line(rand, line_length, accent_ratio, unsupported_ratio)
+            if has_term:
+                words.insert(rand.randrange(len(words) + 1), search_term)
+            pool.append((" ".join(words) + "\n").encode("utf-8"))
+        pools.append(pool)
+
+    with open(path, "wb") as file_obj:
+        written = 0
+        while written < size:
+            matched = rand.choices([0, 1], [1 - selectivity, selectivity], k=BATCH_SIZE)
+            batch = b"".join(rand.choice(pools[has_term]) for has_term in matched)
+            # the last batch stops at the last line within the size
+            limit = batch.rfind(b"\n", 0, size - written) + 1
+            batch = batch[: limit or batch.find(b"\n") + 1]
+            file_obj.write(batch)
+            written += len(batch)
+        file_obj.write(f"{search_term}\n".encode("utf-8"))
@@ -0,0 +1,57 @@
+"""
+Benchmark of the scaling of `solution` with the number of processes.
+
+Run it, with deepintest installed, from the root of the repository with:
+
+    python benchmarks/parallel.py --size 200 --max-jobs 8
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+
+import click
+
+from corpus import generate_corpus
+from deepintest.scripts.solution import SearchOptions, solution
+
+
+def _time_solution(path, size, jobs, engine):
+    """Returns the time taken by solution in seconds, its output is discarded."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            options = SearchOptions(max_size=size * 2, engine=engine, jobs=jobs)
+            start = time.perf_counter()
+            solution(path, options)
+            return time.perf_counter() - start
+
+
+# pylint: disable=no-value-for-parameter
+@click.command()
+@click.option("--size", default=100, help="corpus size in MB")
+@click.option("--max-jobs", default=os.cpu_count(), help="maximum number of processes")
+@click.option("--engine", type=click.Choice(["stream", "mmap"]), default="stream")
+@click.option("--selectivity", default=0.01, help="fraction of matched lines")
+def main(size, max_jobs, engine, selectivity):
+    """Times solution on a generated corpus from 1 to MAX_JOBS processes."""
+    size = size * 1000000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "corpus.txt")
+        generate_corpus(path, size, selectivity=selectivity)
+
+        reference = None
+        print(f"{'jobs':>4} {'seconds':>8} {'MB/s':>8} {'speedup':>8}")
+
+        for jobs in range(1, max_jobs + 1):
+            seconds = _time_solution(path, size, jobs, engine)
+            reference = reference or seconds
+            print(
+                f"{jobs:>4} {seconds:>8.2f} {size / seconds / 1e6:>8.1f} "
+                f"{reference / seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of the latency of the search server against a process per search.
+
+Run it, with deepintest installed, from the root of the repository with:
+
+    python benchmarks/server.py --requests 1000 --clients 8 --files 20 --size 100
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from corpus import generate_corpus
+from deepintest.scripts.server import SearchClient
+
+
+def _print_latencies(name, latencies, seconds):
+    """Prints the number of requests per second and the p50/p99 latencies."""
+    latencies = sorted(latencies)
+    print(f"{name}: {len(latencies)} requests in {seconds:.2f} s", end=" ")
+    print(f"({len(latencies) / seconds:.1f}/s)")
+    print(f"  latency p50: {latencies[len(latencies) // 2] * 1000:.2f} ms")
+    print(f"  latency p99: {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+
+
+def _run_client(socket_path, paths):
+    """Sends the requests of a client and returns the latency of each."""
+    latencies = []
+    with SearchClient(socket_path) as client:
+        for path in paths:
+            start = time.perf_counter()
+            client.search(path)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+# pylint: disable=no-value-for-parameter
+@click.command()
+@click.option("--requests", default=1000, help="number of requests to the server")
+@click.option("--clients", default=8, help="number of concurrent clients")
+@click.option("--files", default=20, help="number of distinct files searched")
+@click.option("--size", default=100, help="size of each file in KB")
+@click.option("--processes", default=20, help="number of searches with a process each")
+def main(requests, clients, files, size, processes):
+    """Times REQUESTS searches of a server against PROCESSES cold searches."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for seed in range(files):
+            paths.append(os.path.join(tmp_dir, f"corpus{seed}.txt"))
+            generate_corpus(paths[-1], size * 1000, seed=seed)
+
+        command = [sys.executable, "-m", "deepintest.scripts.solution"]
+
+        latencies = []
+        start = time.perf_counter()
+        for i in range(processes):
+            before = time.perf_counter()
+            subprocess.run(command + [paths[i % files]], stdout=subprocess.DEVNULL)
+            latencies.append(time.perf_counter() - before)
+        _print_latencies("process per search", latencies, time.perf_counter() - start)
+
+        socket_path = os.path.join(tmp_dir, "socket")
+        server = subprocess.Popen(command + ["--serve", socket_path])
+
+        try:
+            while not os.path.exists(socket_path):
+                time.sleep(0.01)
+
+            requests_paths = [paths[i % files] for i in range(requests)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as executor:
+                results = executor.map(
+                    _run_client,
+                    [socket_path] * clients,
+                    [requests_paths[i::clients] for i in range(clients)],
+                )
+                latencies = [latency for result in results for latency in result]
+            _print_latencies("server", latencies, time.perf_counter() - start)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
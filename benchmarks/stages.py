@@ -0,0 +1,269 @@
+"""
+Benchmark of the throughput of each stage of the solution on a generated
+corpus, with JSON baselines to compare commits.
+
+Run it, with deepintest installed, from the root of the repository with:
+
+    python benchmarks/stages.py --size 10000 --save baseline.json
+    python benchmarks/stages.py --size 10000 --compare baseline.json
+
+The corpus parameters are saved with the results, so a comparison is only
+meaningful with the same parameters.
+"""
+
+import collections
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import find_spec
+
+import click
+
+from corpus import generate_corpus
+from deepintest._conf import solution_characters
+from deepintest.io.formatter import Formatter
+from deepintest.io.reader import TextFileReader
+from deepintest.scripts.solution import SearchOptions, solution
+from deepintest.search.cleaner import Cleaner
+from deepintest.search.matcher import Matcher
+
+STAGES = [
+    "read",
+    "match",
+    "match_many",
+    "clean[loop]",
+    "clean[translate]",
+    "clean[regex]",
+    "clean[numpy]",
+    "format",
+    "solution",
+]
+
+
+def _best_time(function, repeat):
+    """Returns the best time of `repeat` calls of a function in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run_solution(path, max_size):
+    """Runs the solution with its output discarded."""
+    stdout = sys.stdout
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        sys.stdout = devnull
+        try:
+            solution(path, SearchOptions(max_size=max_size))
+        finally:
+            sys.stdout = stdout
+
+
+def _git_commit():
+    """Returns the current git commit, or `None` outside of a repository."""
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def _time_blocks(reader, path, function, repeat):
+    """\
+    Returns the best time of `repeat` passes of a function over the line blocks
+    of a file in seconds, only the calls of the function are timed.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        seconds = 0.0
+        for lines in reader.iter_line_blocks(path):
+            start = time.perf_counter()
+            function(lines)
+            seconds += time.perf_counter() - start
+        best = min(best, seconds)
+    return best
+
+
+def run_stages(path, search_term, stages, repeat):
+    """
+    Returns the throughput of each stage on a corpus, as a `dict` of stage
+    name to seconds, MB/s and lines/s.
+
+    The reading stage handles the whole file, the other stages handle all the
+    lines (not only the matched ones), so their throughputs can be compared.
+    The stages run block by block over `TextFileReader.iter_line_blocks`, their
+    times are summed, so the memory used does not grow with the corpus.
+    """
+    size = os.path.getsize(path)
+    reader = TextFileReader(max_size=size)
+    line_count = text_size = 0
+    for lines in reader.iter_line_blocks(path):
+        line_count += len(lines)
+        text_size += sum(len(line.encode("utf-8")) + 1 for line in lines)
+    matcher = Matcher(search_term=search_term)
+    formatter = Formatter()
+
+    functions = {
+        "match": lambda lines: [line for line in lines if matcher.match(line)],
+        "match_many": matcher.match_many,
+        "format": lambda lines: list(map(formatter.format_line, lines)),
+    }
+
+    for engine in ["loop", "translate", "regex"]:
+        cleaner = Cleaner(characters=solution_characters, engine=engine)
+        functions[f"clean[{engine}]"] = lambda lines, cleaner=cleaner: list(
+            map(cleaner.clean_line, lines)
+        )
+
+    # NumPy is optional, the engine cleans all the lines of a block at once
+    if find_spec("numpy") is not None:
+        cleaner = Cleaner(characters=solution_characters, engine="numpy")
+        functions["clean[numpy]"] = cleaner.clean_lines
+
+    # the reading stage and the solution handle the whole file
+    whole_file = {
+        "read": lambda: collections.deque(reader.iter_line_blocks(path), maxlen=0),
+        "solution": lambda: _run_solution(path, size),
+    }
+
+    results = {}
+    for stage in stages:
+        if stage in whole_file:
+            seconds = _best_time(whole_file[stage], repeat)
+            stage_size = size
+        elif stage in functions:
+            seconds = _time_blocks(reader, path, functions[stage], repeat)
+            stage_size = text_size
+        else:
+            print(f"{stage:<17} skipped, NumPy is not installed", flush=True)
+            continue
+        results[stage] = {
+            "seconds": seconds,
+            "mb_per_s": stage_size / seconds / 1e6,
+            "lines_per_s": line_count / seconds,
+        }
+        print(
+            f"{stage:<17} {seconds:>9.4f} s {results[stage]['mb_per_s']:>9.1f} MB/s "
+            f"{results[stage]['lines_per_s']:>12.0f} lines/s",
+            flush=True,
+        )
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the change of throughput of each stage against a baseline and
+    returns the stages slower than the baseline by more than `threshold`.
+    """
+    if results["corpus"] != baseline["corpus"]:
+        print("warning: the corpus parameters differ from the baseline")
+
+    print(f"baseline: commit {baseline.get('commit')}, current: {results['commit']}")
+    print(f"{'stage':<17} {'baseline':>10} {'current':>10} {'change':>8}")
+    regressions = []
+
+    for stage, result in results["stages"].items():
+        if stage not in baseline["stages"]:
+            continue
+        before = baseline["stages"][stage]["mb_per_s"]
+        change = result["mb_per_s"] / before - 1
+        print(
+            f"{stage:<17} {before:>10.1f} {result['mb_per_s']:>10.1f} "
+            f"{change * 100:>+7.1f}%"
+        )
+        if change < -threshold:
+            regressions.append(stage)
+
+    return regressions
+
+
+# pylint: disable=no-value-for-parameter,too-many-arguments
+@click.command()
+@click.option("--size", default=10000, help="corpus size in KB (1 to several GB)")
+@click.option("--line-length", default=60, help="average line length in characters")
+@click.option("--selectivity", default=0.01, help="fraction of matched lines")
+@click.option("--accent-ratio", default=0.15, help="fraction of words with accents")
+@click.option(
+    "--unsupported-ratio",
+    default=0.15,
+    help="fraction of words with unsupported characters",
+)
+@click.option("--seed", default=0, help="seed of the corpus")
+@click.option(
+    "--stage",
+    "stages",
+    type=click.Choice(STAGES),
+    multiple=True,
+    help="stage to run, can be repeated (all the stages by default)",
+)
+@click.option("--repeat", default=3, help="number of runs, the best one is kept")
+@click.option("--corpus", default=None, help="path of the corpus, kept after the run")
+@click.option("--save", default=None, help="save the results as a JSON baseline")
+@click.option("--compare", "baseline", default=None, help="JSON baseline to compare")
+@click.option("--threshold", default=0.1, help="slowdown failing the comparison")
+def main(
+    size,
+    line_length,
+    selectivity,
+    accent_ratio,
+    unsupported_ratio,
+    seed,
+    stages,
+    repeat,
+    corpus,
+    save,
+    baseline,
+    threshold,
+):
+    """Times each stage of the solution on a generated corpus."""
+    parameters = {
+        "size": size * 1000,
+        "line_length": line_length,
+        "selectivity": selectivity,
+        "accent_ratio": accent_ratio,
+        "unsupported_ratio": unsupported_ratio,
+        "seed": seed,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = corpus or os.path.join(tmp_dir, "corpus.txt")
+
+        # an existing corpus is reused, it is deterministic
+        if not os.path.exists(path):
+            generate_corpus(path, search_term="needle", **parameters)
+
+        stage_results = run_stages(path, "needle", stages or STAGES, repeat)
+
+    results = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "corpus": parameters,
+        "stages": stage_results,
+    }
+
+    if save:
+        with open(save, "w", encoding="utf-8") as file_obj:
+            json.dump(results, file_obj, indent=2)
+
+    if baseline:
+        with open(baseline, encoding="utf-8") as file_obj:
+            regressions = compare(results, json.load(file_obj), threshold)
+        if regressions:
+            print(f"slower than the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
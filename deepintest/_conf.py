@@ -17,3 +17,13 @@ default_characters: Chars = [
     "ú",
     "û",
 ]
+
+# the characters supported by the solution script
+solution_characters: Chars = [
+    ("A", "Z"),
+    ("a", "z"),
+    ("À", "Ö"),
+    ("Ø", "ʯ"),
+    "ù",
+    "ú",
+]
@@ -2,6 +2,9 @@
 Typing aliases.
 """
 
+from mmap import mmap
 from typing import List, Tuple, Union
 
 Chars = List[Union[str, Tuple[str]]]
+
+Buffer = Union[bytes, mmap]
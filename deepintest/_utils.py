@@ -2,6 +2,46 @@
 Utilities functions.
 """
 
+import json
+from os import stat
+
+
 def _is_character(character):
     """Returns True if the argument is a str of size 1."""
     return isinstance(character, str) and len(character) == 1
+
+
+def _read_sidecar_header(sidecar_path, magic, keys):
+    """
+    Returns the header of a sidecar file (a magic line, then a JSON object on a
+    line, then the data) with the position of the data under "blob", or `None`
+    if the file doesn't start with the magic line or if its header isn't an
+    object with all the keys. An `OSError` is raised if it can't be read.
+    """
+    try:
+        with open(sidecar_path, "rb") as file_obj:
+            header = None
+            if file_obj.readline() == magic:
+                header = json.loads(file_obj.readline())
+            blob = file_obj.tell()
+    except ValueError:
+        return None
+
+    if not isinstance(header, dict) or not keys <= header.keys():
+        return None
+
+    header["blob"] = blob
+    return header
+
+
+def _is_unchanged(path, header, encoding):
+    """
+    Returns True if a file has the size, the modification time and the encoding
+    stored in the header of its sidecar file.
+    """
+    status = stat(path)
+    return (status.st_size, status.st_mtime_ns, encoding) == (
+        header["size"],
+        header["mtime_ns"],
+        header["encoding"],
+    )
@@ -0,0 +1,171 @@
+"""
+Module to search files from asyncio code.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Optional, Tuple
+
+from deepintest._conf import solution_characters
+from deepintest._typing import Chars
+from deepintest.io.formatter import Formatter
+from deepintest.io.reader import TextFileReader
+from deepintest.search.cache import get_cleaner
+from deepintest.search.cleaner import Cleaner
+from deepintest.search.matcher import Matcher
+
+
+class AsyncSearcher:
+    """\
+    Class to search files without blocking the asyncio event loop.
+
+    It is the asyncio counterpart of the `solution` script: the files are read
+    block by block in an executor, the matched lines are cleaned and formatted
+    in the executor too, and the formatted lines are yielded by an asynchronous
+    iterator. The number of searches running at the same time is limited. A
+    file compressed with gzip, bz2 or xz is decompressed as it is read, like in
+    the `solution` script.
+    """
+
+    _max_size: int
+    _cleaner: Cleaner
+    _formatter: Formatter
+    _executor: Optional[Executor]
+    _semaphore: asyncio.Semaphore
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_size: int = int(1e9),
+        characters: Chars = None,
+        cleaner_engine: str = "regex",
+        executor: Executor = None,
+    ) -> None:
+        """\
+        Constructor of the AsyncSearcher class.
+
+        The constructor raises a `ValueError` if `max_concurrency` is not a
+        positive `int`, and the same errors as `TextFileReader` and `Cleaner`
+        for the other parameters.
+
+        Parameters
+        ----------
+        max_concurrency
+            The maximum number of searches running at the same time, the other
+            ones wait for their turn.
+        max_size
+            The maximum size of a file to read in bytes, and of its
+            decompressed content if it is compressed.
+        characters
+            The characters kept in the matched lines, the characters of the
+            `solution` script by default.
+        cleaner_engine
+            The engine of the `Cleaner`.
+        executor
+            The executor reading and cleaning the lines. The default executor of
+            the event loop is used if not provided. The calls are made with
+            bound methods, so the executor should be a thread pool.
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError(
+                f"max concurrency {max_concurrency} is not a positive int."
+            )
+
+        # the reader is checked now, but each search uses its own reader
+        TextFileReader(max_size=max_size)
+
+        self._max_size = max_size
+        # the cleaners are shared with the solution script, see `get_cleaner`
+        self._cleaner = get_cleaner(
+            characters=characters or solution_characters, engine=cleaner_engine
+        )
+        self._formatter = Formatter()
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def search(self, path: str, search_term: str = None) -> AsyncIterator[str]:
+        """\
+        Searches a file and yields the clean and formatted matched lines.
+
+        If `search_term` is not provided, the search term is the last non-blank
+        line of the file, and only the lines before it are searched (like the
+        `solution` script). Otherwise all the lines are searched.
+
+        The method raises the same errors as `TextFileReader.read`, and a
+        `ValueError` if the search term is missing or not valid. As the lines
+        are yielded while the file is read, an `UnicodeError` can be raised
+        after some lines were yielded.
+
+        Parameters
+        ----------
+        path
+            The path of the file to search.
+        search_term
+            The term to search.
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            reader = TextFileReader(max_size=self._max_size)
+            end = None
+
+            if search_term is None:
+                search_term, end = await loop.run_in_executor(
+                    self._executor, self._read_search_term, reader, path
+                )
+
+            matcher = Matcher(search_term=search_term)
+            blocks = reader.iter_line_blocks(path, end=end)
+
+            try:
+                while True:
+                    lines = await loop.run_in_executor(
+                        self._executor, next, blocks, None
+                    )
+
+                    if lines is None:
+                        break
+
+                    indices = matcher.match_many(lines)
+                    matched_lines = [lines[index] for index in indices]
+
+                    if matched_lines:
+                        new_lines = await loop.run_in_executor(
+                            self._executor, self._format_lines, matched_lines
+                        )
+                        for new_line in new_lines:
+                            yield new_line
+            finally:
+                blocks.close()
+
+    async def search_lines(self, path: str, search_term: str = None) -> List[str]:
+        """\
+        Searches a file and returns the `list` of the clean and formatted
+        matched lines.
+
+        The method takes the same parameters and raises the same errors as
+        `search`.
+        """
+        return [new_line async for new_line in self.search(path, search_term)]
+
+    def _format_lines(self, lines: List[str]) -> List[str]:
+        """Returns the clean and formatted lines."""
+        return [
+            self._formatter.format_line(self._cleaner.clean_line(line))
+            for line in lines
+        ]
+
+    @staticmethod
+    def _read_search_term(reader: TextFileReader, path: str) -> Tuple[str, int]:
+        """\
+        Returns the last non-blank line of a file and its offset, or raises a
+        `ValueError` if the file doesn't have a search term and a line before.
+        """
+        last_line = reader.read_last_line(path)
+
+        if last_line is None:
+            raise ValueError(f"{path} is empty or has only empty lines.")
+
+        if reader.read_last_line(path, end=last_line[1]) is None:
+            raise ValueError(f"{path} must contain at least two lines.")
+
+        return last_line
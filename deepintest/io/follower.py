@@ -0,0 +1,280 @@
+"""
+Module to read the lines appended to a growing file.
+"""
+
+import json
+from os import fstat, replace, stat
+from typing import BinaryIO, Iterator, List, Optional
+
+from .reader import CompressedFileError, TextFileReader, detect_compression
+
+# number of bytes before the checkpoint compared to detect a truncation
+_SIGNATURE_SIZE = 32
+
+
+# the checkpoint and the partial line held are attributes too
+class FileFollower:  # pylint: disable=too-many-instance-attributes
+    """\
+    Class for reading the lines appended to a growing file, like a log.
+
+    Each call of `iter_line_blocks` reads the bytes appended since the
+    previous call, so the work depends on the size of the new data and not
+    on the size of the file. Only the complete lines are returned, a partial
+    line at the end of the file is held until its line ending is written.
+
+    The follower keeps a checkpoint made of the inode of the file, the offset
+    of the first byte not returned yet and the bytes before it (at most 32),
+    optionally saved to a file so another follower can resume from it. The
+    file is reopened from its beginning when it is truncated, or when it is
+    rotated (the path points to another inode), in which case the end of the
+    rotated file is read first.
+
+    A truncation is detected when the file is shorter than the offset, or
+    when the bytes before the offset changed, for example when the file is
+    truncated by a copytruncate rotation and written past the offset before
+    the next poll. A file truncated and written again with the same bytes
+    before the offset (such as repeated identical lines) isn't detected.
+
+    The file is checked by the `TextFileReader` each time it is opened (so its
+    size must not exceed `max_size` at that time), and the new lines are
+    decoded with its encoding. A compressed file can't be followed, the bytes
+    appended to it are not lines.
+    """
+
+    _path: str
+    _reader: TextFileReader
+    _checkpoint_path: Optional[str]
+    _file: Optional[BinaryIO]
+    _inode: Optional[int]
+    _offset: int
+    _pending: bytes
+    _signature: bytes
+
+    def __init__(
+        self,
+        path: str,
+        reader: TextFileReader = None,
+        checkpoint_path: str = None,
+    ) -> None:
+        """\
+        Constructor of the FileFollower class, the file is opened by the first
+        call of `iter_line_blocks`.
+
+        The constructor raises an `OSError` if the checkpoint file can't be
+        read and a `ValueError` if it is not a valid checkpoint.
+
+        Parameters
+        ----------
+        path
+            The path of the file to follow.
+        reader
+            The `TextFileReader` used to check the file and to get its encoding
+            and the size of the blocks read. A default `TextFileReader` is used
+            if not provided.
+        checkpoint_path
+            The path of the file the checkpoint is saved to and resumed from.
+            The checkpoint is only kept in memory if not provided.
+        """
+        self._path = path
+        self._reader = reader if reader is not None else TextFileReader()
+        self._checkpoint_path = checkpoint_path
+        self._file = None
+        self._inode = None
+        self._offset = 0
+        self._pending = b""
+        self._signature = b""
+
+        if checkpoint_path is not None:
+            self._load_checkpoint()
+
+    @property
+    def inode(self) -> Optional[int]:
+        """Getter for _inode, the inode of the file followed."""
+        return self._inode
+
+    @property
+    def offset(self) -> int:
+        """Getter for _offset, the offset of the first byte not returned."""
+        return self._offset
+
+    def iter_line_blocks(self) -> Iterator[List[str]]:
+        """\
+        Reads the complete lines appended to the file since the previous call.
+
+        The method is a generator yielding, for each block read, the `list` of
+        the lines (without the trailing whitespaces) ending in the block, like
+        `TextFileReader.iter_line_blocks`. The checkpoint moves past a block
+        once the next block is requested, and is saved at the end of the call.
+
+        Nothing is read while the file doesn't exist, for example between its
+        rotation and the creation of the new file.
+
+        The method raises the same errors as `TextFileReader.read` when the
+        file is opened, a `CompressedFileError` (a `ValueError`) if the file is
+        compressed, and an `UnicodeError` if the new lines can't be decoded.
+        """
+        if self._file is None and not self._open():
+            return
+
+        # the offset of the held partial line is the end of the file read
+        size = fstat(self._file.fileno()).st_size
+        if size < self._offset + len(self._pending) or not self._same_signature():
+            self._rewind()
+
+        yield from self._read_blocks()
+
+        try:
+            status = stat(self._path)
+        except FileNotFoundError:
+            status = None
+
+        # the rotated file was read until its end, its partial line won't be
+        # completed so it is the last line, then the new file is read
+        if status is not None and status.st_ino != self._inode:
+            if self._pending:
+                yield [self._reader.decode(self._pending, self._path).rstrip()]
+            self.close()
+            self._rewind()
+            if self._open():
+                yield from self._read_blocks()
+
+        self._save_checkpoint()
+
+    def close(self) -> None:
+        """Closes the file followed, it is opened again if needed."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> bool:
+        """\
+        Opens the file at the checkpoint if it has the same inode, at its
+        beginning otherwise. Returns `False` if the file doesn't exist.
+        """
+        try:
+            self._reader.check(self._path)
+        except FileNotFoundError:
+            return False
+
+        self._file = open(self._path, "rb")  # pylint: disable=consider-using-with
+
+        if detect_compression(self._file.read(6)) is not None:
+            self.close()
+            raise CompressedFileError(
+                f"{self._path} is compressed, it can't be followed."
+            )
+
+        status = fstat(self._file.fileno())
+        self._file.seek(self._offset + len(self._pending))
+
+        if (
+            status.st_ino != self._inode
+            or status.st_size < self._offset
+            or not self._same_signature()
+        ):
+            self._rewind()
+
+        self._inode = status.st_ino
+
+        return True
+
+    def _same_signature(self) -> bool:
+        """\
+        Returns `True` if the bytes before the offset in the file are those
+        kept in the checkpoint, the file position is not changed.
+        """
+        if not self._signature:
+            return True
+
+        position = self._file.tell()
+        self._file.seek(self._offset - len(self._signature))
+        same = self._file.read(len(self._signature)) == self._signature
+        self._file.seek(position)
+
+        return same
+
+    def _rewind(self) -> None:
+        """Moves the checkpoint to the beginning of the file."""
+        if self._file is not None:
+            self._file.seek(0)
+        self._offset = 0
+        self._pending = b""
+        self._signature = b""
+
+    def _read_blocks(self) -> Iterator[List[str]]:
+        """Reads the file until its end and yields the complete lines."""
+        while True:
+            block = self._file.read(self._reader.block_size)
+
+            if not block:
+                return
+
+            data = self._pending + block
+            index = max(data.rfind(b"\n"), data.rfind(b"\r"))
+
+            # a "\r" at the end may be followed by a "\n" not written yet
+            if index == len(data) - 1 and data.endswith(b"\r"):
+                index = max(data.rfind(b"\n", 0, index), data.rfind(b"\r", 0, index))
+
+            if index < 0:
+                self._pending = data
+                continue
+
+            complete, self._pending = data[: index + 1], data[index + 1 :]
+            text = self._reader.decode(complete, self._path)
+            lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+            # the last item is the empty string after the last line ending
+            yield [line.rstrip() for line in lines[:-1]]
+
+            self._offset += len(complete)
+            self._signature = (self._signature + complete)[-_SIGNATURE_SIZE:]
+
+    def _load_checkpoint(self) -> None:
+        """\
+        Reads the inode, the offset and the bytes before the offset (stored as
+        hexadecimal, optional) of the checkpoint file if it exists.
+        """
+        try:
+            with open(self._checkpoint_path, encoding="utf-8") as file_obj:
+                checkpoint = json.load(file_obj)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            checkpoint = None
+
+        if (
+            not isinstance(checkpoint, dict)
+            or not isinstance(checkpoint.get("inode"), int)
+            or not isinstance(checkpoint.get("offset"), int)
+            or checkpoint["offset"] < 0
+        ):
+            raise ValueError(f"{self._checkpoint_path} is not a valid checkpoint.")
+
+        try:
+            signature = bytes.fromhex(checkpoint.get("signature", ""))
+        except (TypeError, ValueError):
+            signature = None
+
+        if signature is None or len(signature) > checkpoint["offset"]:
+            raise ValueError(f"{self._checkpoint_path} is not a valid checkpoint.")
+
+        self._inode = checkpoint["inode"]
+        self._offset = checkpoint["offset"]
+        self._signature = signature
+
+    def _save_checkpoint(self) -> None:
+        """Writes the checkpoint to the checkpoint file, if any."""
+        if self._checkpoint_path is None or self._inode is None:
+            return
+
+        checkpoint = {
+            "inode": self._inode,
+            "offset": self._offset,
+            "signature": self._signature.hex(),
+        }
+
+        with open(f"{self._checkpoint_path}.tmp", "w", encoding="utf-8") as file_obj:
+            json.dump(checkpoint, file_obj)
+
+        replace(f"{self._checkpoint_path}.tmp", self._checkpoint_path)
@@ -2,9 +2,12 @@
 Module to format outputs.
 """
 
-from typing import List
+import sys
+from time import perf_counter
+from typing import BinaryIO, Iterable, List, Optional, Tuple, Union
 
 from deepintest._utils import _is_character
+from deepintest.metrics import Metrics
 
 
 class Formatter:
@@ -16,6 +19,8 @@ class Formatter:
     _output_delimiter: str
     _left_border: str
     _right_border: str
+    _byte_delimiters: Tuple[bytes, bytes]
+    _byte_borders: Tuple[bytes, bytes]
 
     def __init__(
         self,
@@ -53,6 +58,10 @@ class Formatter:
                     "It should be a character."
                 )
 
+        # the lines encoded in UTF-8 are formatted without being decoded
+        self._byte_delimiters = (input_delimiter.encode(), output_delimiter.encode())
+        self._byte_borders = (left_border.encode(), right_border.encode())
+
     def format_line(self, line: str) -> str:
         """\
         Format a line with delimiter and borders.
@@ -100,3 +109,151 @@ class Formatter:
             new_lines.append(self.format_line(line))
 
         return "\n".join(new_lines)
+
+    def format_byte_line(self, line: bytes) -> bytes:
+        """\
+        Format a line encoded in UTF-8 with delimiter and borders.
+
+        The methods returns the `bytes` `format_line` returns for the decoded
+        line, encoded in UTF-8, but the line is not decoded. It raises a
+        `TypeError` if the `line` parameter is not `bytes`.
+
+        Parameters
+        ----------
+        line
+            `bytes` to format.
+        """
+        if not isinstance(line, bytes):
+            raise TypeError(
+                f"The line parameter is of type: {type(line)}. "
+                "The line parameter should be bytes."
+            )
+
+        # UTF-8 is self-synchronizing, so a character can't be found in another
+        if self._input_delimiter != self._output_delimiter:
+            line = line.replace(*self._byte_delimiters)
+
+        return self._byte_borders[0] + line + self._byte_borders[1]
+
+    def write_lines(
+        self,
+        lines: Iterable[Union[str, bytes]],
+        stream: BinaryIO,
+        buffer_size: int = 1 << 20,
+    ) -> int:
+        """\
+        Format lines with delimiter and borders and write them to a binary
+        stream.
+
+        The formatted lines are followed by a new line character, encoded in
+        UTF-8 and appended to a buffer, which is written to the stream each
+        time it holds `buffer_size` bytes. So `lines` can be a generator and
+        the memory used doesn't depend on the number of lines. The stream
+        itself is not flushed.
+
+        The lines can also be `bytes` encoded in UTF-8, which are formatted
+        without being decoded (see `format_byte_line`).
+
+        The method returns the number of lines written.
+
+        The method returns a `TypeError` if one of the lines is neither a `str`
+        nor `bytes`, and a `ValueError` if `buffer_size` is not a positive
+        `int`.
+
+        Parameters
+        ----------
+        lines
+            An iterable of `str` and/or `bytes` to format.
+        stream
+            A buffered binary stream, for example `sys.stdout.buffer` or a file
+            opened in "wb" mode.
+        buffer_size
+            The size of the buffer in bytes.
+        """
+        if not isinstance(buffer_size, int) or buffer_size < 1:
+            raise ValueError(f"buffer size {buffer_size} is not a positive int.")
+
+        buffer = bytearray()
+        count = 0
+
+        for line in lines:
+            if isinstance(line, bytes):
+                buffer += self.format_byte_line(line)
+            else:
+                buffer += self.format_line(line).encode("utf-8")
+            buffer += b"\n"
+            count += 1
+
+            # the stream can keep the object written, so it isn't reused
+            if len(buffer) >= buffer_size:
+                stream.write(buffer)
+                buffer = bytearray()
+
+        if buffer:
+            stream.write(buffer)
+
+        return count
+
+
+class _CountingStream:
+    """
+    Binary stream counting the bytes written to another binary stream.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        """Writes bytes to the stream and counts them."""
+        self.size += len(data)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        """Flushes the stream."""
+        self.stream.flush()
+
+
+def print_lines(
+    lines: List[Union[str, bytes]],
+    buffer_size: int = 1 << 20,
+    metrics: Optional[Metrics] = None,
+) -> None:
+    """\
+    Prints lines formatted by a default `Formatter` through a buffer written to
+    the binary standard output, so there isn't a write per line (see
+    `Formatter.write_lines`). The "format" stage is recorded into `metrics` if
+    it isn't `None`.
+
+    Parameters
+    ----------
+    lines
+        A `list` of `str` and/or `bytes` encoded in UTF-8 to format.
+    buffer_size
+        The size of the buffer in bytes.
+    metrics
+        The metrics the "format" stage is recorded into.
+    """
+    formatter = Formatter()
+
+    # what was printed before must come first
+    sys.stdout.flush()
+
+    clock = perf_counter()
+    stream = getattr(sys.stdout, "buffer", None)
+
+    # the standard output can be replaced by a text stream
+    if stream is None:
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            print(formatter.format_line(line))
+        size = 0
+    else:
+        stream = _CountingStream(stream)
+        formatter.write_lines(lines, stream, buffer_size)
+        stream.flush()
+        size = stream.size
+
+    if metrics is not None:
+        metrics.record("format", perf_counter() - clock, len(lines), size)
@@ -2,12 +2,124 @@
 Module to read files.
 """
 
-from os import stat
-from pathlib import Path
-from typing import List
+import lzma
+import zlib
+from errno import EBADF, ELOOP, ENOENT, ENOTDIR
+from importlib import import_module
+from os import fspath, lstat, stat
+from stat import S_ISLNK, S_ISREG
+from sys import maxsize
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+# the magic bytes of the compressed formats and the modules decompressing them,
+# which are only imported when a compressed file is read (except lzma and zlib,
+# which raise the errors of not valid data)
+_COMPRESSIONS: Dict[bytes, str] = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "lzma",
+}
+
+# a truncated file raises an EOFError, and not valid data an OSError or the
+# error of the decompression library
+_DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError, zlib.error)
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """\
+    Returns the compression of a file from its first bytes: "gzip", "bz2",
+    "lzma" (the xz format) or `None` if the file isn't compressed.
+
+    Parameters
+    ----------
+    header
+        The first bytes of the file, at least 6 bytes unless the file is
+        shorter.
+    """
+    for magic, compression in _COMPRESSIONS.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+class DecompressedSizeError(MemoryError):
+    """
+    Error raised when the decompressed content of a compressed file exceeds
+    the `max_decompressed_size` parameter of `TextFileReader`.
+    """
+
+
+class CompressedDataError(OSError):
+    """
+    Error raised when the data of a compressed file is corrupted or truncated.
+    """
+
+
+class CompressedFileError(ValueError):
+    """
+    Error raised when a compressed file is given where only uncompressed files
+    can be read, for example to be memory-mapped.
+    """
+
+
+class _DecompressedFile:
+    """
+    Binary file decompressing a compressed file as it is read. It raises a
+    `DecompressedSizeError` once more than `max_size` bytes are decompressed,
+    and a `CompressedDataError` if the compressed data is not valid.
+    """
+
+    def __init__(self, path, file_obj, compression, max_size):
+        module = import_module(compression)
+        self._path = path
+        self._compression = compression
+        self._raw = file_obj
+        self._file = module.open(file_obj, "rb")
+        self._max_size = max_size
+        self._size = 0
+
+    def read(self, size: int) -> bytes:
+        """Reads and decompresses at most `size` bytes."""
+        try:
+            data = self._file.read(size)
+        except _DECOMPRESSION_ERRORS as error:
+            raise CompressedDataError(
+                f"{self._path} is not a valid {self._compression} file."
+            ) from error
+
+        self._size += len(data)
+
+        if self._size > self._max_size:
+            raise DecompressedSizeError(
+                f"{self._path} decompressed size exceeds the "
+                "max_decompressed_size parameter."
+            )
+
+        return data
 
+    def skip(self, size: int, block_size: int) -> None:
+        """Reads and drops `size` bytes, the stream can only be read forward."""
+        while size > 0:
+            data = self.read(min(block_size, size))
+            if not data:
+                return
+            size -= len(data)
 
-class TextFileReader:
+    def close(self) -> None:
+        """Closes the decompressor and the file."""
+        self._file.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# the limits and the cache of the last lines of a compressed file are attributes
+# too
+class TextFileReader:  # pylint: disable=too-many-instance-attributes
     """\
     Class for reading files.
 
@@ -16,21 +128,51 @@ class TextFileReader:
 
     This class doesn't assume that the default byte-buffer size is
     appropriate, so it includes a parameter to limit the file size.
+
+    Besides `read`, the class can find the last non-blank line of a file by
+    reading it backward from the end (`read_last_line`) and stream the lines
+    of a file one by one (`iter_lines`). With these two methods, the memory
+    used depends on the length of the lines and not on the size of the file,
+    and it can be bounded with `max_line_size`.
+
+    The files compressed with gzip, bz2 or xz (detected from their magic
+    bytes) are decompressed as they are read, with the standard library, so
+    the lines, the offsets and the encoding checks are those of the
+    decompressed content. A compressed file can only be read forward, so
+    `read_last_line` reads it from its beginning and `split` returns a single
+    range. Its size is limited by `max_size`, and the size of its decompressed
+    content by `max_decompressed_size`.
     """
 
     _supported_encodings: List[str] = ["utf-8", "ascii"]
     _encoding: str
     _max_size: int
+    _block_size: int
+    _max_line_size: Optional[int]
+    _max_decompressed_size: Optional[int]
+    _last_lines: Optional[Tuple[Tuple, Dict]]
     _path: str
 
-    def __init__(self, encoding: str = "utf-8", max_size: int = 2000000) -> None:
+    def __init__(
+        self,
+        encoding: str = "utf-8",
+        max_size: int = 2000000,
+        block_size: int = 65536,
+        max_line_size: Optional[int] = None,
+        max_decompressed_size: Optional[int] = None,
+    ) -> None:
         """
         Constructor of the TextFileReader class.
 
         The constructor raises a `ValueError` if `encoding` is not a supported
         encoding.
 
-        The constructor raises a `ValueError` if `max_size` is not an `int`.
+        The constructor raises a `ValueError` if `max_size` or `block_size` is
+        not an `int`, or if `block_size` is not positive.
+
+        The constructor raises a `ValueError` if `max_line_size` is neither
+        `None` nor a positive `int`, or if `max_decompressed_size` is neither
+        `None` nor an `int`.
 
         Parameters
         ----------
@@ -38,6 +180,17 @@ class TextFileReader:
             The file encoding.
         max_size
             The maximum size of a file to read in bytes.
+        block_size
+            The size in bytes of the blocks read by `read_last_line` and
+            `iter_lines`.
+        max_line_size
+            The maximum size in bytes of a line held in memory across several
+            blocks. The methods streaming the file raise a `MemoryError` rather
+            than holding a longer line, so their memory use is bounded by
+            `block_size` and `max_line_size`. No limit if `None`.
+        max_decompressed_size
+            The maximum size in bytes of the decompressed content of a
+            compressed file, `max_size` if `None`.
         """
         if encoding not in self._supported_encodings:
             raise ValueError(f"{encoding} is not a supported encoding.")
@@ -49,6 +202,28 @@ class TextFileReader:
 
         self._max_size = max_size
 
+        if not isinstance(block_size, int) or block_size < 1:
+            raise ValueError(f"block size {block_size} is not a positive int.")
+
+        self._block_size = block_size
+
+        if max_line_size is not None and (
+            not isinstance(max_line_size, int) or max_line_size < 1
+        ):
+            raise ValueError(f"max line size {max_line_size} is not a positive int.")
+
+        self._max_line_size = max_line_size
+
+        if max_decompressed_size is not None and not isinstance(
+            max_decompressed_size, int
+        ):
+            raise ValueError(
+                f"max decompressed size {max_decompressed_size} is not an int."
+            )
+
+        self._max_decompressed_size = max_decompressed_size
+        self._last_lines = None
+
     @property
     def encoding(self) -> int:
         """Getter for _encoding."""
@@ -59,6 +234,11 @@ class TextFileReader:
         """Setter for _encoding."""
         self._encoding = new_encoding
 
+    @property
+    def block_size(self) -> int:
+        """Getter for _block_size."""
+        return self._block_size
+
     @property
     def mem_size(self) -> int:
         """Getter for _mem_size."""
@@ -70,7 +250,7 @@ class TextFileReader:
         self._mem_size = new_mem_size
 
     @property
-    def path(self) -> int:
+    def path(self) -> str:
         """Getter for _path."""
         return self._path
 
@@ -79,6 +259,58 @@ class TextFileReader:
         """Setter for _path."""
         self._path = new_path
 
+    def check(self, path: str) -> None:
+        """\
+        Checks that a file can be read.
+
+        The method will raise a:
+
+            * `FileNotFoundError` if `path` doesn't exist
+            * `ValueError` if `path` is a directory or a link
+            * `MemoryError` if `path` size exceeds `max_size` parameter
+
+        Parameters
+        ----------
+        path
+            The path of the file that needs to be checked.
+        """
+        # os is used rather than pathlib, which is slow to import
+        self._path = fspath(path)
+
+        # test for existence, the errors ignored by `pathlib.Path.exists`
+        try:
+            status = stat(self._path)
+        except OSError as os_err:
+            if os_err.errno in (ENOENT, ENOTDIR, EBADF, ELOOP):
+                raise FileNotFoundError(f"{self._path} doesn't exist.") from os_err
+            raise
+
+        # path can be a directory and decided not to handle links
+        if not S_ISREG(status.st_mode) or S_ISLNK(lstat(self._path).st_mode):
+            raise ValueError(f"{self._path} points to a directory or a link.")
+
+        # test if the file size exceeds the max_size
+        if status.st_size > self._max_size:
+            raise MemoryError(f"{self._path} size exceeds the max_size parameter.")
+
+    def get_compression(self, path: str) -> Optional[str]:
+        """\
+        Returns the compression of a file detected from its magic bytes (see
+        `detect_compression`), `None` if the file isn't compressed.
+
+        The method raises the same errors as `check` and an `OSError` if the
+        file can't be opened.
+
+        Parameters
+        ----------
+        path
+            The path of the file.
+        """
+        self.check(path)
+
+        with open(self._path, "rb") as file_obj:
+            return detect_compression(file_obj.read(6))
+
     def read(self, path: str) -> List[str]:
         """\
         Reads the content of a file.
@@ -86,12 +318,19 @@ class TextFileReader:
         If sucessful, the methods returns the content of the file as a `list`
         of `str`.
 
+        The file is read once and decoded incrementally (see `iter_lines`).
+
         The method will raise a:
 
             * `FileNotFoundError` if `path` doesn't exist
             * `ValueError` if `path` is a directory or a link
-            * `MemoryError` if `path` size exceeds `max_size` parameter
+            * `MemoryError` if `path` size exceeds `max_size` parameter, or if
+              a line exceeds `max_line_size` parameter
+            * `DecompressedSizeError` (a `MemoryError`) if the decompressed
+              content exceeds `max_decompressed_size` parameter
             * `OSError` if `path` can't be opened
+            * `CompressedDataError` (an `OSError`) if the compressed data of
+              `path` is corrupted or truncated
             * `UnicodeError` if the provided encoding can't decode the file
 
         Parameters
@@ -99,42 +338,458 @@ class TextFileReader:
         path
             The path of the file that needs to be read.
         """
-        self._path = Path(path)
+        # the file is read, validated and decoded in a single pass
+        return list(self.iter_lines(path))
 
-        # test for existence
-        if not self._path.exists():
-            raise FileNotFoundError(f"{self._path} doesn't exist.")
+    def read_last_line(
+        self, path: str, end: Optional[int] = None
+    ) -> Optional[Tuple[str, int]]:
+        """\
+        Reads the last non-blank line of a file.
 
-        # path can be a directory and decided not to handle links
-        if not self._path.is_file() or self._path.is_symlink():
-            raise ValueError(f"{self._path} points to a directory or a link.")
+        The file is read backward, block by block, from `end` (or from the end
+        of the file) until a line containing something else than whitespaces
+        is found.
 
-        # test if the file size exceeds the max_size
-        if stat(self._path).st_size > self._max_size:
-            raise MemoryError(f"{self._path} size exceeds the max_size parameter.")
+        If sucessful, the method returns a `tuple` made of the line (without
+        the trailing whitespaces) and the byte offset where the line starts.
+        The method returns `None` if the file has only blank lines before `end`.
 
-        # check if the file can be opened
-        try:
-            with open(self._path, "rb") as file_obj:
-                data = file_obj.read()
-        except PermissionError as perm_err:
-            raise perm_err
-        except OSError as os_err:
-            raise os_err
+        The method raises the same errors as `read`.
+
+        Parameters
+        ----------
+        path
+            The path of the file that needs to be read.
+        end
+            The byte offset where to stop reading (the byte at `end` is not
+            read). It should be the start of a line.
+        """
+        self.check(path)
+
+        with self._open() as file_obj:
+            if isinstance(file_obj, _DecompressedFile):
+                return self._read_last_lines(end)
+
+            position = file_obj.seek(0, 2) if end is None else end
+
+            def read_block(position, size):
+                file_obj.seek(position)
+                return file_obj.read(size)
+
+            return self._scan_last_line(read_block, position)
+
+    def find_last_line(
+        self, data: bytes, end: Optional[int] = None
+    ) -> Optional[Tuple[str, int]]:
+        """\
+        Finds the last non-blank line of a buffer holding the content of a file,
+        for example a memory-mapped file.
+
+        The buffer is read backward like the file in `read_last_line`, so only
+        the end of a large buffer is touched. The method returns the same
+        `tuple` or `None`, and raises an `UnicodeError` if the line can't be
+        decoded, or a `MemoryError` if it is longer than `max_line_size`.
+
+        Parameters
+        ----------
+        data
+            The content of the file, a `bytes` or a `mmap`.
+        end
+            The offset where to stop reading (the byte at `end` is not read). It
+            should be the start of a line.
+        """
+        position = len(data) if end is None else end
+
+        return self._scan_last_line(
+            lambda position, size: data[position : position + size], position
+        )
+
+    def iter_lines(
+        self, path: str, end: Optional[int] = None, start: int = 0
+    ) -> Iterator[str]:
+        """\
+        Reads the lines of a file one by one.
 
-        # tests the encoding
+        The method is a generator yielding the lines of the file (without the
+        trailing whitespaces) like `read`, but without holding the whole file
+        in memory. The blocks read are cut after their last line ending (see
+        `iter_byte_blocks`), so they are validated and decoded in a single pass.
+
+        The method raises the same errors as `read`. Note that the
+        `UnicodeError` is raised when the faulty line is reached.
+
+        Parameters
+        ----------
+        path
+            The path of the file that needs to be read.
+        end
+            The byte offset where to stop reading (the byte at `end` is not
+            read). For example, the offset returned by `read_last_line`.
+        start
+            The byte offset where to start reading. It should be the start of a
+            line, for example one of the offsets returned by `split`.
+        """
+        for lines in self.iter_line_blocks(path, end, start):
+            yield from lines
+
+    def iter_line_blocks(
+        self, path: str, end: Optional[int] = None, start: int = 0
+    ) -> Iterator[List[str]]:
+        """\
+        Reads the lines of a file block by block.
+
+        The method is a generator yielding, for each block read, the `list` of
+        the lines (without the trailing whitespaces) ending in the block. It
+        yields the same lines as `iter_lines`, but by batches, so they can be
+        processed together (see `Matcher.match_many`).
+
+        The method raises the same errors as `iter_lines`.
+
+        Parameters
+        ----------
+        path
+            The path of the file that needs to be read.
+        end
+            The byte offset where to stop reading (the byte at `end` is not
+            read). For example, the offset returned by `read_last_line`.
+        start
+            The byte offset where to start reading. It should be the start of a
+            line, for example one of the offsets returned by `split`.
+        """
+        # the blocks are checked by decoding them
+        for block in self.iter_byte_blocks(path, end, start, validate=False):
+            yield self.decode_lines(block)
+
+    def iter_byte_blocks(
+        self,
+        path: str,
+        end: Optional[int] = None,
+        start: int = 0,
+        validate: bool = True,
+    ) -> Iterator[bytes]:
+        """\
+        Reads the bytes of a file block by block, each block holding complete
+        lines.
+
+        The method is a generator yielding the blocks of bytes read, cut after
+        their last line ending (the rest of the block is yielded with the next
+        block), so the lines of each block can be decoded and split with
+        `decode_lines`. The line endings are kept. The ASCII blocks are valid
+        in all the supported encodings, so they can be searched without being
+        decoded.
+
+        The method raises the same errors as `iter_lines`, the `UnicodeError`
+        only if `validate` is `True`.
+
+        Parameters
+        ----------
+        path
+            The path of the file that needs to be read.
+        end
+            The byte offset where to stop reading (the byte at `end` is not
+            read). For example, the offset returned by `read_last_line`.
+        start
+            The byte offset where to start reading. It should be the start of a
+            line, for example one of the offsets returned by `split`.
+        validate
+            If `True`, the blocks which aren't ASCII are checked to be properly
+            encoded. Otherwise, they should be checked by the caller, for
+            example by decoding them with `decode_lines`.
+        """
+        self.check(path)
+
+        with self._open() as file_obj:
+            # the size of the decompressed content is unknown before the end
+            if isinstance(file_obj, _DecompressedFile):
+                remaining = maxsize if end is None else end - start
+                file_obj.skip(start, self._block_size)
+            else:
+                remaining = (file_obj.seek(0, 2) if end is None else end) - start
+                file_obj.seek(start)
+
+            pending = b""
+
+            while remaining > 0:
+                block = file_obj.read(min(self._block_size, remaining))
+
+                if not block:
+                    break
+
+                remaining -= len(block)
+                data = pending + block
+
+                # the pending bytes have no line ending but a final "\r", and a
+                # "\r" at the end of the block may be followed by a "\n"
+                first = max(0, len(pending) - 1)
+                last = len(data) - (remaining > 0 and block[-1:] == b"\r")
+                index = max(
+                    data.rfind(b"\n", first, last), data.rfind(b"\r", first, last)
+                )
+
+                if index < 0:
+                    pending = data
+                    self._check_line(pending)
+                    continue
+
+                block, pending = data[: index + 1], data[index + 1 :]
+                self._check_line(pending)
+
+                if validate:
+                    self._validate(block)
+
+                yield block
+
+            # the last line may not have a line ending
+            if pending:
+                if validate:
+                    self._validate(pending)
+
+                yield pending
+
+    def decode(self, data: bytes, path: Optional[str] = None) -> str:
+        """\
+        Decodes bytes read from a file with the encoding of the reader.
+
+        The method raises an `UnicodeError` naming the file if the bytes can't
+        be decoded.
+
+        Parameters
+        ----------
+        data
+            The bytes to decode.
+        path
+            The path of the file the bytes were read from, the last file read
+            by the reader if not provided.
+        """
         try:
-            data.decode(encoding=self._encoding, errors="strict")
+            return data.decode(encoding=self._encoding, errors="strict")
         except UnicodeError as uni_err:
             raise UnicodeError(
-                f"{self._path} is not encoded with {self._encoding}."
+                f"{self._path if path is None else path} is not encoded with "
+                f"{self._encoding}."
             ) from uni_err
 
-        # get the file content
-        lines = []
+    def decode_lines(self, block: bytes) -> List[str]:
+        """\
+        Decodes and splits the lines of a block of bytes.
+
+        The method returns the `list` of the lines (without the trailing
+        whitespaces) of a block yielded by `iter_byte_blocks`, the last line
+        may not have a line ending.
 
-        with open(self._path, "r", encoding=self._encoding) as file_obj:
-            for line in file_obj.readlines():
-                lines.append(line.rstrip())
+        The method raises an `UnicodeError` if the block can't be decoded.
 
-        return lines
+        Parameters
+        ----------
+        block
+            The bytes of complete lines.
+        """
+        lines = self.decode(block).replace("\r\n", "\n").replace("\r", "\n")
+        lines = lines.split("\n")
+
+        # the last item is the empty string after the last line ending
+        if not lines[-1]:
+            lines.pop()
+
+        return [line.rstrip() for line in lines]
+
+    def split(
+        self, path: str, parts: int, end: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """\
+        Splits a file into ranges of bytes aligned on the line boundaries.
+
+        The method returns a `list` of at most `parts` ranges of about the same
+        size. Each range is a `tuple` holding the offset of its first byte and
+        the offset after its last byte. Each range starts at the beginning of a
+        line, so it can be read independently with `iter_lines`. A compressed
+        file has a single range, its decompressed content can only be read from
+        the beginning.
+
+        The method raises the same errors as `check` and a `ValueError` if
+        `parts` is not a positive `int`.
+
+        Parameters
+        ----------
+        path
+            The path of the file that needs to be split.
+        parts
+            The number of ranges wanted.
+        end
+            The byte offset where the last range ends. For example, the offset
+            returned by `read_last_line`.
+        """
+        if not isinstance(parts, int) or parts < 1:
+            raise ValueError(f"parts {parts} is not a positive int.")
+
+        self.check(path)
+
+        ranges = []
+
+        with self._open() as file_obj:
+            # a compressed file can't be read from the middle
+            if isinstance(file_obj, _DecompressedFile):
+                if end is None:
+                    end = sum(map(len, self.iter_byte_blocks(path, validate=False)))
+                return [(0, end)] if end > 0 else []
+
+            end = file_obj.seek(0, 2) if end is None else end
+            start = 0
+
+            for part in range(1, parts):
+                # the range ends after the first line ending following the guess
+                position = max(start, end * part // parts)
+                file_obj.seek(position)
+
+                while position < end:
+                    block = file_obj.read(min(self._block_size, end - position))
+                    index = min(
+                        (i for i in (block.find(b"\n"), block.find(b"\r")) if i > -1),
+                        default=-1,
+                    )
+                    if index < 0:
+                        position += len(block)
+                        continue
+                    position += index + 1
+                    # "\r\n" is a single line ending
+                    if block[index : index + 1] == b"\r":
+                        file_obj.seek(position)
+                        if file_obj.read(1) == b"\n":
+                            position += 1
+                    break
+
+                if position >= end:
+                    break
+
+                ranges.append((start, position))
+                start = position
+
+            if start < end:
+                ranges.append((start, end))
+
+        return ranges
+
+    def _open(self) -> BinaryIO:
+        """\
+        Opens the checked file, a compressed file is decompressed as it is
+        read (see `_DecompressedFile`).
+        """
+        file_obj = open(self._path, "rb")  # pylint: disable=consider-using-with
+        compression = detect_compression(file_obj.read(6))
+        file_obj.seek(0)
+
+        if compression is None:
+            return file_obj
+
+        max_size = self._max_decompressed_size
+        max_size = self._max_size if max_size is None else max_size
+
+        return _DecompressedFile(self._path, file_obj, compression, max_size)
+
+    def _read_last_lines(self, end: Optional[int]) -> Optional[Tuple[str, int]]:
+        """\
+        Reads a compressed file forward to find its last non-blank line before
+        `end`, see `read_last_line`.
+
+        The line before it is found in the same pass and kept, with the status
+        of the file, so asking for the line before the last line (like the
+        solution does) doesn't decompress the file again.
+        """
+        status = stat(self._path)
+        key = (self._path, status.st_ino, status.st_size, status.st_mtime_ns)
+
+        if self._last_lines is not None and self._last_lines[0] == key:
+            if end in self._last_lines[1]:
+                return self._last_lines[1][end]
+
+        last_line = previous_line = None
+        position = 0
+
+        for block in self.iter_byte_blocks(self._path, end, validate=False):
+            found = self._find_last_line(block, len(block))
+
+            if found is not None:
+                before = self._find_last_line(block, found[1])
+                if before is not None:
+                    previous_line = before[0], position + before[1]
+                elif last_line is not None:
+                    previous_line = last_line
+                last_line = found[0], position + found[1]
+
+            position += len(block)
+
+        lines = {end: last_line}
+        if last_line is not None:
+            lines[last_line[1]] = previous_line
+        self._last_lines = key, lines
+
+        return last_line
+
+    def _scan_last_line(
+        self, read_block: Callable[[int, int], bytes], position: int
+    ) -> Optional[Tuple[str, int]]:
+        """\
+        Returns the last non-blank line before `position` and its offset, see
+        `read_last_line`. The content is read backward, block by block, with
+        `read_block(position, size)`.
+        """
+        tail = b""
+
+        while True:
+            # lines can end with "\n", "\r\n" or "\r"
+            index = max(tail.rfind(b"\n"), tail.rfind(b"\r"))
+
+            # the tail doesn't hold a full line so we read one more block
+            if index < 0 < position:
+                self._check_line(tail)
+                size = min(self._block_size, position)
+                position -= size
+                tail = read_block(position, size) + tail
+                continue
+
+            line = self.decode(tail[index + 1 :]).rstrip()
+
+            if line:
+                return line, position + index + 1
+
+            if index < 0:
+                return None
+
+            tail = tail[:index]
+
+    def _find_last_line(self, block: bytes, stop: int) -> Optional[Tuple[str, int]]:
+        """\
+        Returns the last non-blank line of the complete lines of a block before
+        the offset `stop`, and the offset where it starts in the block.
+        """
+        while True:
+            index = max(block.rfind(b"\n", 0, stop), block.rfind(b"\r", 0, stop))
+            line = self.decode(block[index + 1 : stop]).rstrip()
+
+            if line:
+                return line, index + 1
+
+            if index < 0:
+                return None
+
+            stop = index
+
+    def _check_line(self, data: bytes) -> None:
+        """\
+        Raises a `MemoryError` if a partial line held in memory is longer than
+        `max_line_size`.
+        """
+        if self._max_line_size is not None and len(data) > self._max_line_size:
+            raise MemoryError(
+                f"{self._path} has a line longer than the max_line_size parameter."
+            )
+
+    def _validate(self, block: bytes) -> None:
+        """\
+        Checks that a block of complete lines can be decoded or raises an
+        `UnicodeError`. The ASCII blocks are valid in all the supported
+        encodings, so they are not decoded.
+        """
+        if not block.isascii():
+            self.decode(block)
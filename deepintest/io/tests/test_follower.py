@@ -0,0 +1,211 @@
+"""
+Testing module for the deepingtest.io.follower module.
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from ..follower import FileFollower
+from ..reader import CompressedFileError, TextFileReader
+
+
+def _append(path, data):
+    """Appends bytes to a file."""
+    with open(path, "ab") as file_obj:
+        file_obj.write(data)
+
+
+def _poll(follower):
+    """Returns all the lines read by a call of iter_line_blocks."""
+    return [line for lines in follower.iter_line_blocks() for line in lines]
+
+
+class TestFileFollower:
+    """
+    Testing class for the FileFollower class.
+    """
+
+    def test_iter_line_blocks_returns_appended_lines(self, tmp_path):
+        """
+        Tests if iter_line_blocks returns the lines appended since the previous
+        call, holding the partial lines until their line ending is written.
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"first line\nsecond ")
+        follower = FileFollower(str(path), TextFileReader(block_size=4))
+
+        assert _poll(follower) == ["first line"]
+        assert follower.offset == len(b"first line\n")
+        assert _poll(follower) == []
+
+        _append(path, b"line  \r")
+        assert _poll(follower) == []
+        _append(path, b"\nthird\rfourth\r\n\n")
+        assert _poll(follower) == ["second line", "third", "fourth", ""]
+
+        # a character split between two writes
+        _append(path, "ét".encode("utf-8")[:1])
+        assert _poll(follower) == []
+        _append(path, "ét".encode("utf-8")[1:] + b"\n")
+        assert _poll(follower) == ["ét"]
+        assert follower.offset == os.path.getsize(path)
+
+    def test_iter_line_blocks_only_reads_appended_bytes(self, tmp_path):
+        """
+        Tests if iter_line_blocks doesn't read again the bytes already read, so
+        the work depends on the size of the new data.
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"needle line\n" * 1000)
+        follower = FileFollower(str(path))
+        assert len(_poll(follower)) == 1000
+
+        # the bytes already read are replaced by bytes that can't be decoded,
+        # except the last ones which are compared to detect a truncation
+        with open(path, "r+b") as file_obj:
+            file_obj.write(b"\xff" * 11000)
+
+        _append(path, b"new line\n")
+        assert _poll(follower) == ["new line"]
+
+    def test_iter_line_blocks_handles_truncation(self, tmp_path):
+        """Tests if the file is read again from its beginning once truncated."""
+        path = tmp_path / "file.log"
+        path.write_bytes(b"old line\nold line\n")
+        follower = FileFollower(str(path))
+        assert _poll(follower) == ["old line", "old line"]
+
+        path.write_bytes(b"new\n")
+        assert _poll(follower) == ["new"]
+        assert follower.offset == 4
+
+    def test_iter_line_blocks_handles_truncation_written_past_offset(self, tmp_path):
+        """
+        Tests if iter_line_blocks reads the file from its beginning when it was
+        truncated then written past the offset reached (like a copytruncate
+        rotation between two polls), also when resuming from a checkpoint.
+        """
+        path = tmp_path / "file.log"
+        checkpoint_path = str(tmp_path / "checkpoint.json")
+        path.write_bytes(b"old line 1\nold line 2\n")
+        follower = FileFollower(str(path), checkpoint_path=checkpoint_path)
+        assert _poll(follower) == ["old line 1", "old line 2"]
+
+        path.write_bytes(b"new line 1\nnew line 2\nnew line 3\n")
+        assert _poll(follower) == ["new line 1", "new line 2", "new line 3"]
+        follower.close()
+
+        path.write_bytes(b"other line 1\nother line 2\nother line 3\n")
+        follower = FileFollower(str(path), checkpoint_path=checkpoint_path)
+        assert len(_poll(follower)) == 3
+
+    def test_iter_line_blocks_handles_rotation(self, tmp_path):
+        """
+        Tests if the end of a rotated file is read, its partial line included,
+        then the new file from its beginning, and if nothing is read while the
+        file doesn't exist.
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"first\n")
+        follower = FileFollower(str(path))
+        assert _poll(follower) == ["first"]
+        inode = follower.inode
+
+        _append(path, b"second\npartial")
+        os.rename(path, tmp_path / "file.log.1")
+        assert _poll(follower) == ["second"]
+
+        path.write_bytes(b"new file\n")
+        assert _poll(follower) == ["partial", "new file"]
+        assert follower.inode != inode
+
+        os.remove(path)
+        assert _poll(follower) == []
+        follower.close()
+
+        missing = FileFollower(str(tmp_path / "missing.log"))
+        assert _poll(missing) == []
+
+    def test_checkpoint_resumes_follower(self, tmp_path):
+        """
+        Tests if a follower resumes from the checkpoint saved by another one,
+        unless the file was rotated.
+        """
+        path = tmp_path / "file.log"
+        checkpoint_path = str(tmp_path / "checkpoint.json")
+        path.write_bytes(b"first\nsecond\npart")
+
+        follower = FileFollower(str(path), checkpoint_path=checkpoint_path)
+        assert _poll(follower) == ["first", "second"]
+        follower.close()
+
+        with open(checkpoint_path, encoding="utf-8") as file_obj:
+            checkpoint = json.load(file_obj)
+        assert checkpoint == {
+            "inode": follower.inode,
+            "offset": 13,
+            "signature": b"first\nsecond\n".hex(),
+        }
+
+        _append(path, b"ial\nthird\n")
+        follower = FileFollower(str(path), checkpoint_path=checkpoint_path)
+        assert _poll(follower) == ["partial", "third"]
+        follower.close()
+
+        # the new file is created first, a freed inode may be reused
+        rotated = tmp_path / "new.log"
+        rotated.write_bytes(b"rotated\n" * 10)
+        os.replace(rotated, path)
+        follower = FileFollower(str(path), checkpoint_path=checkpoint_path)
+        assert len(_poll(follower)) == 10
+        follower.close()
+
+    def test_init_fails_when_checkpoint_not_valid(self, tmp_path):
+        """
+        Tests if the constructor returns a `ValueError` if the checkpoint file
+        is not valid.
+        """
+        checkpoint_path = tmp_path / "checkpoint.json"
+        tests = [
+            "",
+            "[]",
+            '{"inode": 1}',
+            '{"inode": 1, "offset": -1}',
+            '{"inode": 1, "offset": 1, "signature": "not hexadecimal"}',
+            '{"inode": 1, "offset": 1, "signature": "6162"}',
+        ]
+        for content in tests:
+            checkpoint_path.write_text(content, encoding="utf-8")
+            with pytest.raises(ValueError):
+                FileFollower("file.log", checkpoint_path=str(checkpoint_path))
+
+    def test_iter_line_blocks_fails_when_file_not_valid(
+        self, tmp_path, unsupported_encoding
+    ):
+        """
+        Tests if iter_line_blocks returns the errors of TextFileReader when the
+        file is opened, a `CompressedFileError` if the file is compressed and an
+        `UnicodeError` if the new lines can't be decoded.
+        """
+        with pytest.raises(ValueError):
+            _poll(FileFollower(str(tmp_path)))
+
+        path = tmp_path / "file.log"
+        path.write_bytes(b"line\n")
+
+        with pytest.raises(MemoryError):
+            _poll(FileFollower(str(path), TextFileReader(max_size=1)))
+
+        follower = FileFollower(str(path))
+        assert _poll(follower) == ["line"]
+        _append(path, "été\n".encode(unsupported_encoding))
+        with pytest.raises(UnicodeError):
+            _poll(follower)
+
+        compressed_path = tmp_path / "file.log.gz"
+        compressed_path.write_bytes(gzip.compress(b"line\n"))
+        with pytest.raises(CompressedFileError):
+            _poll(FileFollower(str(compressed_path)))
@@ -2,9 +2,12 @@
 Testing module for the deepingtest.io.formatter module.
 """
 
+import io
+from types import SimpleNamespace
 
 import pytest
-from ..formatter import Formatter
+from deepintest.metrics import Metrics
+from ..formatter import Formatter, print_lines
 
 
 class TestFormatter:
@@ -71,3 +74,92 @@ class TestFormatter:
         formatter = Formatter(**args)
         for lines, result in tests:
             assert formatter.format_lines(lines) == result
+
+    def test_write_lines_returns_proper_result(self):
+        """
+        Tests the bytes written by Formatter.write_lines, with buffers smaller
+        and larger than the output.
+        """
+        lines = ["a b c", "é è", "", "ab cd ef"]
+        result = "[a b c]\n[é è]\n[]\n[ab cd ef]\n".encode("utf-8")
+        formatter = Formatter()
+        for buffer_size in [1, 2, 5, 1 << 20]:
+            stream = io.BytesIO()
+            count = formatter.write_lines(iter(lines), stream, buffer_size)
+            assert count == len(lines)
+            assert stream.getvalue() == result
+
+    def test_format_byte_line_returns_same_result_as_format_line(self):
+        """
+        Tests if Formatter.format_byte_line returns the str returned by
+        format_line encoded in UTF-8, and a `TypeError` if the line is not
+        bytes.
+        """
+        lines = ["a b c", "é è", "", " ab:cd "]
+        for formatter in [
+            Formatter(),
+            Formatter(":", "é", "«", "»"),
+            Formatter(" ", "-", "<", ">"),
+        ]:
+            for line in lines:
+                assert formatter.format_byte_line(line.encode("utf-8")) == (
+                    formatter.format_line(line).encode("utf-8")
+                )
+            for elem in ["a", 1, None]:
+                with pytest.raises(TypeError):
+                    formatter.format_byte_line(elem)
+
+    def test_write_lines_writes_bytes(self):
+        """
+        Tests if Formatter.write_lines writes the lines given as bytes like the
+        lines given as str.
+        """
+        lines = ["a b c", "é è", "", "ab cd ef"]
+        formatter = Formatter()
+        expected = io.BytesIO()
+        formatter.write_lines(lines, expected)
+        stream = io.BytesIO()
+        mixed = [lines[0], lines[1].encode("utf-8"), lines[2], lines[3].encode("utf-8")]
+        assert formatter.write_lines(mixed, stream, 2) == len(lines)
+        assert stream.getvalue() == expected.getvalue()
+
+    def test_write_lines_writes_by_chunks(self):
+        """
+        Tests if Formatter.write_lines writes the stream once per full buffer,
+        and doesn't modify the data written once the stream keeps it.
+        """
+        writes = []
+        stream = SimpleNamespace(write=writes.append)
+
+        formatter = Formatter()
+        formatter.write_lines(("a" * 9 for _ in range(10)), stream, 33)
+        assert list(map(len, writes)) == [36, 36, 36, 12]
+        assert b"".join(writes) == b"[aaaaaaaaa]\n" * 10
+
+    def test_write_lines_fails_when_parameter_is_wrong(self):
+        """
+        Tests if Formatter.write_lines returns a `TypeError` if a line is
+        neither a str nor bytes and a `ValueError` if the buffer size is not
+        valid.
+        """
+        formatter = Formatter()
+        for elem in [1, None, bytearray(b"a"), ["a"]]:
+            with pytest.raises(TypeError):
+                formatter.write_lines([elem], io.BytesIO())
+        for buffer_size in [0, -1, 1.5, "1"]:
+            with pytest.raises(ValueError):
+                formatter.write_lines(["a"], io.BytesIO(), buffer_size)
+
+
+def test_print_lines_prints_formatted_lines(capsys):
+    """
+    Tests if print_lines prints the formatted lines, str or bytes, after what
+    was printed before, and records the "format" stage into the metrics.
+    """
+    metrics = Metrics()
+    print("first")
+    print_lines(["a b", "é".encode("utf-8"), ""], 2, metrics)
+    assert capsys.readouterr().out == "first\n[a b]\n[é]\n[]\n"
+
+    stage = metrics.as_dict()["stages"]["format"]
+    assert (stage["lines"], stage["bytes"]) == (3, 14)
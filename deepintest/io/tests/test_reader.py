@@ -2,10 +2,19 @@
 Testing module for the deepingtest.io.reader module.
 """
 
-
+import bz2
+import gzip
+import lzma
 from typing import List
 import pytest
-from ..reader import TextFileReader
+from ..reader import (
+    CompressedDataError,
+    DecompressedSizeError,
+    TextFileReader,
+    detect_compression,
+)
+
+COMPRESSIONS = [("gzip", gzip), ("bz2", bz2), ("lzma", lzma)]
 
 
 class TestTextFileReader:
@@ -79,15 +88,13 @@ class TestTextFileReader:
         with open(path, "wb") as file_obj:
             for _ in range(size):
                 file_obj.write(b"\x00")
-        text_file_reader = TextFileReader(max_size=size-1)
+        text_file_reader = TextFileReader(max_size=size - 1)
         with pytest.raises(MemoryError):
             text_file_reader.read(path)
 
     def test_read_fails_when_file_has_unsupported_encoding(
-            self,
-            tmp_path,
-            unsupported_encoding
-        ):
+        self, tmp_path, unsupported_encoding
+    ):
         """
         Tests if TextFileReader.read return an `UnicodeError` when the provided
         path points to a file with a non supported encoding.
@@ -111,3 +118,343 @@ class TestTextFileReader:
         text_file_reader = TextFileReader()
         content = text_file_reader.read(path)
         assert content == lines
+
+    def test_constructor_fails_when_block_size_not_positive_int(self):
+        """
+        Tests if the constructor returns a `ValueError` when the provided
+        block size is not a positive int.
+        """
+        tests = ["a", 0, -1, 1.5]
+        for elem in tests:
+            with pytest.raises(ValueError):
+                TextFileReader(block_size=elem)
+
+    def test_read_last_line_returns_last_non_blank_line(self, tmp_path):
+        """
+        Tests if TextFileReader.read_last_line returns the last non blank line
+        and the offset where it starts.
+        """
+        path = tmp_path / "file"
+        lines = ["line1", "lïne2 ", "términal", "  ", ""]
+        self._create_test_file_from_lines(path, lines)
+        for block_size in [1, 2, 3, 65536]:
+            text_file_reader = TextFileReader(block_size=block_size)
+            line, offset = text_file_reader.read_last_line(path)
+            assert line == "términal"
+            assert offset == len("line1\nlïne2 \n".encode("utf-8"))
+
+    def test_read_last_line_stops_at_end(self, tmp_path):
+        """
+        Tests if TextFileReader.read_last_line only reads the bytes before the
+        end parameter.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(path, ["line1", "", "line2"])
+        text_file_reader = TextFileReader(block_size=2)
+        _, offset = text_file_reader.read_last_line(path)
+        assert text_file_reader.read_last_line(path, end=offset) == ("line1", 0)
+        assert text_file_reader.read_last_line(path, end=0) is None
+
+    def test_read_last_line_returns_none_when_only_blank_lines(self, tmp_path):
+        """
+        Tests if TextFileReader.read_last_line returns `None` when the file has
+        only blank lines.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(path, ["", " ", "\t "])
+        text_file_reader = TextFileReader()
+        assert text_file_reader.read_last_line(path) is None
+
+    def test_find_last_line_returns_same_lines_as_read_last_line(self, tmp_path):
+        """
+        Tests if TextFileReader.find_last_line returns the same lines and offsets
+        from the content of a file as TextFileReader.read_last_line from the
+        file.
+        """
+        path = tmp_path / "file"
+        tests = [
+            ["line1", "lïne2 ", "términal", "  ", ""],
+            ["line1", "", "line2"],
+            ["", " ", "\t "],
+        ]
+        for lines in tests:
+            self._create_test_file_from_lines(path, lines)
+            with open(path, "rb") as file_obj:
+                data = file_obj.read()
+            for block_size in [1, 2, 65536]:
+                text_file_reader = TextFileReader(block_size=block_size)
+                for end in [None, 0, 6, len(data)]:
+                    expected = text_file_reader.read_last_line(path, end=end)
+                    assert text_file_reader.find_last_line(data, end=end) == expected
+
+    def test_iter_lines_returns_same_lines_as_read(self, tmp_path):
+        """
+        Tests if TextFileReader.iter_lines yields the same lines as
+        TextFileReader.read, whatever the line endings are.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write("l1\r\nlé2\rl3 \n\nl4".encode("utf-8"))
+        for block_size in [1, 2, 3, 65536]:
+            text_file_reader = TextFileReader(block_size=block_size)
+            content = text_file_reader.read(path)
+            assert list(text_file_reader.iter_lines(path)) == content
+
+    def test_iter_lines_stops_at_end(self, tmp_path):
+        """
+        Tests if TextFileReader.iter_lines only yields the lines before the end
+        parameter.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(path, ["line1", "line2", "term"])
+        text_file_reader = TextFileReader()
+        _, offset = text_file_reader.read_last_line(path)
+        assert list(text_file_reader.iter_lines(path, end=offset)) == ["line1", "line2"]
+
+    def test_iter_lines_fails_when_file_has_unsupported_encoding(
+        self, tmp_path, unsupported_encoding
+    ):
+        """
+        Tests if TextFileReader.iter_lines return an `UnicodeError` when the
+        provided path points to a file with a non supported encoding.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(
+            path, ["line1", "line2"], unsupported_encoding
+        )
+        text_file_reader = TextFileReader()
+        with pytest.raises(UnicodeError):
+            list(text_file_reader.iter_lines(path))
+
+    def test_read_decodes_characters_split_across_blocks(self, tmp_path):
+        """
+        Tests if TextFileReader.read decodes the multi-byte characters that are
+        split across two blocks.
+        """
+        path = tmp_path / "file"
+        lines = ["éàü€", "abc", "manège"]
+        self._create_test_file_from_lines(path, lines)
+        for block_size in [1, 2, 3, 5]:
+            text_file_reader = TextFileReader(block_size=block_size)
+            assert text_file_reader.read(path) == lines
+
+    def test_iter_line_blocks_returns_same_lines_as_iter_lines(self, tmp_path):
+        """
+        Tests if TextFileReader.iter_line_blocks yields, by batches, the same
+        lines as TextFileReader.iter_lines.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(path, [f"line {i}" for i in range(100)])
+        text_file_reader = TextFileReader(block_size=64)
+        blocks = list(text_file_reader.iter_line_blocks(path))
+        assert len(blocks) > 1
+        assert sum(blocks, []) == list(text_file_reader.iter_lines(path))
+
+    def test_iter_byte_blocks_fails_when_file_has_unsupported_encoding(
+        self, tmp_path, unsupported_encoding
+    ):
+        """
+        Tests if TextFileReader.iter_byte_blocks returns an `UnicodeError` when
+        the file has a non supported encoding, unless the blocks aren't
+        validated, and if TextFileReader.decode_lines returns it.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(path, ["abc", "été"], unsupported_encoding)
+        text_file_reader = TextFileReader(block_size=2)
+        with pytest.raises(UnicodeError):
+            list(text_file_reader.iter_byte_blocks(path))
+
+        blocks = list(text_file_reader.iter_byte_blocks(path, validate=False))
+        assert b"".join(blocks) == path.read_bytes()
+        with pytest.raises(UnicodeError):
+            for block in blocks:
+                text_file_reader.decode_lines(block)
+
+    def test_split_fails_when_parts_not_positive_int(self, tmp_path):
+        """
+        Tests if TextFileReader.split returns a `ValueError` when the number of
+        parts is not a positive int.
+        """
+        path = tmp_path / "file"
+        self._create_test_file_from_lines(path, ["line1"])
+        text_file_reader = TextFileReader()
+        for elem in [0, -1, 1.5, "a"]:
+            with pytest.raises(ValueError):
+                text_file_reader.split(path, elem)
+
+
+class TestTextFileReaderBlocks:
+    """
+    The test class associated with the blocks and the ranges of bytes read by
+    the TextFileReader class.
+    """
+
+    def test_read_fails_when_file_ends_inside_a_character(self, tmp_path):
+        """
+        Tests if TextFileReader.read returns an `UnicodeError` when the file
+        ends with an incomplete multi-byte character.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write("line\né".encode("utf-8")[:-1])
+        for block_size in [1, 3, 65536]:
+            text_file_reader = TextFileReader(block_size=block_size)
+            with pytest.raises(UnicodeError):
+                text_file_reader.read(path)
+
+    def test_iter_byte_blocks_returns_blocks_of_complete_lines(self, tmp_path):
+        """
+        Tests if TextFileReader.iter_byte_blocks yields the bytes of the file
+        cut after line endings, without splitting a "\\r\\n", and if the lines
+        of the blocks are the lines of TextFileReader.iter_lines.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write("l1\r\nlé2\rl3 \n\nl4\r\n\r\nl5 ".encode("utf-8"))
+        content = path.read_bytes()
+
+        for block_size in [1, 2, 3, 5, 65536]:
+            text_file_reader = TextFileReader(block_size=block_size)
+            blocks = list(text_file_reader.iter_byte_blocks(path))
+            assert b"".join(blocks) == content
+            assert all(block.endswith((b"\n", b"\r")) for block in blocks[:-1])
+            assert not any(
+                first.endswith(b"\r") and second.startswith(b"\n")
+                for first, second in zip(blocks, blocks[1:])
+            )
+            lines = sum(map(text_file_reader.decode_lines, blocks), [])
+            assert lines == list(text_file_reader.iter_lines(path))
+
+            end = len("l1\r\nlé2\r".encode("utf-8"))
+            blocks = list(text_file_reader.iter_byte_blocks(path, end=end, start=4))
+            assert b"".join(blocks) == content[4:end]
+
+    def test_reader_fails_when_line_longer_than_max_line_size(self, tmp_path):
+        """
+        Tests if the constructor returns a `ValueError` when the maximum line
+        size is not a positive int, and if TextFileReader.iter_byte_blocks and
+        TextFileReader.read_last_line return a `MemoryError` when a line is
+        longer than the blocks too.
+        """
+        for elem in [0, -1, 1.5, "a"]:
+            with pytest.raises(ValueError):
+                TextFileReader(max_line_size=elem)
+
+        path = tmp_path / "file"
+        path.write_bytes(b"short\r\n" + b"x" * 300 + b"\nend\r\nterm")
+
+        for block_size in [1, 7, 64]:
+            reader = TextFileReader(block_size=block_size, max_line_size=400)
+            assert len(list(reader.iter_lines(path))) == 4
+
+            reader = TextFileReader(block_size=block_size, max_line_size=99)
+            with pytest.raises(MemoryError):
+                list(reader.iter_byte_blocks(path))
+            assert reader.read_last_line(path) == ("term", 313)
+            assert reader.read_last_line(path, end=7) == ("short", 0)
+            with pytest.raises(MemoryError):
+                reader.read_last_line(path, end=308)
+
+    def test_split_returns_ranges_aligned_on_lines(self, tmp_path):
+        """
+        Tests if the ranges returned by TextFileReader.split cover the file and
+        give the same lines as TextFileReader.iter_lines.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write("l1\r\nlé2\rl3 \n\nl4\r\n\r\nl5".encode("utf-8"))
+        text_file_reader = TextFileReader(block_size=2)
+        lines = text_file_reader.read(path)
+        for parts in [1, 2, 3, 4, 100]:
+            ranges = text_file_reader.split(path, parts)
+            assert len(ranges) <= parts
+            assert ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+            content = []
+            for start, end in ranges:
+                content.extend(text_file_reader.iter_lines(path, end=end, start=start))
+            assert content == lines
+
+
+class TestCompressedFiles:
+    """
+    The test class associated with the compressed files read by the
+    TextFileReader class.
+    """
+
+    def test_compressed_file_is_read_like_decompressed_file(self, tmp_path):
+        """
+        Tests if the lines, the last lines, the offsets and the ranges of a file
+        compressed with gzip, bz2 or xz are those of the decompressed file.
+        """
+        text = "".join(f"l{i} été\r\n" if i % 3 else f"l{i}\r" for i in range(3000))
+        data = f"{text}\n \nterm \n\n".encode("utf-8")
+        path = tmp_path / "file"
+        path.write_bytes(data)
+
+        for compression, module in COMPRESSIONS:
+            compressed_path = tmp_path / f"file.{compression}"
+            compressed_path.write_bytes(module.compress(data))
+
+            for block_size in [1, 7, 65536]:
+                reader = TextFileReader(block_size=block_size)
+                assert reader.get_compression(compressed_path) == compression
+                assert reader.get_compression(path) is None
+                assert reader.read(compressed_path) == reader.read(path)
+
+                line, offset = reader.read_last_line(path)
+                assert reader.read_last_line(compressed_path) == (line, offset)
+                previous = reader.read_last_line(path, end=offset)
+                assert reader.read_last_line(compressed_path, end=offset) == previous
+                assert reader.read_last_line(compressed_path, end=0) is None
+
+                blocks = reader.iter_byte_blocks(compressed_path, offset, start=9)
+                assert b"".join(blocks) == data[9:offset]
+                assert reader.split(compressed_path, 4) == [(0, len(data))]
+                assert reader.split(compressed_path, 4, end=offset) == [(0, offset)]
+
+    def test_compressed_file_fails_when_not_valid(self, tmp_path):
+        """
+        Tests if reading a compressed file returns a `DecompressedSizeError`
+        when the decompressed content exceeds max_decompressed_size (max_size
+        by default), a `CompressedDataError` when the compressed data is not
+        valid, and an `UnicodeError` when the decompressed content is not
+        properly encoded.
+        """
+        data = b"line\n" * 1000
+        path = tmp_path / "file"
+
+        for _, module in COMPRESSIONS:
+            compressed = module.compress(data)
+            path.write_bytes(compressed)
+
+            assert len(TextFileReader(max_size=len(data)).read(path)) == 1000
+            with pytest.raises(DecompressedSizeError):
+                TextFileReader(max_size=len(data) - 1).read(path)
+            with pytest.raises(DecompressedSizeError):
+                TextFileReader(max_decompressed_size=100).read_last_line(path)
+            reader = TextFileReader(
+                max_size=len(compressed), max_decompressed_size=len(data)
+            )
+            assert len(reader.read(path)) == 1000
+
+            path.write_bytes(compressed[: len(compressed) // 2])
+            with pytest.raises(CompressedDataError):
+                TextFileReader().read(path)
+
+            path.write_bytes(compressed[:10] + b"\x00" * 20 + compressed[30:])
+            with pytest.raises(CompressedDataError):
+                TextFileReader().read(path)
+
+            path.write_bytes(module.compress("été\n".encode("latin-1")))
+            with pytest.raises(UnicodeError):
+                TextFileReader().read(path)
+
+        with pytest.raises(ValueError):
+            TextFileReader(max_decompressed_size="1")
+
+    def test_detect_compression_reads_magic_bytes(self):
+        """Tests if detect_compression recognizes the compressed formats."""
+        for compression, module in COMPRESSIONS:
+            assert detect_compression(module.compress(b"")[:6]) == compression
+        for header in [b"", b"\x1f", b"BZ", b"line\n"]:
+            assert detect_compression(header) is None
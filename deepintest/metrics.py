@@ -0,0 +1,166 @@
+"""
+Module to measure the stages of a search.
+"""
+
+from os import replace
+from time import perf_counter
+from typing import Dict
+
+
+class Metrics:
+    """\
+    Class collecting the wall time, the number of lines and the number of
+    bytes of each stage of a search, and counters (for example the number of
+    matched lines).
+
+    The searches take an optional `Metrics` and only record into it at the
+    granularity of a block of lines, so there is nearly no overhead when no
+    `Metrics` is given. A `Metrics` can be merged into another one, for
+    example to gather the metrics of worker processes, and exported as JSON or
+    in the Prometheus text format.
+    """
+
+    _stages: Dict[str, Dict[str, float]]
+    _counters: Dict[str, int]
+    _start: float
+
+    def __init__(self) -> None:
+        """\
+        Constructor of the Metrics class, the wall time of the run is measured
+        from now.
+        """
+        self._stages = {}
+        self._counters = {}
+        self._start = perf_counter()
+
+    def record(self, stage: str, seconds: float, lines: int = 0, size: int = 0) -> None:
+        """\
+        Adds the wall time, the number of lines and the number of bytes handled
+        by a stage.
+
+        Parameters
+        ----------
+        stage
+            The name of the stage, for example "read" or "clean".
+        seconds
+            The wall time spent in the stage.
+        lines
+            The number of lines handled by the stage.
+        size
+            The number of bytes handled by the stage.
+        """
+        values = self._stages.get(stage)
+
+        if values is None:
+            values = self._stages[stage] = self._new_stage()
+
+        values["seconds"] += seconds
+        values["lines"] += lines
+        values["bytes"] += size
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """\
+        Adds a value to a counter.
+
+        Parameters
+        ----------
+        counter
+            The name of the counter, for example "matches".
+        value
+            The value added to the counter.
+        """
+        self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def merge(self, other: "Metrics") -> None:
+        """\
+        Adds the stages and the counters of another `Metrics`, the wall time of
+        the run is not changed.
+
+        Parameters
+        ----------
+        other
+            The `Metrics` to add.
+        """
+        # pylint: disable=protected-access
+        for stage, values in other._stages.items():
+            merged = self._stages.setdefault(stage, self._new_stage())
+            for field, value in values.items():
+                merged[field] += value
+
+        for counter, value in other._counters.items():
+            self.count(counter, value)
+
+    def as_dict(self) -> Dict:
+        """\
+        Returns the metrics as a `dict` (which can be dumped as JSON) with the
+        wall time of the run, the stages and the counters.
+        """
+        return {
+            "seconds": perf_counter() - self._start,
+            "stages": {stage: dict(values) for stage, values in self._stages.items()},
+            "counters": dict(self._counters),
+        }
+
+    def to_prometheus(self, prefix: str = "deepintest") -> str:
+        """\
+        Returns the metrics in the Prometheus text format.
+
+        The stages are exported as `PREFIX_stage_seconds_total`,
+        `PREFIX_stage_lines_total` and `PREFIX_stage_bytes_total` with a
+        `stage` label, the counters as `PREFIX_COUNTER_total` and the wall time
+        of the run as `PREFIX_run_seconds`.
+
+        Parameters
+        ----------
+        prefix
+            The prefix of the metric names.
+        """
+        metrics = self.as_dict()
+        output = [
+            f"# HELP {prefix}_run_seconds Wall time of the run.",
+            f"# TYPE {prefix}_run_seconds gauge",
+            f"{prefix}_run_seconds {metrics['seconds']!r}",
+        ]
+
+        for field, description in [
+            ("seconds", "Wall time spent in each stage."),
+            ("lines", "Lines handled by each stage."),
+            ("bytes", "Bytes handled by each stage."),
+        ]:
+            name = f"{prefix}_stage_{field}_total"
+            output.append(f"# HELP {name} {description}")
+            output.append(f"# TYPE {name} counter")
+            for stage, values in metrics["stages"].items():
+                output.append(f'{name}{{stage="{stage}"}} {values[field]!r}')
+
+        for counter, value in metrics["counters"].items():
+            name = f"{prefix}_{counter}_total"
+            output.append(f"# HELP {name} Number of {counter.replace('_', ' ')}.")
+            output.append(f"# TYPE {name} counter")
+            output.append(f"{name} {value}")
+
+        return "\n".join(output) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "deepintest") -> None:
+        """\
+        Writes the metrics in the Prometheus text format to a file.
+
+        The file is written next to `path` then renamed, so a collector never
+        reads a partial file (like the textfile collector of node_exporter).
+
+        Parameters
+        ----------
+        path
+            The path of the file.
+        prefix
+            The prefix of the metric names.
+        """
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file_obj:
+            file_obj.write(self.to_prometheus(prefix))
+
+        replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def _new_stage() -> Dict[str, float]:
+        """Returns the values of a stage that wasn't recorded yet."""
+        return {"seconds": 0.0, "lines": 0, "bytes": 0}
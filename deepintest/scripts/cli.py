@@ -0,0 +1,288 @@
+"""
+Command line interface of the solution script.
+"""
+
+import json
+import sys
+from importlib.util import find_spec
+from os.path import isdir
+
+import click
+
+from deepintest.metrics import Metrics
+from deepintest.scripts.solution import (
+    SearchOptions,
+    solution,
+    solution_batch,
+    solution_follow,
+    solution_stream,
+    solution_with_terms,
+)
+from deepintest.search.results import ResultCache
+
+# how the unsupported characters can be removed, see `Cleaner`
+CLEANER_ENGINES = ["loop", "translate", "regex", "numpy"]
+
+
+def check_cleaner(_ctx, _param, value):
+    """Checks that the cleaner engine can be used, NumPy is optional."""
+    if value == "numpy" and find_spec("numpy") is None:
+        raise click.BadParameter("numpy needs NumPy, install deepintest[numpy].")
+    return value
+
+
+def _check_options(paths, terms, follow, options, cache_dir):
+    """\
+    Raises a `click.UsageError` if the search options are used with an option
+    which doesn't support them, instead of ignoring them.
+    """
+    if not paths:
+        raise click.UsageError("Missing argument 'PATHS...'.")
+
+    # the options of the searches of whole files, maybe by several processes
+    search_options = [
+        options.engine != "stream",
+        options.jobs > 1,
+        cache_dir is not None,
+    ]
+
+    # the terms are searched in a single pass over the lines of PATH
+    if terms is not None and (
+        len(paths) != 1 or options.skip_blocks or any(search_options)
+    ):
+        raise click.UsageError(
+            "--terms takes a single PATH and can't be used with --engine mmap, "
+            "--jobs, --cache-dir or --skip-blocks."
+        )
+
+    # the growing file is read as a stream by a single process, without cache
+    follow_options = [
+        terms is not None,
+        options.skip_blocks,
+        options.max_decompressed_size is not None,
+        options.status,
+    ]
+
+    if follow and (len(paths) != 1 or any(search_options + follow_options)):
+        raise click.UsageError(
+            "--follow takes a single PATH and can't be used with --terms, "
+            "--engine mmap, --jobs, --cache-dir, --skip-blocks, "
+            "--max-decompressed-size or --status."
+        )
+
+    # the matched lines are printed block by block, they aren't kept
+    if options.memory_budget is not None and (
+        len(paths) != 1
+        or isdir(paths[0])
+        or any(search_options + [terms is not None, follow, options.status])
+    ):
+        raise click.UsageError(
+            "--memory-budget takes a single PATH and can't be used with --terms, "
+            "--follow, --engine mmap, --jobs, --cache-dir or --status."
+        )
+
+
+# the settings of the search are gathered into **options, see `SearchOptions`
+# pylint: disable=no-value-for-parameter,too-many-arguments
+# pylint: disable=too-many-positional-arguments
+@click.command()
+@click.option("--max-size", default=int(1e9), help="maximum file size in bytes")
+@click.option(
+    "--max-decompressed-size",
+    type=int,
+    default=None,
+    help="maximum decompressed size in bytes of a compressed file, --max-size if unset",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["stream", "mmap"]),
+    default="stream",
+    help="read the lines one by one or search the memory-mapped file",
+)
+@click.option(
+    "--cleaner",
+    "cleaner_engine",
+    type=click.Choice(CLEANER_ENGINES),
+    default="regex",
+    callback=check_cleaner,
+    help="how the unsupported characters are removed from the matched lines",
+)
+@click.option(
+    "--terms",
+    default=None,
+    help="file of search terms (one per line) to search all the lines for",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="number of processes searching the file (or the files)",
+)
+@click.option(
+    "--status",
+    is_flag=True,
+    default=False,
+    help="print the exit status of each file when searching several files",
+)
+@click.option(
+    "--buffer-size",
+    type=click.IntRange(min=1),
+    default=1 << 20,
+    help="size in bytes of the buffer the output is written through",
+)
+@click.option(
+    "--serve",
+    default=None,
+    metavar="SOCKET",
+    help="answer the search requests sent to the Unix domain socket SOCKET",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    default=False,
+    help="print the time, lines and bytes of each stage as JSON to stderr",
+)
+@click.option(
+    "--prometheus",
+    default=None,
+    metavar="FILE",
+    help="write the time, lines and bytes of each stage to FILE for Prometheus",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    metavar="DIR",
+    help="keep the results in DIR, so unchanged files aren't searched again",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=int(1e8),
+    help="maximum size in bytes of the results kept in --cache-dir",
+)
+@click.option(
+    "--skip-blocks",
+    is_flag=True,
+    default=False,
+    help="only search the blocks which may contain the term, see `deepintest bloom`",
+)
+@click.option(
+    "--follow",
+    is_flag=True,
+    default=False,
+    help="search the lines appended to PATH as it grows, for the --term option",
+)
+@click.option(
+    "--term",
+    default=None,
+    help="search term of --follow (the last line of a growing file isn't a term)",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    help="seconds between the polls of --follow",
+)
+@click.option(
+    "--checkpoint",
+    "checkpoint_path",
+    default=None,
+    metavar="FILE",
+    help="file keeping the offset reached by --follow, to resume from it",
+)
+@click.option(
+    "--memory-budget",
+    type=click.IntRange(min=1 << 20),
+    default=None,
+    help="stream PATH of any size (no --max-size) with about this memory in bytes",
+)
+@click.argument("paths", nargs=-1)
+def main(
+    terms,
+    serve,
+    stats,
+    prometheus,
+    cache_dir,
+    cache_size,
+    follow,
+    term,
+    paths,
+    **options,
+):
+    """
+    Solution to Deeper Insights Coding Test.
+
+    This script takes the path (`PATH`) of a file as argument. Then, it reads
+    the file, extracts the search term and print the clean matched lines. A
+    file compressed with gzip, bz2 or xz is decompressed as it is read.
+
+    With the `--terms` option, the search terms are read from another file and
+    all the lines of `PATH` are searched for all the terms in a single pass.
+
+    With several paths or a directory, each file is searched for its own
+    search term and the output of each file is printed after a header.
+
+    With the `--serve` option, no path is given and the script runs a server
+    answering the search requests sent to a Unix domain socket.
+
+    With the `--stats` or `--prometheus` option, the wall time, the lines and
+    the bytes of each stage of the search are measured and written when the
+    script ends, even if it fails.
+
+    With the `--cache-dir` option, the results are kept in a directory and the
+    files that didn't change since their last search are not read again.
+
+    With the `--skip-blocks` option, the blocks of each file which can't
+    contain the search term according to the filters built by
+    `deepintest bloom build` are not read.
+
+    With the `--follow` option, the lines appended to `PATH` are searched for
+    the term of the `--term` option as the file grows, until the script is
+    interrupted. The offset reached can be kept in a `--checkpoint` file.
+
+    With the `--memory-budget` option, the matched lines are printed block by
+    block as they are found, so the memory used stays bounded whatever the
+    size of `PATH`, and `--max-size` doesn't apply.
+    """
+    options = SearchOptions(**options)
+
+    if serve is not None:
+        if paths:
+            raise click.UsageError("--serve doesn't take PATH.")
+        # pylint: disable=import-outside-toplevel
+        from deepintest.scripts.server import serve as run_server
+
+        run_server(serve, options.max_size, options.cleaner_engine)
+        return
+
+    if follow != (term is not None):
+        raise click.UsageError("--follow and --term must be used together.")
+
+    _check_options(paths, terms, follow, options, cache_dir)
+
+    metrics = Metrics() if stats or prometheus else None
+    cache = None
+
+    if cache_dir is not None:
+        cache = ResultCache(cache_dir, cache_size)
+
+    try:
+        if follow:
+            solution_follow(paths[0], term, options, metrics=metrics)
+        elif options.memory_budget is not None:
+            solution_stream(paths[0], options, metrics)
+        elif terms is not None:
+            solution_with_terms(paths[0], terms, options, metrics)
+        elif len(paths) == 1 and not isdir(paths[0]):
+            solution(paths[0], options, metrics, cache)
+        else:
+            solution_batch(paths, options, metrics, cache)
+    finally:
+        if stats:
+            print(json.dumps(metrics.as_dict()), file=sys.stderr)
+        if prometheus:
+            metrics.write_prometheus(prometheus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Command line interface of the tools of the solution (the `deepintest` script).
+"""
+
+import sys
+
+import click
+
+from deepintest._conf import solution_characters
+from deepintest.io.formatter import print_lines
+from deepintest.io.reader import TextFileReader
+from deepintest.scripts.cli import CLEANER_ENGINES, check_cleaner
+from deepintest.scripts.common import read_error
+from deepintest.search.bloom import BlockFilter
+from deepintest.search.cache import get_cleaner
+from deepintest.search.index import TrigramIndex
+
+
+def _fail(message):
+    """Prints an error message and exits with 1."""
+    print(message)
+    sys.exit(1)
+
+
+def _check(reader, path, compressed=True):
+    """
+    Checks a file like the solution script, or exits with its error. Without
+    `compressed`, a compressed file is an error too.
+    """
+    try:
+        compression = reader.get_compression(path)
+    except (OSError, MemoryError, ValueError) as error:
+        _fail(read_error(path, error))
+
+    if compression is not None and not compressed:
+        _fail(f"Error: {path} is compressed with {compression}, decompress it first")
+
+
+@click.group()
+def main():
+    """Tools of the Deeper Insights Coding Test solution."""
+
+
+@main.group()
+def index():
+    """
+    Trigram index of a file searched for many terms.
+
+    The index is built once with `build`, then `search` only reads the lines
+    having all the trigrams of the search terms.
+    """
+
+
+# pylint: disable=no-value-for-parameter
+@index.command()
+@click.option("--max-size", default=int(1e9), help="maximum file size in bytes")
+@click.option("--index", "index_path", default=None, help="path of the index file")
+@click.argument("path")
+def build(max_size, index_path, path):
+    """
+    Builds the index of PATH, written to PATH.tri by default.
+    """
+    reader = TextFileReader(max_size=max_size)
+    trigram_index = TrigramIndex(path, index_path, reader)
+    _check(reader, path, compressed=False)
+
+    try:
+        lines = trigram_index.build()
+    except UnicodeError as error:
+        _fail(read_error(path, error))
+    except OSError as error:
+        _fail(f"Error: {trigram_index.index_path} can't be written ({error})")
+
+    print(f"{lines} lines of {path} indexed into {trigram_index.index_path}")
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+@index.command()
+@click.option("--max-size", default=int(1e9), help="maximum file size in bytes")
+@click.option("--index", "index_path", default=None, help="path of the index file")
+@click.option(
+    "--cleaner",
+    type=click.Choice(CLEANER_ENGINES),
+    default="regex",
+    callback=check_cleaner,
+    help="how the unsupported characters are removed from the matched lines",
+)
+@click.option(
+    "--buffer-size",
+    type=click.IntRange(min=1),
+    default=1 << 20,
+    help="size in bytes of the buffer the output is written through",
+)
+@click.argument("path")
+@click.argument("terms", nargs=-1, required=True)
+def search(max_size, index_path, cleaner, buffer_size, path, terms):
+    """
+    Searches PATH for each of the TERMS through its index.
+
+    All the lines of PATH are searched and the clean matches of each term are
+    printed after a line with the term followed by a colon, like the `--terms`
+    option of the solution script. The terms shorter than three characters
+    are searched by scanning the lines.
+    """
+    if any(len(term.split(" ")) != 1 for term in terms):
+        _fail("Error: search term should be a word (string without spaces)")
+
+    reader = TextFileReader(max_size=max_size)
+    trigram_index = TrigramIndex(path, index_path, reader)
+    line_cleaner = get_cleaner(characters=solution_characters, engine=cleaner)
+    _check(reader, path)
+
+    for term in dict.fromkeys(terms):
+        try:
+            lines = trigram_index.search(term)
+        except UnicodeError as error:
+            _fail(read_error(path, error))
+        except FileNotFoundError:
+            _fail(
+                f"Error: {trigram_index.index_path} doesn't exist\n"
+                f"Run `deepintest index build {path}` to build it"
+            )
+        except ValueError as error:
+            _fail(f"Error: {error}\nRun `deepintest index build {path}` to build it")
+        except (OSError, MemoryError) as error:
+            _fail(read_error(path, error))
+
+        print(f"{term}:")
+        print_lines(line_cleaner.clean_lines(lines), buffer_size)
+
+
+@main.group()
+def bloom():
+    """
+    Block filters of a file, to skip the blocks which can't contain a term.
+
+    The filters are built once with `build`, then the `--skip-blocks` option of
+    the solution script only searches the blocks which may contain the term.
+    """
+
+
+# pylint: disable=no-value-for-parameter
+@bloom.command(name="build")
+@click.option("--max-size", default=int(1e9), help="maximum file size in bytes")
+@click.option("--filter", "filter_path", default=None, help="path of the sidecar file")
+@click.option(
+    "--block-size",
+    type=click.IntRange(min=1),
+    default=1 << 20,
+    help="size in bytes of the blocks",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=0.01,
+    help="rate of false positives of the filter of each block",
+)
+@click.argument("path")
+def build_filters(max_size, filter_path, block_size, error_rate, path):
+    """
+    Builds the block filters of PATH, written to PATH.bloom by default.
+    """
+    reader = TextFileReader(max_size=max_size)
+    block_filter = BlockFilter(path, filter_path, reader, block_size, error_rate)
+    _check(reader, path, compressed=False)
+
+    try:
+        blocks = block_filter.build()
+    except UnicodeError as error:
+        _fail(read_error(path, error))
+    except OSError as error:
+        _fail(f"Error: {block_filter.filter_path} can't be written ({error})")
+
+    print(f"{blocks} blocks of {path} filtered into {block_filter.filter_path}")
+
+
+if __name__ == "__main__":
+    main()
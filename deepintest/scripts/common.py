@@ -0,0 +1,190 @@
+"""
+Helpers shared by the solution script and the search server: the errors of the
+solution, the search term of a file and the search of a range of a file.
+"""
+
+from time import perf_counter
+
+from deepintest.io.reader import (
+    CompressedDataError,
+    CompressedFileError,
+    DecompressedSizeError,
+)
+from deepintest.search.matcher import Matcher
+
+
+class SolutionError(Exception):
+    """
+    Error stopping the solution, its message is what the solution prints.
+    """
+
+
+# the messages of the errors raised by TextFileReader, the first error type
+# matching the error gives its message
+_READ_ERRORS = (
+    (FileNotFoundError, "Error: {path} doesn't exist"),
+    (
+        DecompressedSizeError,
+        "Error: {path} decompressed size is too big\n"
+        "Please consider using the --max-decompressed-size option\n"
+        "Run `solution --help` for more information",
+    ),
+    (
+        MemoryError,
+        "Error: {path} size is too big\n"
+        "Please consider using the --max-size option\n"
+        "Run `solution --help` for more information",
+    ),
+    (CompressedDataError, "Error: {path} is compressed but corrupted or truncated"),
+    (CompressedFileError, "Error: {path} is compressed, decompress it first"),
+    (PermissionError, "Error: {path} doesn't have adequate right access"),
+    (OSError, "Error: {path} exists but can't be opened"),
+    (UnicodeError, "Error: {path} is not encoded with UTF-8"),
+)
+
+# in streaming mode, a MemoryError comes from a line too long
+_LINE_SIZE_ERROR = (
+    "Error: {path} has a line longer than the memory budget allows\n"
+    "Please consider using a larger --memory-budget option\n"
+    "Run `solution --help` for more information"
+)
+
+
+def read_error(path, error, streaming=False):
+    """
+    Returns the SolutionError associated with an error raised by
+    TextFileReader. In `streaming` mode, the size of the file isn't limited but
+    the size of its lines is.
+    """
+    for error_type, message in _READ_ERRORS:
+        if isinstance(error, error_type):
+            if error_type is MemoryError and streaming:
+                message = _LINE_SIZE_ERROR
+            return SolutionError(message.format(path=path))
+
+    return SolutionError(f"Error: {path} is a directory or a link")
+
+
+def clean_lines(cleaner, matched_lines, metrics, encoded=False):
+    """
+    Returns the clean lines of a block of matched lines, the "clean" stage and
+    the matches are recorded into `metrics` if it isn't `None`.
+
+    The `encoded` lines are `bytes` encoded in UTF-8, they are cleaned without
+    being decoded if they are ASCII, and the clean lines are `bytes` too.
+    """
+    clock = perf_counter()
+
+    if encoded:
+        new_lines = cleaner.clean_byte_lines(matched_lines)
+        size = sum(map(len, matched_lines))
+    else:
+        new_lines = cleaner.clean_lines(matched_lines)
+        size = None
+
+    if metrics is not None:
+        if size is None:
+            size = sum(len(line.encode("utf-8")) for line in matched_lines)
+        metrics.record("clean", perf_counter() - clock, len(matched_lines), size)
+        metrics.count("matches", len(matched_lines))
+
+    return new_lines
+
+
+def _count_lines(block):
+    """Returns the number of lines of a block of bytes of complete lines."""
+    count = block.count(b"\n") + block.count(b"\r") - block.count(b"\r\n")
+    return count + (block[-1:] not in (b"\n", b"\r"))
+
+
+def iter_range(reader, cleaner, path, start, end, search_term, metrics=None):
+    """
+    Reads a range of bytes of a file block by block and yields, for each block,
+    the clean lines containing the search term. The stages are recorded into
+    `metrics` if it isn't `None`.
+    """
+    # the range is searched with the reader and the cleaner of the caller
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    matcher = Matcher(search_term=search_term)
+    clock = perf_counter()
+
+    # the ASCII blocks are searched, cleaned and formatted without being
+    # decoded or split into lines, the other blocks are checked by decoding
+    # them, so the result is the same
+    for block in reader.iter_byte_blocks(path, end=end, start=start, validate=False):
+        encoded = block.isascii()
+
+        if encoded:
+            read_clock = perf_counter()
+            matched_lines = matcher.match_bytes(block)
+            count = _count_lines(block) if metrics is not None else 0
+        else:
+            lines = reader.decode_lines(block)
+            read_clock = perf_counter()
+            matched_lines = [lines[index] for index in matcher.match_many(lines)]
+            count = len(lines)
+
+        if metrics is not None:
+            metrics.record("read", read_clock - clock, count, len(block))
+            metrics.record("match", perf_counter() - read_clock, count, len(block))
+
+        yield clean_lines(cleaner, matched_lines, metrics, encoded)
+        clock = perf_counter()
+
+    # the last read finds the end of the range
+    if metrics is not None:
+        metrics.record("read", perf_counter() - clock)
+
+
+def find_search_term(reader, path, streaming=False, data=None):
+    """
+    Returns the search term of a file (its last non-blank line) and the offset
+    of the search term, the lines to search are before it. If `data` is given,
+    it holds the content of the file (for example a memory-mapped file), so the
+    file is not opened again.
+
+    The function raises a SolutionError if the file doesn't have a valid search
+    term and a line before it (see `read_error` for `streaming`).
+    """
+    # search term can't match empty lines, or lines with only spaces, so the
+    # reader skips all of them when looking for the last line
+    try:
+        if data is None:
+            last_line = reader.read_last_line(path)
+        else:
+            last_line = reader.find_last_line(data)
+        previous_line = None
+        if last_line and data is None:
+            previous_line = reader.read_last_line(path, end=last_line[1])
+        elif last_line:
+            previous_line = reader.find_last_line(data, end=last_line[1])
+    except (OSError, MemoryError, ValueError) as error:
+        raise read_error(path, error, streaming) from error
+
+    # empty file or with only empty lines
+    if last_line is None:
+        raise SolutionError(
+            f"Error: {path} is empty or has only empty lines or lines with spaces"
+        )
+
+    # must have at least a line and a search term
+    if previous_line is None:
+        raise SolutionError(
+            "Error: file must contain at least two lines (a line and a term)"
+        )
+
+    # we extract the search term, the lines to match are before it
+    check_search_term(last_line[0])
+
+    return last_line
+
+
+def check_search_term(search_term):
+    """
+    Raises a SolutionError if a search term isn't a word (a non-empty string
+    without spaces).
+    """
+    if not search_term or len(search_term.split(" ")) != 1:
+        raise SolutionError(
+            "Error: search term should be a word (string without spaces)"
+        )
@@ -0,0 +1,511 @@
+"""
+Search server answering the solution requests over a Unix domain socket.
+"""
+
+import asyncio
+import json
+import signal
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from mmap import ACCESS_READ, mmap
+from os import stat, unlink
+from socket import AF_UNIX, SOCK_STREAM, socket
+from threading import Lock
+from time import perf_counter
+from typing import BinaryIO
+
+from deepintest._conf import solution_characters
+from deepintest.io.formatter import Formatter
+from deepintest.io.reader import TextFileReader
+from deepintest.scripts.common import (
+    SolutionError,
+    check_search_term,
+    find_search_term,
+    iter_range,
+    read_error,
+)
+from deepintest.search.cache import get_cleaner
+from deepintest.search.cleaner import Cleaner
+from deepintest.search.scanner import MappedScanner
+
+
+def _percentile(values, fraction):
+    """Returns the nearest-rank percentile of a sorted list (0 if empty)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class _WarmFile:
+    """
+    A memory-mapped file with what was learnt about it, valid as long as the
+    status of the file doesn't change.
+
+    The mapping is closed once the file is evicted and no search uses it, the
+    searches using it are counted under the lock of the server.
+    """
+
+    def __init__(self, path, key):
+        with open(path, "rb") as file_obj:
+            # empty files can't be mapped, the mapping outlives the file object
+            if file_obj.seek(0, 2) > 0:
+                self.data = mmap(file_obj.fileno(), 0, access=ACCESS_READ)
+            else:
+                self.data = b""
+
+        self.key = key
+        self.last_line = None
+        self.validated = 0
+        self.users = 0
+        self.evicted = False
+
+    def acquire(self):
+        """Starts the use of the file by a search."""
+        self.users += 1
+
+    def release(self):
+        """\
+        Ends the use of the file by a search, the mapping is closed if the file
+        was evicted and no other search uses it.
+        """
+        self.users -= 1
+        if self.evicted and self.users == 0:
+            self.close()
+
+    def evict(self):
+        """\
+        Marks the file as removed from the server, the mapping is closed now or
+        by the last search using it.
+        """
+        self.evicted = True
+        if self.users == 0:
+            self.close()
+
+    def close(self):
+        """Closes the mapping of the file."""
+        if isinstance(self.data, mmap):
+            self.data.close()
+
+
+# the settings, the warm files and the latencies are attributes
+class SearchServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Server answering the solution requests over a Unix domain socket.
+
+    The server is started once, so the cleaner is only built once, and the
+    recently searched files stay memory-mapped with their search term and what
+    was checked of their encoding. A file is mapped again if its status (inode,
+    size or modification time) changes. A file compressed with gzip, bz2 or xz
+    can't be mapped, it is decompressed as it is read on each search, like in
+    the `solution` script.
+
+    A request is a JSON object on a single line, `{"path": PATH}` to search a
+    file like the `solution` script, or `{"path": PATH, "term": TERM}` to
+    search all the lines of a file for a given term. The response is a JSON
+    object on a single line, `{"status": N, "output": OUTPUT, "latency": S}`,
+    where `OUTPUT` is what the `solution` script prints and `N` its exit
+    status. `{"command": "stats"}` returns the number of searches and the p50
+    and p99 latencies (in seconds) of the last ones.
+
+    A connection can send many requests, they are answered in order. The
+    connections are handled concurrently, the searches run in a thread pool.
+    """
+
+    _socket_path: str
+    _max_size: int
+    _max_files: int
+    _max_workers: int
+    _cleaner: Cleaner
+    _formatter: Formatter
+    _files: "OrderedDict[str, _WarmFile]"
+    _latencies: deque
+    _lock: Lock
+
+    def __init__(
+        self,
+        socket_path: str,
+        max_size: int = int(1e9),
+        cleaner_engine: str = "regex",
+        *,
+        max_files: int = 32,
+        max_workers: int = None,
+        history: int = 100000,
+    ) -> None:
+        """\
+        Constructor of the SearchServer class.
+
+        The constructor raises a `ValueError` if `max_files` or `history` is
+        not a positive `int`, and the same errors as `TextFileReader` and
+        `Cleaner` for the other parameters.
+
+        Parameters
+        ----------
+        socket_path
+            The path of the Unix domain socket to listen on.
+        max_size
+            The maximum size of a file to search in bytes.
+        cleaner_engine
+            The engine of the `Cleaner`.
+        max_files
+            The number of recently searched files kept memory-mapped.
+        max_workers
+            The number of threads running the searches, the default of
+            `ThreadPoolExecutor` if not provided.
+        history
+            The number of latencies kept to compute the percentiles.
+        """
+        # the limits of the warm files and of the history are keyword-only
+        # pylint: disable=too-many-arguments
+        for name, value in [("max files", max_files), ("history", history)]:
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} {value} is not a positive int.")
+
+        # the reader is checked now, but each search uses its own reader
+        TextFileReader(max_size=max_size)
+
+        self._socket_path = socket_path
+        self._max_size = max_size
+        self._max_files = max_files
+        self._max_workers = max_workers
+        self._cleaner = get_cleaner(
+            characters=solution_characters, engine=cleaner_engine
+        )
+        self._formatter = Formatter()
+        self._files = OrderedDict()
+        self._latencies = deque(maxlen=history)
+        self._lock = Lock()
+
+    def search(self, path: str, search_term: str = None):
+        """\
+        Searches a file and returns the exit status and the output of the
+        `solution` script as a `tuple`.
+
+        If `search_term` is not provided, the search term is the last non-blank
+        line of the file, and only the lines before it are searched. Otherwise
+        all the lines are searched.
+
+        The method can be called from several threads at the same time.
+
+        Parameters
+        ----------
+        path
+            The path of the file to search.
+        search_term
+            The term to search.
+        """
+        try:
+            new_lines = self._search(path, search_term)
+        except SolutionError as error:
+            return 1, f"{error}\n"
+
+        output = "".join(f"{self._formatter.format_line(line)}\n" for line in new_lines)
+        return 0, output
+
+    def get_stats(self):
+        """\
+        Returns a `dict` with the number of searches and the p50 and p99
+        latencies (in seconds) of the last searches.
+        """
+        with self._lock:
+            count = len(self._latencies)
+            latencies = sorted(self._latencies)
+
+        return {
+            "count": count,
+            "p50": _percentile(latencies, 0.5),
+            "p99": _percentile(latencies, 0.99),
+        }
+
+    async def serve(self) -> None:
+        """\
+        Listens on the socket and answers the requests until cancelled. The
+        socket file is removed when the server stops.
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                server = await asyncio.start_unix_server(
+                    lambda reader, writer: self._handle(loop, executor, reader, writer),
+                    path=self._socket_path,
+                )
+                try:
+                    async with server:
+                        await server.serve_forever()
+                finally:
+                    try:
+                        unlink(self._socket_path)
+                    except FileNotFoundError:
+                        pass
+        finally:
+            # the searches are done once the executor is shut down
+            with self._lock:
+                while self._files:
+                    self._files.popitem()[1].evict()
+
+    async def _handle(self, loop, executor, reader, writer):
+        """Answers the requests of a connection in order."""
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                response = await loop.run_in_executor(executor, self._answer, line)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # the client left or sent a line longer than the stream limit
+            pass
+        finally:
+            writer.close()
+
+    def _answer(self, line):
+        """Returns the response to a request."""
+        start = perf_counter()
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+
+        if not isinstance(request, dict):
+            return {"status": 2, "output": "Error: request is not a JSON object\n"}
+
+        if request.get("command", "search") == "stats":
+            return self.get_stats()
+
+        path, search_term = request.get("path"), request.get("term")
+
+        if not isinstance(path, str) or not isinstance(search_term, (str, type(None))):
+            return {"status": 2, "output": "Error: path and term should be strings\n"}
+
+        status, output = self.search(path, search_term)
+        latency = perf_counter() - start
+
+        with self._lock:
+            self._latencies.append(latency)
+
+        return {"status": status, "output": output, "latency": latency}
+
+    def _search(self, path, search_term):
+        """\
+        Returns the clean matched lines of a file, or raises a SolutionError
+        like the `solution` script.
+        """
+        reader = TextFileReader(max_size=self._max_size)
+
+        try:
+            reader.check(path)
+            compressed = reader.get_compression(path) is not None
+            warm_file = None if compressed else self._open(path)
+        except (OSError, MemoryError, ValueError) as error:
+            raise read_error(path, error) from error
+
+        if warm_file is None:
+            return self._search_stream(reader, path, search_term)
+
+        try:
+            return self._search_file(reader, path, warm_file, search_term)
+        finally:
+            self._release(warm_file)
+
+    def _search_file(self, reader, path, warm_file, search_term):
+        """Returns the clean matched lines of a warm file, see `_search`."""
+        if search_term is None:
+            # the errors are not kept, the file is expected to be fixed
+            last_line = warm_file.last_line
+            if last_line is None:
+                last_line = find_search_term(reader, path, data=warm_file.data)
+                with self._lock:
+                    warm_file.last_line = last_line
+            search_term, end = last_line
+        else:
+            check_search_term(search_term)
+            end = len(warm_file.data)
+
+        scanner = MappedScanner(search_term=search_term, reader=reader, validate=False)
+
+        # the offsets are at the start of a line, so if the bytes before the
+        # last checked offset can be decoded, the bytes before `end` can too
+        try:
+            if end > warm_file.validated:
+                scanner.check_encoding(path, warm_file.data, 0, end)
+                with self._lock:
+                    warm_file.validated = max(warm_file.validated, end)
+            matched_lines = list(scanner.scan_buffer(path, warm_file.data, end=end))
+        except UnicodeError as error:
+            raise read_error(path, error) from error
+
+        return self._cleaner.clean_lines(matched_lines)
+
+    def _search_stream(self, reader, path, search_term):
+        """\
+        Returns the clean matched lines of a compressed file, which is read
+        block by block like in the `solution` script, see `_search`.
+        """
+        if search_term is None:
+            search_term, end = find_search_term(reader, path)
+        else:
+            check_search_term(search_term)
+            end = None
+
+        new_lines = []
+
+        try:
+            for block_lines in iter_range(
+                reader, self._cleaner, path, 0, end, search_term
+            ):
+                new_lines.extend(block_lines)
+        except (OSError, MemoryError, ValueError) as error:
+            raise read_error(path, error) from error
+
+        # the lines of the ASCII blocks are cleaned without being decoded
+        return [
+            line.decode("utf-8") if isinstance(line, bytes) else line
+            for line in new_lines
+        ]
+
+    def _open(self, path):
+        """\
+        Returns the warm file of a path, mapping the file if needed. The warm
+        file is used until `_release` is called.
+        """
+        status = stat(path)
+        key = (status.st_dev, status.st_ino, status.st_size, status.st_mtime_ns)
+
+        with self._lock:
+            warm_file = self._files.get(path)
+            if warm_file is not None and warm_file.key == key:
+                self._files.move_to_end(path)
+                warm_file.acquire()
+                return warm_file
+
+        warm_file = _WarmFile(path, key)
+        warm_file.acquire()
+
+        with self._lock:
+            # the file may have been mapped again by another search
+            if path in self._files:
+                self._files.pop(path).evict()
+            self._files[path] = warm_file
+            while len(self._files) > self._max_files:
+                self._files.popitem(last=False)[1].evict()
+
+        return warm_file
+
+    def _release(self, warm_file):
+        """Ends the use of a warm file by a search."""
+        with self._lock:
+            warm_file.release()
+
+
+class SearchClient:
+    """
+    Client sending requests to a `SearchServer` over a single connection.
+    """
+
+    _socket: socket
+    _file: BinaryIO
+
+    def __init__(self, socket_path: str, timeout: float = None) -> None:
+        """\
+        Constructor of the SearchClient class, it connects to the server.
+
+        The constructor raises an `OSError` if the server can't be reached.
+
+        Parameters
+        ----------
+        socket_path
+            The path of the Unix domain socket the server listens on.
+        timeout
+            The timeout of the socket operations in seconds, no timeout if not
+            provided.
+        """
+        self._socket = socket(AF_UNIX, SOCK_STREAM)
+        self._socket.settimeout(timeout)
+
+        try:
+            self._socket.connect(socket_path)
+        except OSError:
+            self._socket.close()
+            raise
+
+        self._file = self._socket.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def search(self, path: str, search_term: str = None):
+        """\
+        Sends a search request and returns the exit status and the output of
+        the `solution` script as a `tuple`.
+
+        Parameters
+        ----------
+        path
+            The path of the file to search.
+        search_term
+            The term to search in all the lines, the last line of the file is
+            the search term if not provided.
+        """
+        request = {"path": path}
+        if search_term is not None:
+            request["term"] = search_term
+
+        response = self._send(request)
+        return response["status"], response["output"]
+
+    def get_stats(self):
+        """Returns the statistics of the server (see `SearchServer.get_stats`)."""
+        return self._send({"command": "stats"})
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def _send(self, request):
+        """Sends a request and returns the response."""
+        self._file.write(json.dumps(request).encode("utf-8") + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+
+        if not line:
+            raise ConnectionError("the server closed the connection.")
+
+        return json.loads(line)
+
+
+def serve(socket_path, max_size=int(1e9), cleaner_engine="regex"):
+    """
+    Runs a SearchServer until it receives SIGINT or SIGTERM, then prints the
+    latencies to the standard error.
+    """
+    server = SearchServer(socket_path, max_size=max_size, cleaner_engine=cleaner_engine)
+
+    async def run():
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, task.cancel)
+        try:
+            await server.serve()
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+
+    stats = server.get_stats()
+    print(
+        f"searches: {stats['count']}, "
+        f"latency p50: {stats['p50'] * 1000:.3f} ms, "
+        f"p99: {stats['p99'] * 1000:.3f} ms",
+        file=sys.stderr,
+    )
@@ -4,95 +4,744 @@ Solution to Deeper Insights coding test.
 
 # coding: utf-8
 
-import re
 import sys
-import click
+from os import lstat, walk
+from os.path import isdir, islink, join
+from itertools import chain, repeat
+from time import perf_counter, sleep
+from typing import NamedTuple, Optional
 
+from deepintest._conf import solution_characters
+from deepintest.metrics import Metrics
 from deepintest.io.reader import TextFileReader
-from deepintest.search.cleaner import Cleaner
-from deepintest.search.matcher import Matcher
-from deepintest.io.formatter import Formatter
+from deepintest.scripts.common import (
+    SolutionError,
+    clean_lines,
+    find_search_term,
+    iter_range,
+    read_error,
+)
+from deepintest.search.cache import get_cleaner
+from deepintest.search.matcher import Matcher, MultiMatcher
+from deepintest.search.scanner import MappedScanner
+from deepintest.io.formatter import print_lines
 
 
-def solution(path, max_size=int(1e9)):
+class SearchOptions(NamedTuple):
+    """\
+    Settings of the solution functions, each function uses the ones it
+    supports and ignores the others.
+
+    Attributes
+    ----------
+    max_size
+        The maximum size of a file in bytes.
+    max_decompressed_size
+        The maximum size in bytes of the decompressed content of a compressed
+        file, `max_size` if `None`.
+    engine
+        "stream" to read the lines block by block or "mmap" to search the
+        memory-mapped file.
+    cleaner_engine
+        The `Cleaner` engine, they all give the same output.
+    jobs
+        The number of processes searching the file (or the files).
+    buffer_size
+        The size in bytes of the buffer the output is written through.
+    skip_blocks
+        Whether only the blocks which may contain the search term according
+        to the block filters of the file (see `BlockFilter`) are searched.
+    status
+        Whether the exit status of each file is printed by `solution_batch`.
+    memory_budget
+        The memory in bytes `solution_stream` searches a file with, 64 MiB if
+        `None`.
+    interval
+        The seconds between the polls of `solution_follow`.
+    checkpoint_path
+        The file keeping the offset reached by `solution_follow`, if any.
     """
-    Reads a file, extracts the search term then print the clean matched lines.
+
+    max_size: int = int(1e9)
+    max_decompressed_size: Optional[int] = None
+    engine: str = "stream"
+    cleaner_engine: str = "regex"
+    jobs: int = 1
+    buffer_size: int = 1 << 20
+    skip_blocks: bool = False
+    status: bool = False
+    memory_budget: Optional[int] = None
+    interval: float = 1.0
+    checkpoint_path: Optional[str] = None
+
+
+def _new_reader(options):
+    """Returns the reader of the files with the size limits of the options."""
+    return TextFileReader(
+        max_size=options.max_size,
+        max_decompressed_size=options.max_decompressed_size,
+    )
+
+
+def _search_range(path, bounds, search_term, options, stats=False):
+    """
+    Returns the clean lines of a range of bytes of a file (its `bounds`) that
+    contain the search term, and the metrics of the search (`None` without
+    `stats`).
+
+    The function opens the file itself, so it can run in a worker process
+    without sending it any line. The metrics are recorded by block of lines.
+    """
+    start, end = bounds
+    reader = _new_reader(options)
+    metrics = Metrics() if stats else None
+
+    # we specify allowed characters, the cleaner is built once per process
+    cleaner = get_cleaner(characters=solution_characters, engine=options.cleaner_engine)
+
+    # we filter the lines containing the search term, the memory-mapped file is
+    # read and matched in a single "scan" stage
+    if options.engine == "mmap":
+        scanner = MappedScanner(search_term=search_term, reader=reader)
+        clock = perf_counter()
+        matched_lines = list(scanner.scan(path, end=end, start=start))
+        if metrics is not None:
+            seconds = perf_counter() - clock
+            metrics.record("scan", seconds, len(matched_lines), end - start)
+        return clean_lines(cleaner, matched_lines, metrics), metrics
+
+    block_lines = iter_range(reader, cleaner, path, start, end, search_term, metrics)
+
+    return list(chain.from_iterable(block_lines)), metrics
+
+
+def _search_ranges(path, ranges, search_term, options, metrics):
+    """
+    Returns the clean lines of the ranges of bytes of a file that contain the
+    search term, in the order of the file. With more than one job, the ranges
+    are searched by a pool of processes. The metrics of the ranges are merged
+    into `metrics` if it isn't `None`.
+    """
+    args = (repeat(path), ranges, repeat(search_term), repeat(options))
+    args = (*args, repeat(metrics is not None))
+
+    if options.jobs > 1 and len(ranges) > 1:
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=options.jobs) as executor:
+            results = list(executor.map(_search_range, *args))
+    else:
+        results = list(map(_search_range, *args))
+
+    new_lines = []
+
+    for range_lines, range_metrics in results:
+        new_lines.extend(range_lines)
+        if metrics is not None:
+            metrics.merge(range_metrics)
+
+    return new_lines
+
+
+def _get_cached_lines(cache, key, metrics):
+    """
+    Returns the clean lines stored in the result cache under a key, or `None`
+    if they aren't stored. The hits and the misses are counted into `metrics`
+    if it isn't `None`.
     """
+    data = cache.get(key)
+
+    if metrics is not None:
+        metrics.count("cache_misses" if data is None else "cache_hits")
 
-    reader = TextFileReader(max_size=max_size)
+    if data is None:
+        return None
 
+    # each line is followed by a new line character, lines can be empty
+    return data.decode("utf-8").split("\n")[:-1]
+
+
+def _put_cached_lines(cache, key, path, search_term, new_lines):
+    """
+    Stores the clean lines of a search into the result cache, unless the file
+    changed during the search. The cache is an optimization, so the errors are
+    ignored.
+    """
     try:
-        file_content = reader.read(path)
-    except FileNotFoundError:
-        print(f"Error: {path} doesn't exist")
-        sys.exit(1)
-    except MemoryError:
-        print(f"Error: {path} size is too big")
-        print("Please consider using the --max-size option")
-        print("Run `solution --help` for more information")
-        sys.exit(1)
-    except PermissionError:
-        print(f"Error: {path} doesn't have adequate right access")
-        sys.exit(1)
+        if cache.get_key(path, search_term, solution_characters) == key:
+            data = b"".join(
+                (new_line if isinstance(new_line, bytes) else new_line.encode("utf-8"))
+                + b"\n"
+                for new_line in new_lines
+            )
+            cache.put(key, data)
     except OSError:
-        print(f"Error: {path} exists but can't be opened")
+        pass
+
+
+def _get_filtered_ranges(reader, path, search_term, offset, metrics):
+    """
+    Returns the ranges of bytes of the blocks of a file before `offset` which
+    may contain the search term according to the block filters of the file
+    (see `BlockFilter`), or `None` if they can't be used.
+
+    The number of blocks skipped is printed to the standard error and counted
+    into `metrics` if it isn't `None`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from deepintest.search.bloom import BlockFilter
+
+    block_filter = BlockFilter(path, reader=reader)
+
+    try:
+        ranges, blocks = block_filter.get_ranges(search_term, end=offset)
+    except (OSError, ValueError) as error:
+        print(
+            f"Warning: the block filters of {path} can't be used ({error})",
+            file=sys.stderr,
+        )
+        return None
+
+    print(f"{path}: {blocks - len(ranges)} of {blocks} blocks skipped", file=sys.stderr)
+
+    if metrics is not None:
+        metrics.count("blocks", blocks)
+        metrics.count("blocks_skipped", blocks - len(ranges))
+
+    return ranges
+
+
+def _solve(path, options, metrics=None, cache=None):
+    """
+    Reads a file, extracts the search term then returns the clean matched lines.
+
+    The function raises a SolutionError if the file can't be searched.
+
+    The search term is found by reading the file backward from its end, then
+    the lines before the search term are streamed, so the whole file is never
+    held in memory. The blocks of ASCII lines are searched and cleaned without
+    being decoded, so their clean lines are returned as `bytes`.
+
+    With the "mmap" engine, the file is memory-mapped and searched at the byte
+    level, so only the matched lines are decoded.
+
+    A file compressed with gzip, bz2 or xz is decompressed as it is read, its
+    decompressed content being limited (see `TextFileReader`). It is always
+    read as a stream, by a single process.
+
+    With more than one job, the lines are split into ranges of bytes aligned on
+    the line boundaries, which are searched and cleaned by a pool of processes.
+    The results are returned in the order of the file.
+
+    The stages of the search are recorded into `metrics` if it isn't `None`.
+
+    If `cache` (a `ResultCache`) isn't `None`, the clean lines of a file that
+    didn't change since its last search are read from the cache, only the end
+    of the file is read to get the search term.
+
+    With `skip_blocks`, only the blocks of the file which may contain the
+    search term according to its block filters (see `BlockFilter`) are
+    searched. The whole file is searched if it doesn't have valid filters.
+    """
+
+    reader = _new_reader(options)
+    stats = metrics is not None
+
+    if stats:
+        metrics.count("files")
+
+    clock = perf_counter()
+    search_term, offset = find_search_term(reader, path)
+
+    if stats:
+        metrics.record("find_term", perf_counter() - clock, 1)
+
+    key = None
+
+    if cache is not None:
+        try:
+            key = cache.get_key(path, search_term, solution_characters)
+        except OSError as error:
+            raise read_error(path, error) from error
+
+        new_lines = _get_cached_lines(cache, key, metrics)
+
+        if new_lines is not None:
+            return new_lines
+
+    ranges = None
+
+    if options.skip_blocks:
+        ranges = _get_filtered_ranges(reader, path, search_term, offset, metrics)
+
+    # the matched lines are kept so nothing is returned if the file turns out
+    # to be badly encoded
+    try:
+        # a compressed file can't be memory-mapped
+        if options.engine == "mmap" and reader.get_compression(path) is not None:
+            options = options._replace(engine="stream")
+
+        if ranges is None and options.jobs > 1:
+            # more ranges than processes to balance the work
+            ranges = reader.split(path, options.jobs * 4, end=offset)
+
+        new_lines = _search_ranges(
+            path, ranges or [(0, offset)], search_term, options, metrics
+        )
+    except (OSError, MemoryError, ValueError) as error:
+        raise read_error(path, error) from error
+
+    if key is not None:
+        _put_cached_lines(cache, key, path, search_term, new_lines)
+
+    return new_lines
+
+
+def solution(path, options=None, metrics=None, cache=None):
+    """
+    Reads a file, extracts the search term then print the clean matched lines.
+    The settings of the search are the `options` (a `SearchOptions`, the
+    defaults if `None`).
+
+    The search term is found by reading the file backward from its end, then
+    the lines before the search term are streamed, so the whole file is never
+    held in memory. The blocks of ASCII lines are searched, cleaned and
+    formatted as bytes, without being decoded or split into lines.
+
+    With the "mmap" engine, the file is memory-mapped and searched at the byte
+    level, so only the matched lines are decoded.
+
+    A file compressed with gzip, bz2 or xz is decompressed as it is read, so
+    the output is the same as for the decompressed file. Its size is limited
+    by `max_size` and the size of its decompressed content by
+    `max_decompressed_size` (`max_size` if `None`). It is always read as a
+    stream, by a single process.
+
+    With more than one job, the lines are split into ranges of bytes aligned on
+    the line boundaries, which are searched and cleaned by a pool of `jobs`
+    processes. The results are printed in the order of the file.
+
+    The output is encoded in UTF-8 and written by chunks of `buffer_size`
+    bytes.
+
+    The wall time, lines and bytes of each stage are recorded into `metrics` if
+    it isn't `None`.
+
+    If `cache` (a `ResultCache`) isn't `None`, the clean lines of a file that
+    didn't change since its last search are read from the cache.
+
+    With `skip_blocks`, only the blocks of the file which may contain the
+    search term according to its block filters (see `BlockFilter`) are
+    searched, and the number of blocks skipped is printed to the standard
+    error.
+    """
+    options = SearchOptions() if options is None else options
+
+    try:
+        new_lines = _solve(path, options, metrics, cache)
+    except SolutionError as error:
+        print(error)
         sys.exit(1)
-    except UnicodeError:
-        print(f"Error: {path} is not encoded with UTF-8")
+
+    # we print the outptut
+    print_lines(new_lines, options.buffer_size, metrics)
+
+
+def solution_stream(path, options=None, metrics=None):
+    """
+    Reads a file, extracts the search term then prints the clean matched lines
+    as they are found, with a memory use bounded by the `memory_budget` of the
+    `options` (a `SearchOptions`) whatever the size of the file.
+
+    Every stage works on a block of the file at a time: the block is read,
+    searched and cleaned, then its matches are formatted and printed before
+    the next block is read. The blocks, the longest line allowed and the
+    output buffer are each a sixteenth of the budget, the rest leaves room for
+    the decoded lines and their clean copies. So the size of the file isn't
+    limited (there is no `max_size`), but a line longer than a sixteenth of
+    the budget stops the search. A compressed file is decompressed as it is
+    read, its decompressed content being limited to `max_decompressed_size`
+    bytes if it isn't `None`.
+
+    Unlike `solution`, the lines are printed before the whole file is read, so
+    a file that turns out to be badly encoded prints the lines matched in the
+    blocks before the faulty line, then its error message.
+
+    The stages of the search are recorded into `metrics` if it isn't `None`.
+    The `engine`, `jobs` and `max_size` options don't apply.
+
+    With `skip_blocks`, only the blocks of the file which may contain the
+    search term according to its block filters (see `BlockFilter`) are
+    searched, and the number of blocks skipped is printed to the standard
+    error.
+    """
+    options = SearchOptions() if options is None else options
+    memory_budget = options.memory_budget
+    memory_budget = 1 << 26 if memory_budget is None else memory_budget
+    size = max(1 << 12, memory_budget // 16)
+    reader = TextFileReader(
+        max_size=sys.maxsize,
+        block_size=size,
+        max_line_size=size,
+        max_decompressed_size=options.max_decompressed_size,
+    )
+    cleaner = get_cleaner(characters=solution_characters, engine=options.cleaner_engine)
+
+    try:
+        if metrics is not None:
+            metrics.count("files")
+
+        clock = perf_counter()
+        search_term, offset = find_search_term(reader, path, streaming=True)
+
+        if metrics is not None:
+            metrics.record("find_term", perf_counter() - clock, 1)
+
+        ranges = None
+
+        if options.skip_blocks:
+            ranges = _get_filtered_ranges(reader, path, search_term, offset, metrics)
+
+        try:
+            for start, end in [(0, offset)] if ranges is None else ranges:
+                for new_lines in iter_range(
+                    reader, cleaner, path, start, end, search_term, metrics
+                ):
+                    if new_lines:
+                        print_lines(new_lines, min(options.buffer_size, size), metrics)
+        except (OSError, MemoryError, ValueError) as error:
+            raise read_error(path, error, streaming=True) from error
+    except SolutionError as error:
+        print(error)
         sys.exit(1)
-    except ValueError:
-        print(f"Error: {path} is a directory or a link")
+
+
+def _solve_file(path, options, stats=False, cache=None):
+    """
+    Returns the clean matched lines of a file, the error message (`None` if the
+    file was searched) and the metrics of the search (`None` without `stats`).
+    The file is searched by a single process.
+    """
+    metrics = Metrics() if stats else None
+
+    try:
+        return _solve(path, options._replace(jobs=1), metrics, cache), None, metrics
+    except SolutionError as error:
+        return [], str(error), metrics
+
+
+def _expand_paths(paths):
+    """
+    Returns the files of a list of paths, the directories are replaced by the
+    files they contain (recursively, in alphabetical order).
+    """
+    files = []
+
+    for path in paths:
+        if isdir(path) and not islink(path):
+            for root, dirs, names in walk(path):
+                dirs.sort()
+                files.extend(join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+
+    return files
+
+
+def _file_size(path):
+    """Returns the size of a file, or 0 if it can't be accessed."""
+    try:
+        return lstat(path).st_size
+    except OSError:
+        return 0
+
+
+def solution_batch(paths, options=None, metrics=None, cache=None):
+    """
+    Runs the solution on many files and directories (replaced by the files they
+    contain) in a single process or in a pool of `jobs` processes, with the
+    `options` (a `SearchOptions`, the defaults if `None`).
+
+    The files are submitted from the largest to the smallest, and each process
+    takes the next file as soon as it is done, so a large file doesn't hold
+    back the small ones. The files go through the same checks as in
+    `solution`.
+
+    The output of each file is printed, in the order of the paths, after a
+    `==> PATH <==` header. A file that can't be searched prints its error
+    message. With `status`, each file output is followed by a
+    `==> PATH: exit status N <==` line.
+
+    The function exits with 1 if any file can't be searched.
+
+    The stages of all the files are recorded into `metrics` if it isn't `None`.
+
+    If `cache` (a `ResultCache`) isn't `None`, the clean lines of the files that
+    didn't change since their last search are read from the cache.
+
+    With `skip_blocks`, only the blocks of each file which may contain its
+    search term according to its block filters (see `BlockFilter`) are
+    searched.
+    """
+    options = SearchOptions() if options is None else options
+    files = _expand_paths(paths)
+    args = (options, metrics is not None, cache)
+
+    if options.jobs > 1:
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=options.jobs)
+        futures = {
+            path: executor.submit(_solve_file, path, *args)
+            for path in sorted(files, key=_file_size, reverse=True)
+        }
+        results = (futures[path].result() for path in files)
+    else:
+        executor = None
+        results = (_solve_file(path, *args) for path in files)
+
+    failed = False
+
+    try:
+        for path, (new_lines, error, file_metrics) in zip(files, results):
+            if metrics is not None:
+                metrics.merge(file_metrics)
+            print(f"==> {path} <==")
+            print_lines(new_lines, options.buffer_size, metrics)
+            if error is not None:
+                print(error)
+                failed = True
+            if options.status:
+                print(f"==> {path}: exit status {int(error is not None)} <==")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if failed:
         sys.exit(1)
 
-    # search term can't match empty lines, or lines with only spaces, so we can
-    # remove all of them
-    file_content = list(filter(lambda x: len(re.sub(" ", "", x))>0, file_content))
+
+def _read_search_terms(reader, terms_path):
+    """
+    Returns the search terms of a file of search terms (one per line), the
+    function raises a SolutionError if the file can't be read or if it doesn't
+    have valid search terms.
+    """
+    try:
+        search_terms = [term for term in reader.iter_lines(terms_path) if term]
+    except (OSError, MemoryError, ValueError) as error:
+        raise read_error(terms_path, error) from error
+
+    if len(search_terms) == 0:
+        raise SolutionError(
+            f"Error: {terms_path} is empty or has only empty lines or lines with spaces"
+        )
+
+    if any(len(search_term.split(" ")) != 1 for search_term in search_terms):
+        raise SolutionError(
+            "Error: search term should be a word (string without spaces)"
+        )
+
+    return search_terms
+
+
+def _add_clean_lines(cleaner, found_lines, matched_lines, metrics):
+    """
+    Cleans the lines of a block containing search terms, given with the terms
+    they contain, then appends them to the lists of `matched_lines` of these
+    terms. Each line is cleaned once whatever the number of terms.
+    """
+    new_lines = clean_lines(cleaner, [line for line, _ in found_lines], metrics)
+
+    for new_line, (_, found_terms) in zip(new_lines, found_lines):
+        for search_term in found_terms:
+            matched_lines[search_term].append(new_line)
+
+
+def _search_terms(reader, path, matcher, cleaner, metrics):
+    """
+    Reads all the lines of a file once and returns, for each search term of the
+    `MultiMatcher`, the clean lines containing it. The stages are recorded into
+    `metrics` if it isn't `None`.
+
+    The function raises a SolutionError if the file can't be read or if it is
+    empty.
+    """
+    # each matched line is cleaned once and kept for all the terms it contains
+    matched_lines = {search_term: [] for search_term in matcher.search_terms}
+    is_empty = True
+
+    try:
+        clock = perf_counter()
+        # the blocks are checked by decoding them, like iter_line_blocks does
+        for block in reader.iter_byte_blocks(path, validate=False):
+            lines = reader.decode_lines(block)
+            read_clock = perf_counter()
+            is_empty = is_empty and not any(lines)
+            found_lines = [
+                (line, found_terms)
+                for line, found_terms in zip(lines, map(matcher.match, lines))
+                if found_terms
+            ]
+            if metrics is not None:
+                metrics.record("read", read_clock - clock, len(lines), len(block))
+                metrics.record(
+                    "match", perf_counter() - read_clock, len(lines), len(block)
+                )
+            _add_clean_lines(cleaner, found_lines, matched_lines, metrics)
+            clock = perf_counter()
+    except (OSError, MemoryError, ValueError) as error:
+        raise read_error(path, error) from error
 
     # empty file or with only empty lines
-    if len(file_content) == 0:
-        print(f"Error: {path} is empty or has only empty lines or lines with spaces")
-        sys.exit(1)
+    if is_empty:
+        raise SolutionError(
+            f"Error: {path} is empty or has only empty lines or lines with spaces"
+        )
+
+    # the last read finds the end of the file
+    if metrics is not None:
+        metrics.count("files")
+        metrics.record("read", perf_counter() - clock)
+
+    return matched_lines
+
+
+def solution_with_terms(path, terms_path, options=None, metrics=None):
+    """
+    Reads a file of search terms (one per line) then prints, for each term, the
+    clean lines of another file containing the term.
 
-    # must have at least a line and a search term
-    if len(file_content) < 2:
-        print("Error: file must contain at least two lines (a line and a term)")
+    All the lines of the file are searched, and they are read once whatever the
+    number of terms. The matches of each term are printed after a line with the
+    term followed by a colon. Both files can be compressed, like in `solution`.
+
+    The settings are the `options` (a `SearchOptions`, the defaults if
+    `None`), the `engine`, `jobs` and `skip_blocks` options don't apply. The
+    stages of the search are recorded into `metrics` if it isn't `None`.
+    """
+    options = SearchOptions() if options is None else options
+    reader = _new_reader(options)
+
+    try:
+        matcher = MultiMatcher(search_terms=_read_search_terms(reader, terms_path))
+        cleaner = get_cleaner(
+            characters=solution_characters, engine=options.cleaner_engine
+        )
+        matched_lines = _search_terms(reader, path, matcher, cleaner, metrics)
+    except SolutionError as error:
+        print(error)
         sys.exit(1)
 
-    # we extract the search term and the lines to match
-    search_term = file_content[-1]
-    lines = file_content[:-1]
+    # we print the outptut
+    for search_term, new_lines in matched_lines.items():
+        print(f"{search_term}:")
+        print_lines(new_lines, options.buffer_size, metrics)
+
 
-    if len(search_term.split(" ")) != 1:
+def _poll(follower, matcher, cleaner, buffer_size, metrics):
+    """
+    Reads the lines appended to a followed file since the previous poll and
+    prints the clean lines containing the search term, block by block. The
+    stages are recorded into `metrics` if it isn't `None`.
+    """
+    clock = perf_counter()
+
+    for lines in follower.iter_line_blocks():
+        read_clock = perf_counter()
+        matched_lines = [lines[index] for index in matcher.match_many(lines)]
+        if metrics is not None:
+            metrics.record("read", read_clock - clock, len(lines))
+            metrics.record("match", perf_counter() - read_clock, len(lines))
+        new_lines = clean_lines(cleaner, matched_lines, metrics)
+        print_lines(new_lines, buffer_size, metrics)
+        clock = perf_counter()
+
+
+def solution_follow(path, search_term, options=None, polls=None, metrics=None):
+    """
+    Searches a growing file, like a log, for a search term and prints the
+    clean matched lines as they are appended, until it is interrupted.
+
+    The settings are the `options` (a `SearchOptions`, the defaults if
+    `None`). The file is polled every `interval` seconds, and only the bytes
+    appended since the previous poll are read (see `FileFollower`), so the work of a
+    poll depends on the size of the new data. A partial line is held until its
+    line ending is written. All the lines are searched, the first poll reads
+    the whole file (or resumes from the checkpoint).
+
+    The offset reached is saved to `checkpoint_path`, if provided, after each
+    poll, so a new run resumes where the previous one stopped. The file is
+    searched again from its beginning when it is truncated or rotated.
+
+    The function stops after `polls` polls if it isn't `None`. The stages of
+    the search are recorded into `metrics` if it isn't `None`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from deepintest.io.follower import FileFollower
+
+    if not search_term or len(search_term.split(" ")) != 1:
         print("Error: search term should be a word (string without spaces)")
         sys.exit(1)
 
-    # we filter the lines containing the search term
+    options = SearchOptions() if options is None else options
+    checkpoint_path = options.checkpoint_path
+    reader = TextFileReader(max_size=options.max_size)
     matcher = Matcher(search_term=search_term)
-    matched_lines = [line for line in lines if matcher.match(line)]
+    cleaner = get_cleaner(characters=solution_characters, engine=options.cleaner_engine)
 
-    # we specify allowed characters
-    characters = [("A", "Z"), ("a", "z"), ("À", "Ö"), ("Ø", "ʯ"), "ù", "ú"]
-    cleaner = Cleaner(characters=characters)
+    try:
+        follower = FileFollower(path, reader, checkpoint_path)
+    except OSError as error:
+        print(read_error(checkpoint_path, error))
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: {checkpoint_path} is not a valid checkpoint ({error})")
+        sys.exit(1)
 
-    # this will format the output
-    formatter = Formatter()
+    count = 0
 
-    # we print the outptut
-    for line in matched_lines:
-        print(formatter.format_line(cleaner.clean_line(line)))
+    try:
+        while polls is None or count < polls:
+            if count > 0:
+                sleep(options.interval)
+            count += 1
+
+            if metrics is not None:
+                metrics.count("polls")
 
-# pylint: disable=no-value-for-parameter
-@click.command()
-@click.option('--max-size', default=int(1e9), help='maximum file size in bytes')
-@click.argument("path")
-def main(max_size, path):
+            _poll(follower, matcher, cleaner, options.buffer_size, metrics)
+    except (OSError, MemoryError, ValueError) as error:
+        print(read_error(path, error))
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.close()
+
+
+def main(args=None):
     """
-    Solution to Deeper Insights Coding Test.
+    Entry point of the solution script.
 
-    This script takes the path (`PATH`) of a file as argument. Then, it reads
-    the file, extracts the search term and print the clean matched lines.
+    A single file path, the common case, is searched without importing click,
+    which takes most of the start-up time for small files. The other arguments
+    are parsed by the click command of `deepintest.scripts.cli`.
     """
-    solution(path, max_size)
+    args = sys.argv[1:] if args is None else args
+
+    if len(args) == 1 and not args[0].startswith("-") and not isdir(args[0]):
+        solution(args[0])
+    else:
+        # the click command imports this module, which is fully imported by now
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from deepintest.scripts.cli import main as cli_main
+
+        # pylint: disable=no-value-for-parameter
+        cli_main(args)
+
 
 if __name__ == "__main__":
     main()
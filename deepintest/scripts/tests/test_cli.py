@@ -0,0 +1,220 @@
+"""
+Testing module for the command line interface of the solution script.
+"""
+
+import gzip
+import json
+import os
+from os.path import dirname, join
+from shutil import copy
+
+import pytest
+
+from .. import cli
+
+# the click command takes its parameters from the list of arguments
+# pylint: disable=no-value-for-parameter
+
+
+def _read_file(path):
+    """Returns the content of a file as a str."""
+    with open(path, encoding="utf-8") as file_obj:
+        return file_obj.read()
+
+
+def test_cli_terms_fails_with_options_not_supported(capsys, tmp_path):
+    """
+    Tests if the --terms option is a usage error with the options that
+    solution_with_terms doesn't support, instead of ignoring them.
+    """
+    path = join(dirname(__file__), "examples", "example1.txt")
+    terms_path = str(tmp_path / "terms")
+
+    with open(terms_path, "w", encoding="utf-8") as file_obj:
+        file_obj.write("ipsum\n")
+
+    for args in [
+        [path, path],
+        ["--engine", "mmap", path],
+        ["--jobs", "2", path],
+        ["--cache-dir", str(tmp_path / "cache"), path],
+        ["--skip-blocks", path],
+    ]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main(["--terms", terms_path, *args])
+
+        assert pytest_wrapped_e.value.code == 2
+        assert "--terms takes a single PATH" in capsys.readouterr().err
+
+
+def test_cli_writes_metrics(capsys, tmp_path):
+    """
+    Tests if the --stats option prints the metrics as JSON to the standard
+    error and the --prometheus option writes them to a file, also when the
+    solution fails.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    prometheus = str(tmp_path / "metrics.prom")
+    tests = [
+        ([join(root_dir, "example1.txt")], 0),
+        ([join(root_dir, "example1.txt"), join(root_dir, "example2.txt")], 0),
+        ([str(tmp_path / "missing")], 1),
+    ]
+
+    for paths, code in tests:
+        args = ["--stats", "--prometheus", prometheus, *paths]
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main(args)
+
+        assert pytest_wrapped_e.value.code == code
+
+        captured = capsys.readouterr()
+        metrics = json.loads(captured.err)
+        assert set(metrics) == {"seconds", "stages", "counters"}
+        assert metrics["counters"]["files"] == len(paths)
+
+        with open(prometheus, encoding="utf-8") as file_obj:
+            assert "deepintest_run_seconds" in file_obj.read()
+
+
+def test_cli_uses_result_cache(capsys, tmp_path):
+    """
+    Tests if the --cache-dir option gives the same output for one or several
+    files, and stores the results in the directory.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    cache_dir = str(tmp_path / "cache")
+    paths = [join(root_dir, f"example{i}.txt") for i in range(1, 3)]
+    expected = ""
+
+    for i, path in enumerate(paths, 1):
+        expected += f"==> {path} <==\n" + _read_file(join(root_dir, f"result{i}.txt"))
+
+    for _ in range(2):
+        for args, output in [
+            (paths[:1], _read_file(join(root_dir, "result1.txt"))),
+            (paths, expected),
+        ]:
+            with pytest.raises(SystemExit) as pytest_wrapped_e:
+                cli.main(["--cache-dir", cache_dir, *args])
+
+            assert pytest_wrapped_e.value.code == 0
+            assert capsys.readouterr().out == output
+
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cli_follow(tmp_path):
+    """
+    Tests if the --follow option searches the file for the --term option, and
+    if it is a usage error to use them without each other or several PATH.
+    """
+    path = str(tmp_path / "app.log")
+    copy(join(dirname(__file__), "examples", "example1.txt"), path)
+
+    for args in [
+        ["--follow", path],
+        ["--term", "ee", path],
+        ["--follow", "--term", "ee", path, path],
+        ["--follow", "--term", "ee", "--terms", path, path],
+    ]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main(args)
+
+        assert pytest_wrapped_e.value.code == 2
+
+
+def test_cli_follow_fails_with_options_not_supported(capsys, tmp_path):
+    """
+    Tests if the --follow option is a usage error with the options that
+    solution_follow doesn't support, instead of ignoring them.
+    """
+    path = str(tmp_path / "app.log")
+    copy(join(dirname(__file__), "examples", "example1.txt"), path)
+
+    for args in [
+        ["--engine", "mmap"],
+        ["--jobs", "2"],
+        ["--cache-dir", str(tmp_path / "cache")],
+        ["--skip-blocks"],
+        ["--max-decompressed-size", "1000"],
+        ["--status"],
+    ]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main(["--follow", "--term", "ee", *args, path])
+
+        assert pytest_wrapped_e.value.code == 2
+        assert "--follow takes a single PATH" in capsys.readouterr().err
+
+
+def test_cli_memory_budget(capsys, tmp_path):
+    """
+    Tests if the --memory-budget option searches a file larger than
+    --max-size, and if it is a usage error to use it with several PATH or the
+    options which keep the results in memory.
+    """
+    path = str(tmp_path / "file.txt")
+    copy(join(dirname(__file__), "examples", "example1.txt"), path)
+
+    args = ["--memory-budget", str(1 << 20), "--max-size", "1", path]
+    cli.main(args, standalone_mode=False)
+    assert capsys.readouterr().out == _read_file(
+        join(dirname(__file__), "examples", "result1.txt")
+    )
+
+    for args in [
+        [path, path],
+        [str(tmp_path)],
+        ["--terms", path, path],
+        ["--jobs", "2", path],
+        ["--engine", "mmap", path],
+        ["--cache-dir", str(tmp_path / "cache"), path],
+        ["--follow", "--term", "ee", path],
+        ["--status", path],
+    ]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main(["--memory-budget", str(1 << 20), *args])
+
+        assert pytest_wrapped_e.value.code == 2
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        cli.main(["--memory-budget", "1000", path])
+
+    assert pytest_wrapped_e.value.code == 2
+
+
+def test_cli_max_decompressed_size(capsys, tmp_path):
+    """
+    Tests if the decompressed content of a compressed file is limited by the
+    --max-decompressed-size option, or by the --max-size option without it
+    (except with --memory-budget).
+    """
+    path = str(tmp_path / "file.txt.gz")
+    with open(path, "wb") as file_obj:
+        file_obj.write(gzip.compress(b"a tree\n" * 1000 + b"tree\n"))
+
+    for args in [["--max-size", "1000"], ["--max-decompressed-size", "1000"]]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main([*args, path])
+
+        assert pytest_wrapped_e.value.code == 1
+        assert capsys.readouterr().out == (
+            f"Error: {path} decompressed size is too big\n"
+            "Please consider using the --max-decompressed-size option\n"
+            "Run `solution --help` for more information\n"
+        )
+
+    args = ["--max-size", "1000", "--max-decompressed-size", "10000", path]
+    cli.main(args, standalone_mode=False)
+    assert capsys.readouterr().out == "[a tree]\n" * 1000
+
+    # the streaming mode has no --max-size, but --max-decompressed-size applies
+    args = ["--memory-budget", str(1 << 20), "--max-size", "1000", path]
+    cli.main(args, standalone_mode=False)
+    assert capsys.readouterr().out == "[a tree]\n" * 1000
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        cli.main([*args[:2], "--max-decompressed-size", "1000", path])
+
+    assert pytest_wrapped_e.value.code == 1
+    assert "decompressed size is too big" in capsys.readouterr().out
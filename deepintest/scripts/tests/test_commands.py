@@ -0,0 +1,84 @@
+"""
+Testing module for the deepingtest.scripts.commands module.
+"""
+
+import gzip
+from os.path import dirname, join
+from shutil import copy
+
+import pytest
+
+from .. import cli, commands
+
+# the click commands take their parameters from the list of arguments
+# pylint: disable=no-value-for-parameter,too-many-function-args
+
+
+def _run(args):
+    """Runs the command line interface and returns its exit status."""
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        commands.main(args)
+    return pytest_wrapped_e.value.code
+
+
+def test_index_search_matches_terms_option(capsys, tmp_path):
+    """
+    Tests if searching through the index prints the same output as the
+    --terms option of the solution script.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    path = str(tmp_path / "example1.txt")
+    copy(join(root_dir, "example1.txt"), path)
+    terms_path = tmp_path / "terms.txt"
+    terms = ["dog", "a", "the", "hill", "zzz"]
+    terms_path.write_text("\n".join(terms), encoding="utf-8")
+
+    assert _run(["index", "build", path]) == 0
+    assert "indexed" in capsys.readouterr().out
+
+    assert _run(["index", "search", path, *terms]) == 0
+    output = capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        cli.main(["--terms", str(terms_path), path])
+    assert output == capsys.readouterr().out
+
+
+def test_index_search_fails_without_valid_index(capsys, tmp_path):
+    """
+    Tests if searching prints an error when the index doesn't exist or when
+    the file changed since the index was built.
+    """
+    path = tmp_path / "file.txt"
+    path.write_text("the lazy dog\nthe\n", encoding="utf-8")
+
+    assert _run(["index", "search", str(path), "lazy"]) == 1
+    assert "doesn't exist" in capsys.readouterr().out
+
+    assert _run(["index", "build", str(path)]) == 0
+    path.write_text("the lazy dog\nthe lazy cat\n", encoding="utf-8")
+    capsys.readouterr()
+
+    assert _run(["index", "search", str(path), "lazy"]) == 1
+    assert "changed since its index was built" in capsys.readouterr().out
+
+    assert _run(["index", "search", str(path), "a b"]) == 1
+    assert capsys.readouterr().out == (
+        "Error: search term should be a word (string without spaces)\n"
+    )
+
+
+def test_build_fails_when_file_is_compressed(capsys, tmp_path):
+    """
+    Tests if building the index or the block filters of a compressed file
+    prints an error, they hold the offsets of the file.
+    """
+    path = str(tmp_path / "file.txt.gz")
+    with open(path, "wb") as file_obj:
+        file_obj.write(gzip.compress(b"the lazy dog\nthe\n"))
+
+    for command in [["index", "build"], ["bloom", "build"]]:
+        assert _run([*command, path]) == 1
+        assert capsys.readouterr().out == (
+            f"Error: {path} is compressed with gzip, decompress it first\n"
+        )
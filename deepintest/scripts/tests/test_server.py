@@ -0,0 +1,227 @@
+"""
+Testing module for the search server.
+"""
+
+import asyncio
+import gzip
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os.path import dirname, exists, join
+
+import pytest
+
+from ..server import SearchClient, SearchServer
+from ..solution import solution
+
+EXAMPLES_DIR = join(dirname(__file__), "examples")
+
+
+def _read_file(path):
+    """Returns the content of a file as a str."""
+    with open(path, encoding="utf-8") as file_obj:
+        return file_obj.read()
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path(tmp_path):
+    """
+    Runs a SearchServer in a thread during the test and returns the path of
+    its socket.
+    """
+    socket_path = str(tmp_path / "socket")
+    server = SearchServer(socket_path, max_files=2)
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.serve())
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run)
+    thread.start()
+
+    # the socket file exists before the server listens
+    while True:
+        assert thread.is_alive()
+        try:
+            SearchClient(socket_path).close()
+            break
+        except OSError:
+            time.sleep(0.001)
+
+    yield socket_path
+
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join()
+    loop.close()
+    assert not exists(socket_path)
+
+
+def test_constructor_fails_when_parameter_not_positive_int(tmp_path):
+    """
+    Tests if SearchServer's constructor returns a `ValueError` when max_files
+    or history is not a positive int.
+    """
+    for elem in [0, -1, "a", 1.5]:
+        with pytest.raises(ValueError):
+            SearchServer(str(tmp_path / "socket"), max_files=elem)
+        with pytest.raises(ValueError):
+            SearchServer(str(tmp_path / "socket"), history=elem)
+
+
+def test_server_returns_same_output_as_solution(capsys, socket_path, tmp_path):
+    """
+    Tests if the server answers with the same output and exit status as the
+    solution script, for the examples and for files with errors.
+    """
+    paths = [join(EXAMPLES_DIR, f"example{i}.txt") for i in range(1, 6)]
+    contents = [b"", b"a\n", b"a\nb c\n", "é a\né\n".encode("latin-1")]
+    for i, content in enumerate(contents):
+        paths.append(str(tmp_path / f"file{i}"))
+        with open(paths[-1], "wb") as file_obj:
+            file_obj.write(content)
+    paths.extend([str(tmp_path / "missing"), str(tmp_path)])
+
+    with SearchClient(socket_path) as client:
+        # twice, so the files are searched cold then warm
+        for path in paths * 2:
+            code = 0
+            try:
+                solution(path)
+            except SystemExit as error:
+                code = error.code
+            assert client.search(path) == (code, capsys.readouterr().out)
+
+
+def test_server_searches_all_lines_for_term(socket_path, tmp_path):
+    """
+    Tests if the server searches all the lines when the search term is
+    provided.
+    """
+    path = str(tmp_path / "file")
+    with open(path, "w", encoding="utf-8") as file_obj:
+        file_obj.write("a-b\nc\nab\n")
+
+    with SearchClient(socket_path) as client:
+        assert client.search(path, "a") == (0, "[a b]\n[ab]\n")
+        assert client.search(path, "c") == (0, "[c]\n")
+        for term in ["", "a b"]:
+            assert client.search(path, term) == (
+                1,
+                "Error: search term should be a word (string without spaces)\n",
+            )
+
+
+def test_server_maps_changed_files_again(socket_path, tmp_path):
+    """
+    Tests if the server searches the new content of a file after the file is
+    replaced, and after the file was evicted.
+    """
+    path = str(tmp_path / "file")
+
+    with SearchClient(socket_path) as client:
+        for i, content in enumerate(["a\nb a\na\n", "a b\nc\nb\n", "d\nd\n"]):
+            with open(path + ".new", "w", encoding="utf-8") as file_obj:
+                file_obj.write(content)
+            os.replace(path + ".new", path)
+            for other in range(3):
+                client.search(join(EXAMPLES_DIR, f"example{other + 1}.txt"))
+            assert client.search(path) == (0, ["[a]\n[b a]\n", "[a b]\n", "[d]\n"][i])
+
+
+def test_server_closes_evicted_files(tmp_path):
+    """
+    Tests if the server closes the mappings of the evicted files, and of the
+    files mapped again after a change.
+    """
+    server = SearchServer(str(tmp_path / "socket"), max_files=1)
+    path = join(EXAMPLES_DIR, "example1.txt")
+    expected = (0, _read_file(join(EXAMPLES_DIR, "result1.txt")))
+
+    assert server.search(path) == expected
+    warm_file = server._files[path]  # pylint: disable=protected-access
+    assert server.search(join(EXAMPLES_DIR, "example2.txt"))[0] == 0
+    assert warm_file.data.closed
+
+    path = str(tmp_path / "file")
+    for content in ["a\nb a\na\n", "a b\nc\nb\n"]:
+        with open(path + ".new", "w", encoding="utf-8") as file_obj:
+            file_obj.write(content)
+        os.replace(path + ".new", path)
+        assert server.search(path)[0] == 0
+        assert warm_file.data.closed
+        warm_file = server._files[path]  # pylint: disable=protected-access
+        assert not warm_file.data.closed
+
+
+def test_server_answers_concurrent_clients(socket_path):
+    """
+    Tests if the server answers many clients at the same time and reports the
+    latencies.
+    """
+
+    def search(i):
+        with SearchClient(socket_path) as client:
+            return client.search(join(EXAMPLES_DIR, f"example{i}.txt"))
+
+    indices = list(range(1, 6)) * 10
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(search, indices))
+
+    for i, (code, output) in zip(indices, results):
+        assert code == 0
+        assert output == _read_file(join(EXAMPLES_DIR, f"result{i}.txt"))
+
+    with SearchClient(socket_path) as client:
+        stats = client.get_stats()
+    assert stats["count"] == len(indices)
+    assert 0 < stats["p50"] <= stats["p99"]
+
+
+def test_server_answers_invalid_requests(socket_path):
+    """
+    Tests if the server answers the invalid requests with an error and keeps
+    the connection open.
+    """
+    with SearchClient(socket_path) as client:
+        # pylint: disable=protected-access
+        for request in [[], {"path": 1}, {"path": "a", "term": 1}]:
+            assert client._send(request)["status"] == 2
+        client._file.write(b"{\n")
+        client._file.flush()
+        assert b'"status": 2' in client._file.readline()
+        assert client.search(join(EXAMPLES_DIR, "example1.txt"))[0] == 0
+
+
+def test_server_searches_compressed_files(capsys, socket_path, tmp_path):
+    """
+    Tests if the server answers with the same output and exit status as the
+    solution script for compressed files, which it can't memory-map.
+    """
+    paths = []
+    contents = [_read_file(join(EXAMPLES_DIR, f"example{i}.txt")) for i in (1, 2)]
+    for i, content in enumerate([*map(str.encode, contents), b"a\nb c\n"]):
+        paths.append(str(tmp_path / f"file{i}.gz"))
+        with open(paths[-1], "wb") as file_obj:
+            file_obj.write(gzip.compress(content))
+    paths.append(str(tmp_path / "truncated.gz"))
+    with open(paths[-1], "wb") as file_obj:
+        file_obj.write(gzip.compress(b"a tree\ntree\n")[:-10])
+
+    with SearchClient(socket_path) as client:
+        for path in paths:
+            code = 0
+            try:
+                solution(path)
+            except SystemExit as error:
+                code = error.code
+            assert client.search(path) == (code, capsys.readouterr().out)
+
+        assert client.search(paths[0], "a") == (
+            0,
+            "".join(f"[{line}]\n" for line in contents[0].splitlines() if "a" in line),
+        )
@@ -2,11 +2,46 @@
 Testing module for the solution script.
 """
 
+import bz2
+import gzip
+import lzma
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
 from os.path import dirname, join
+from shutil import copy
 
 import pytest
 
-from .. solution import solution
+from deepintest._conf import solution_characters
+from deepintest.io.formatter import Formatter
+from deepintest.io.reader import TextFileReader
+from deepintest.metrics import Metrics
+from deepintest.search.cleaner import Cleaner
+from deepintest.search.results import ResultCache
+from .. import cli, commands
+from ..solution import (
+    SearchOptions,
+    main,
+    solution,
+    solution_batch,
+    solution_follow,
+    solution_stream,
+    solution_with_terms,
+)
+
+# the click commands take their parameters from the list of arguments
+# pylint: disable=no-value-for-parameter,too-many-function-args
+
+
+# sizes in MB of the files searched in streaming mode to compare the peak RSS,
+# for example "100,1000,5000" to check that it stays flat up to 5 GB
+RSS_SIZES = list(map(int, os.environ.get("DEEPINTEST_RSS_SIZES", "4,40").split(",")))
+
+# budget of the time to import the solution script in milliseconds, loose so a
+# busy machine doesn't fail it, for example "30" to check the deferred imports
+IMPORT_BUDGET = float(os.environ.get("DEEPINTEST_IMPORT_BUDGET", "100"))
 
 
 def _read_file(path):
@@ -15,6 +50,48 @@ def _read_file(path):
         return file_obj.read()
 
 
+def _run_commands(args):
+    """Runs the deepintest script and returns its exit status."""
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        commands.main(args)
+    return pytest_wrapped_e.value.code
+
+
+def _imported_modules(*args):
+    """
+    Runs python with the given arguments and returns the `set` of the names of
+    the modules in `sys.modules` when the interpreter exits.
+    """
+    code = "import atexit, sys; atexit.register(lambda: print(*sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", f"{code}; {args[0]}", *args[1:]],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(process.stdout.splitlines()[-1].split())
+
+
+def _import_time(module):
+    """
+    Runs python with `-X importtime` to import a module and returns its
+    cumulative import time in milliseconds.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    for line in process.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+
+    raise AssertionError(f"{module} was not imported")
+
+
 def test_read_fails_when_path_not_exist(capsys, tmp_path):
     """
     Tests if solution returns exit code 1 the expected output when the file
@@ -83,7 +160,7 @@ def test_read_fails_when_file_size_too_large(capsys, tmp_path):
             file_obj.write(b"\x00")
 
     with pytest.raises(SystemExit) as pytest_wrapped_e:
-        solution(path, size-1)
+        solution(path, SearchOptions(max_size=size - 1))
 
     assert pytest_wrapped_e.type == SystemExit
     assert pytest_wrapped_e.value.code == 1
@@ -91,17 +168,15 @@ def test_read_fails_when_file_size_too_large(capsys, tmp_path):
     out_lines = [
         f"Error: {path} size is too big",
         "Please consider using the --max-size option",
-        "Run `solution --help` for more information"
+        "Run `solution --help` for more information",
     ]
     captured = capsys.readouterr()
     assert captured.out == "\n".join(out_lines) + "\n"
 
 
 def test_read_fails_when_file_has_unsupported_encoding(
-        capsys,
-        tmp_path,
-        unsupported_encoding
-    ):
+    capsys, tmp_path, unsupported_encoding
+):
     """
     Tests if solution returns exit code 1 the expected output when it was given
     path pointing to a file whose encoding is not supported.
@@ -139,7 +214,10 @@ def test_read_fails_when_file_is_empty(capsys, tmp_path, default_encoding):
     assert pytest_wrapped_e.value.code == 1
 
     captured = capsys.readouterr()
-    assert captured.out == f"Error: {path} is empty or has only empty lines or lines with spaces\n"
+    assert (
+        captured.out
+        == f"Error: {path} is empty or has only empty lines or lines with spaces\n"
+    )
 
 
 def test_read_fails_when_file_is_empty_lines(capsys, tmp_path, default_encoding):
@@ -159,7 +237,10 @@ def test_read_fails_when_file_is_empty_lines(capsys, tmp_path, default_encoding)
     assert pytest_wrapped_e.value.code == 1
 
     captured = capsys.readouterr()
-    assert captured.out == f"Error: {path} is empty or has only empty lines or lines with spaces\n"
+    assert (
+        captured.out
+        == f"Error: {path} is empty or has only empty lines or lines with spaces\n"
+    )
 
 
 def test_read_fails_when_file_not_enough_lines(capsys, tmp_path, default_encoding):
@@ -179,7 +260,10 @@ def test_read_fails_when_file_not_enough_lines(capsys, tmp_path, default_encodin
     assert pytest_wrapped_e.value.code == 1
 
     captured = capsys.readouterr()
-    assert captured.out == "Error: file must contain at least two lines (a line and a term)\n"
+    assert (
+        captured.out
+        == "Error: file must contain at least two lines (a line and a term)\n"
+    )
 
 
 def test_read_fails_when_search_term_not_a_word(capsys, tmp_path, default_encoding):
@@ -199,7 +283,9 @@ def test_read_fails_when_search_term_not_a_word(capsys, tmp_path, default_encodi
     assert pytest_wrapped_e.value.code == 1
 
     captured = capsys.readouterr()
-    assert captured.out == "Error: search term should be a word (string without spaces)\n"
+    assert (
+        captured.out == "Error: search term should be a word (string without spaces)\n"
+    )
 
 
 def test_solution(capsys):
@@ -210,9 +296,595 @@ def test_solution(capsys):
         ("example2.txt", "result2.txt"),
         ("example3.txt", "result3.txt"),
         ("example4.txt", "result4.txt"),
-        ("example5.txt", "result5.txt")
+        ("example5.txt", "result5.txt"),
     ]
     for example, result in tests:
         solution(join(root_dir, example))
         captured = capsys.readouterr()
         assert captured.out == _read_file(join(root_dir, result))
+
+
+def test_solution_with_mmap_engine(capsys):
+    """Tests if solution returns the expected result with the mmap engine."""
+    root_dir = join(dirname(__file__), "examples")
+    for i in range(1, 6):
+        solution(join(root_dir, f"example{i}.txt"), SearchOptions(engine="mmap"))
+        captured = capsys.readouterr()
+        assert captured.out == _read_file(join(root_dir, f"result{i}.txt"))
+
+
+def test_solution_with_numpy_cleaner(capsys):
+    """
+    Tests if solution returns the expected result with the numpy cleaner, and
+    if the option is a usage error without NumPy.
+    """
+    root_dir = join(dirname(__file__), "examples")
+
+    if find_spec("numpy") is None:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            cli.main(["--cleaner", "numpy", join(root_dir, "example1.txt")])
+        assert pytest_wrapped_e.value.code == 2
+        pytest.skip("NumPy is not installed")
+
+    for i in range(1, 6):
+        options = SearchOptions(cleaner_engine="numpy")
+        solution(join(root_dir, f"example{i}.txt"), options)
+        captured = capsys.readouterr()
+        assert captured.out == _read_file(join(root_dir, f"result{i}.txt"))
+
+
+def test_solution_with_jobs(capsys):
+    """
+    Tests if solution returns the expected result with several processes.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    for engine in ["stream", "mmap"]:
+        for i in range(1, 6):
+            options = SearchOptions(engine=engine, jobs=2)
+            solution(join(root_dir, f"example{i}.txt"), options)
+            captured = capsys.readouterr()
+            assert captured.out == _read_file(join(root_dir, f"result{i}.txt"))
+
+
+def test_solution_with_terms(capsys, tmp_path, default_encoding):
+    """
+    Tests if solution_with_terms prints, for each term, the same lines as
+    solution.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    path = join(root_dir, "example3.txt")
+    terms_path = tmp_path / "terms"
+
+    with open(terms_path, "w", encoding=default_encoding) as file_obj:
+        file_obj.writelines(["ét\n", "\n", "zz\n", "ét\n"])
+
+    solution_with_terms(path, terms_path)
+    captured = capsys.readouterr()
+
+    # the search term of example3.txt is its last line
+    result = _read_file(join(root_dir, "result3.txt"))
+    assert captured.out == "ét:\n" + result + "[ét]\nzz:\n"
+
+
+def test_solution_with_terms_fails_when_terms_file_is_empty(
+    capsys, tmp_path, default_encoding
+):
+    """
+    Tests if solution_with_terms returns exit code 1 the expected output when
+    the terms file has only empty lines.
+    """
+    path = join(dirname(__file__), "examples", "example1.txt")
+    terms_path = tmp_path / "terms"
+
+    with open(terms_path, "w", encoding=default_encoding) as file_obj:
+        file_obj.writelines(["\n", "  \n"])
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        solution_with_terms(path, terms_path)
+
+    assert pytest_wrapped_e.value.code == 1
+
+    captured = capsys.readouterr()
+    assert (
+        captured.out
+        == f"Error: {terms_path} is empty or has only empty lines or lines with spaces\n"
+    )
+
+
+def test_solution_with_terms_fails_when_search_term_not_a_word(
+    capsys, tmp_path, default_encoding
+):
+    """
+    Tests if solution_with_terms returns exit code 1 the expected output when
+    one of the terms is not a word.
+    """
+    path = join(dirname(__file__), "examples", "example1.txt")
+    terms_path = tmp_path / "terms"
+
+    with open(terms_path, "w", encoding=default_encoding) as file_obj:
+        file_obj.writelines(["ee\n", "word1 word2\n"])
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        solution_with_terms(path, terms_path)
+
+    assert pytest_wrapped_e.value.code == 1
+
+    captured = capsys.readouterr()
+    assert (
+        captured.out == "Error: search term should be a word (string without spaces)\n"
+    )
+
+
+def test_solution_batch(capsys, tmp_path, default_encoding):
+    """
+    Tests if solution_batch prints the output of each file of a directory after
+    a header, and exits with code 1 when one of the files can't be searched.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    for i in [1, 2]:
+        copy(join(root_dir, f"example{i}.txt"), tmp_path)
+    (tmp_path / "sub").mkdir()
+    with open(tmp_path / "sub" / "empty.txt", "w", encoding=default_encoding):
+        pass
+
+    expected = (
+        f"==> {tmp_path / 'example1.txt'} <==\n"
+        + _read_file(join(root_dir, "result1.txt"))
+        + f"==> {tmp_path / 'example2.txt'} <==\n"
+        + _read_file(join(root_dir, "result2.txt"))
+        + f"==> {tmp_path / 'sub' / 'empty.txt'} <==\n"
+        + f"Error: {tmp_path / 'sub' / 'empty.txt'} is empty or has only empty "
+        + "lines or lines with spaces\n"
+    )
+
+    for jobs in [1, 2]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            solution_batch([str(tmp_path)], SearchOptions(jobs=jobs))
+
+        assert pytest_wrapped_e.value.code == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == expected
+
+
+def test_solution_batch_with_status(capsys):
+    """
+    Tests if solution_batch prints the exit status of each file, and doesn't
+    exit when all the files were searched.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    paths = [join(root_dir, "example5.txt"), join(root_dir, "example1.txt")]
+
+    solution_batch(paths, SearchOptions(status=True))
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        f"==> {paths[0]} <==\n"
+        f"==> {paths[0]}: exit status 0 <==\n"
+        f"==> {paths[1]} <==\n"
+        + _read_file(join(root_dir, "result1.txt"))
+        + f"==> {paths[1]}: exit status 0 <==\n"
+    )
+
+
+def test_main(capsys):
+    """
+    Tests if main searches a single file without click, and parses the other
+    arguments with click.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    path = join(root_dir, "example1.txt")
+
+    main([path])
+    captured = capsys.readouterr()
+    assert captured.out == _read_file(join(root_dir, "result1.txt"))
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        main(["--engine", "mmap", path])
+
+    assert pytest_wrapped_e.value.code == 0
+
+    captured = capsys.readouterr()
+    assert captured.out == _read_file(join(root_dir, "result1.txt"))
+
+
+def test_solution_start_up_imports_few_modules(tmp_path):
+    """
+    Tests if importing the solution script, or searching a small file with it,
+    doesn't import the modules that are slow to import (compared to the modules
+    imported at the interpreter start-up, site may import pathlib).
+    """
+    path = tmp_path / "file"
+    with open(path, "w", encoding="utf-8") as file_obj:
+        file_obj.write("a b\nb\n")
+
+    start_up = _imported_modules("pass")
+    for args in [
+        ["import deepintest.scripts.solution"],
+        ["from deepintest.scripts.solution import main; main()", str(path)],
+    ]:
+        modules = _imported_modules(*args) - start_up
+        assert "deepintest.scripts.solution" in modules
+        for module in ["click", "concurrent.futures", "pathlib", "asyncio"]:
+            assert module not in modules
+
+
+def test_solution_import_stays_under_budget():
+    """
+    Tests if importing the solution script takes less than the import budget
+    (the best of three runs, the first one may fill the caches).
+    """
+    milliseconds = min(_import_time("deepintest.scripts.solution") for _ in range(3))
+    assert milliseconds < IMPORT_BUDGET
+
+
+def test_solution_records_metrics(capsys):
+    """
+    Tests if solution records the same lines and matches into the metrics
+    whatever the engine and the number of processes, without changing the
+    output.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    path = join(root_dir, "example1.txt")
+    expected = _read_file(join(root_dir, "result1.txt"))
+    _, offset = TextFileReader().read_last_line(path)
+
+    for engine, jobs in [("stream", 1), ("stream", 2), ("mmap", 1), ("mmap", 2)]:
+        metrics = Metrics()
+        solution(path, SearchOptions(engine=engine, jobs=jobs), metrics)
+        captured = capsys.readouterr()
+        assert captured.out == expected
+
+        result = metrics.as_dict()
+        matches = len(expected.splitlines())
+        assert result["counters"] == {"files": 1, "matches": matches}
+        assert result["stages"]["clean"]["lines"] == matches
+        assert result["stages"]["format"]["lines"] == matches
+        assert result["stages"]["format"]["bytes"] == len(expected.encode("utf-8"))
+        # the bytes searched are those before the search term
+        first_stages = ["read", "match"] if engine == "stream" else ["scan"]
+        for stage in first_stages:
+            assert result["stages"][stage]["bytes"] == offset
+
+
+def test_solution_uses_result_cache(capsys, tmp_path):
+    """
+    Tests if solution reads the clean lines of an unchanged file from the
+    result cache, with the same output, and searches a changed file again.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    cache = ResultCache(str(tmp_path / "cache"))
+
+    for i in range(1, 6):
+        path = str(tmp_path / f"example{i}.txt")
+        copy(join(root_dir, f"example{i}.txt"), path)
+        expected = _read_file(join(root_dir, f"result{i}.txt"))
+
+        for counter in ["cache_misses", "cache_hits", "cache_hits"]:
+            metrics = Metrics()
+            solution(path, metrics=metrics, cache=cache)
+            captured = capsys.readouterr()
+            assert captured.out == expected
+
+            result = metrics.as_dict()
+            assert result["counters"][counter] == 1
+            assert ("read" in result["stages"]) == (counter == "cache_misses")
+
+    # the search term changes so the new line is matched
+    with open(path, "a", encoding="utf-8") as file_obj:
+        file_obj.write("a new line\nnew\n")
+
+    metrics = Metrics()
+    solution(path, metrics=metrics, cache=cache)
+    captured = capsys.readouterr()
+    assert captured.out == "[a new line]\n"
+    assert metrics.as_dict()["counters"]["cache_misses"] == 1
+
+
+def test_solution_skips_blocks(capsys, tmp_path):
+    """
+    Tests if solution gives the same output when skipping the blocks which
+    can't contain the search term, prints the number of blocks skipped, and
+    searches the whole file without valid block filters.
+    """
+    path = str(tmp_path / "example.txt")
+
+    with open(path, "w", encoding="utf-8") as file_obj:
+        file_obj.write("the lazy dog\n" * 200 + "mary likes trees!\ntrees\n")
+
+    expected = "[mary likes trees]\n"
+
+    solution(path, SearchOptions(skip_blocks=True))
+    captured = capsys.readouterr()
+    assert captured.out == expected
+    assert "can't be used" in captured.err
+
+    for jobs in [1, 2]:
+        assert _run_commands(["bloom", "build", "--block-size", "100", path]) == 0
+        capsys.readouterr()
+
+        metrics = Metrics()
+        solution(path, SearchOptions(jobs=jobs, skip_blocks=True), metrics)
+        captured = capsys.readouterr()
+        assert captured.out == expected
+
+        counters = metrics.as_dict()["counters"]
+        assert counters["blocks_skipped"] > 0
+        assert captured.err == (
+            f"{path}: {counters['blocks_skipped']} of {counters['blocks']} "
+            "blocks skipped\n"
+        )
+
+    # the sidecar headers missing keys or with invalid blocks aren't used
+    with open(f"{path}.bloom", "rb") as file_obj:
+        magic = file_obj.readline()
+
+    for header in [b"{}", b'{"size": 1, "mtime_ns": 1, "encoding": "utf-8"}']:
+        with open(f"{path}.bloom", "wb") as file_obj:
+            file_obj.write(magic + header + b"\n")
+        solution(path, SearchOptions(skip_blocks=True))
+        captured = capsys.readouterr()
+        assert captured.out == expected
+        assert "is not a block filter" in captured.err
+
+
+def test_solution_follow(capsys, tmp_path):
+    """
+    Tests if solution_follow prints the clean lines matching the term as they
+    are appended, and resumes from its checkpoint.
+    """
+    path = tmp_path / "app.log"
+    checkpoint = str(tmp_path / "checkpoint.json")
+    path.write_text("cat sees me\nup the hill\nmary likes ", encoding="utf-8")
+
+    options = SearchOptions(interval=0, checkpoint_path=checkpoint)
+    solution_follow(str(path), "ee", options, polls=2)
+    assert capsys.readouterr().out == "[cat sees me]\n"
+
+    with open(path, "a", encoding="utf-8") as file_obj:
+        file_obj.write("trees!\nnothing\nfree\n")
+
+    metrics = Metrics()
+    solution_follow(str(path), "ee", options, polls=1, metrics=metrics)
+    assert capsys.readouterr().out == "[mary likes trees]\n[free]\n"
+    assert metrics.as_dict()["counters"] == {"polls": 1, "matches": 2}
+
+
+def test_solution_follow_fails(capsys, tmp_path):
+    """
+    Tests if solution_follow exits with an error message if the term is not a
+    word, the checkpoint is not valid or can't be read, or the file can't be
+    read.
+    """
+    path = tmp_path / "app.log"
+    path.write_bytes(b"\xff\xfe\n")
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text("{}", encoding="utf-8")
+
+    for term, checkpoint_path in [
+        ("a b", None),
+        ("ee", str(checkpoint)),
+        ("ee", None),
+    ]:
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            options = SearchOptions(checkpoint_path=checkpoint_path)
+            solution_follow(str(path), term, options, polls=1)
+
+        assert pytest_wrapped_e.value.code == 1
+        assert capsys.readouterr().out.startswith("Error: ")
+
+    # a checkpoint which can't be read is not reported as not valid
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        options = SearchOptions(checkpoint_path=str(tmp_path))
+        solution_follow(str(path), "ee", options, polls=1)
+
+    assert pytest_wrapped_e.value.code == 1
+    assert capsys.readouterr().out == f"Error: {tmp_path} exists but can't be opened\n"
+
+
+def test_solution_searches_ascii_blocks_as_bytes(capsys, tmp_path):
+    """
+    Tests if solution gives the same output, lines and matches when the ASCII
+    blocks of a file are searched without being decoded as when all the lines
+    are decoded, with all the line endings and unsupported characters.
+    """
+    path = tmp_path / "mixed.txt"
+    ascii_lines = ["the tree\t", "no match", "a *tree* ", "tree+-tree\x1c", "trees"]
+    unicode_lines = ["été tree", "le tree du manège"]
+    lines = ascii_lines * 20000 + unicode_lines * 10 + ascii_lines * 10
+    endings = ["\n", "\r\n", "\r"]
+    text = "".join(line + endings[i % 3] for i, line in enumerate(lines))
+    path.write_bytes(f"{text}tree\n".encode("utf-8"))
+
+    formatter = Formatter()
+    cleaner = Cleaner(characters=solution_characters)
+    expected = "".join(
+        formatter.format_line(cleaner.clean_line(line)) + "\n"
+        for line in lines
+        if "tree" in line
+    )
+
+    for engine, jobs in [("stream", 1), ("stream", 3), ("mmap", 1)]:
+        metrics = Metrics()
+        solution(str(path), SearchOptions(engine=engine, jobs=jobs), metrics)
+        assert capsys.readouterr().out == expected
+
+        result = metrics.as_dict()
+        assert result["counters"]["matches"] == len(expected.splitlines())
+        if engine == "stream":
+            assert result["stages"]["read"]["lines"] == len(lines)
+
+
+def test_solution_stream(capsys, tmp_path):
+    """
+    Tests if solution_stream prints the same output as solution, with any
+    memory budget, and isn't limited by the size of the file.
+    """
+    root_dir = join(dirname(__file__), "examples")
+    for i in range(1, 6):
+        solution_stream(join(root_dir, f"example{i}.txt"))
+        captured = capsys.readouterr()
+        assert captured.out == _read_file(join(root_dir, f"result{i}.txt"))
+
+    path = tmp_path / "mixed.txt"
+    lines = ["the tree\t", "no match", "été tree", "a *tree* "] * 20000
+    endings = ["\n", "\r\n", "\r"]
+    text = "".join(line + endings[i % 3] for i, line in enumerate(lines))
+    path.write_bytes(f"{text}tree\n".encode("utf-8"))
+
+    solution(str(path), SearchOptions(max_size=len(text) * 2))
+    expected = capsys.readouterr().out
+
+    for memory_budget in [1 << 16, 1 << 20, 1 << 26]:
+        metrics = Metrics()
+        solution_stream(str(path), SearchOptions(memory_budget=memory_budget), metrics)
+        assert capsys.readouterr().out == expected
+        result = metrics.as_dict()
+        assert result["counters"]["matches"] == 60000
+        assert result["stages"]["read"]["lines"] == len(lines)
+
+
+def test_solution_stream_fails(capsys, tmp_path):
+    """
+    Tests if solution_stream exits with an error message if a line is longer
+    than the memory budget allows, and prints the lines matched in the blocks
+    before a badly encoded line.
+    """
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"a tree\n" + b"x" * 100000 + b"\ntree\n")
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        solution_stream(str(path), SearchOptions(memory_budget=1 << 16))
+
+    assert pytest_wrapped_e.value.code == 1
+    assert capsys.readouterr().out == (
+        f"Error: {path} has a line longer than the memory budget allows\n"
+        "Please consider using a larger --memory-budget option\n"
+        "Run `solution --help` for more information\n"
+    )
+
+    path.write_bytes(b"a tree\n" * 10000 + b"\xff tree\nother\ntree\n")
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        solution_stream(str(path), SearchOptions(memory_budget=1 << 16))
+
+    assert pytest_wrapped_e.value.code == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-1] == f"Error: {path} is not encoded with UTF-8"
+    assert 0 < len(lines) - 1 < 10000
+    assert set(lines[:-1]) == {"[a tree]"}
+
+
+def _write_repeated_lines(path, size):
+    """
+    Writes about `size` bytes of lines to a file, a third of them containing
+    "tree", followed by the search term "tree".
+    """
+    chunk = "".join(
+        f"line {i} of the {'tree' if i % 3 == 0 else 'bush'} été\n"
+        for i in range(30000)
+    ).encode("utf-8")
+
+    with open(path, "wb") as file_obj:
+        for _ in range(max(1, size // len(chunk))):
+            file_obj.write(chunk)
+        file_obj.write(b"tree\n")
+
+
+def test_solution_stream_peak_memory_is_flat(tmp_path):
+    """
+    Tests if the peak RSS of solution_stream stays flat as the file grows (see
+    `RSS_SIZES`), the whole file and its matches being far larger than the
+    memory budget.
+    """
+    # unlike ru_maxrss, the peak RSS of /proc isn't inherited from the parent
+    if not os.path.exists("/proc/self/status"):
+        pytest.skip("the peak RSS is read from /proc")
+
+    memory_budget = 1 << 22
+    code = (
+        "import sys\n"
+        "from deepintest.scripts.solution import SearchOptions, solution_stream\n"
+        "solution_stream(sys.argv[1], SearchOptions(memory_budget=int(sys.argv[2])))\n"
+        "with open('/proc/self/status', encoding='utf-8') as file_obj:\n"
+        "    print(*(line for line in file_obj if 'VmHWM' in line), file=sys.stderr)\n"
+    )
+    peaks = []
+
+    for size in RSS_SIZES:
+        path = tmp_path / "large.txt"
+        _write_repeated_lines(path, size * 1000000)
+        process = subprocess.run(
+            [sys.executable, "-c", code, str(path), str(memory_budget)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True,
+            text=True,
+        )
+        # "VmHWM:   18068 kB"
+        peaks.append(int(process.stderr.split()[1]) * 1024)
+        path.unlink()
+
+    assert max(peaks) - min(peaks) < memory_budget, peaks
+
+
+def test_solution_reads_compressed_files(capsys, tmp_path):
+    """
+    Tests if solution gives the same output for the files compressed with
+    gzip, bz2 or xz as for the decompressed files, with all the engines, and
+    in the batch and streaming modes.
+    """
+    root_dir = join(dirname(__file__), "examples")
+
+    for i in range(1, 6):
+        expected = _read_file(join(root_dir, f"result{i}.txt"))
+        with open(join(root_dir, f"example{i}.txt"), "rb") as file_obj:
+            data = file_obj.read()
+
+        for extension, module in [("gz", gzip), ("bz2", bz2), ("xz", lzma)]:
+            path = str(tmp_path / f"example{i}.txt.{extension}")
+            with open(path, "wb") as file_obj:
+                file_obj.write(module.compress(data))
+
+            for engine, jobs in [("stream", 1), ("stream", 2), ("mmap", 1)]:
+                solution(path, SearchOptions(engine=engine, jobs=jobs))
+                assert capsys.readouterr().out == expected
+
+            solution_stream(path)
+            assert capsys.readouterr().out == expected
+
+            solution_batch([path])
+            assert capsys.readouterr().out == f"==> {path} <==\n{expected}"
+
+
+def test_solution_fails_when_compressed_file_not_valid(capsys, tmp_path):
+    """
+    Tests if solution exits with a dedicated error message when the compressed
+    data is truncated or corrupted, and if following a compressed file fails.
+    """
+    data = b"line with a term\n" * 100 + b"term\n"
+    path = str(tmp_path / "file.gz")
+
+    for content in [gzip.compress(data)[:40], b"\x1f\x8b" + b"\x00" * 40]:
+        with open(path, "wb") as file_obj:
+            file_obj.write(content)
+
+        for search in [solution, solution_stream]:
+            with pytest.raises(SystemExit) as pytest_wrapped_e:
+                search(path)
+
+            assert pytest_wrapped_e.value.code == 1
+            assert (
+                capsys.readouterr().out
+                == f"Error: {path} is compressed but corrupted or truncated\n"
+            )
+
+    with open(path, "wb") as file_obj:
+        file_obj.write(gzip.compress(data))
+
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        solution_follow(path, "term", polls=1)
+
+    assert pytest_wrapped_e.value.code == 1
+    captured = capsys.readouterr()
+    assert captured.out == f"Error: {path} is compressed, decompress it first\n"
@@ -0,0 +1,305 @@
+"""
+Module to skip the blocks of a file that can't contain a term.
+"""
+
+import json
+from functools import lru_cache
+from math import ceil, log
+from os import replace, stat
+from typing import Dict, List, Optional, Tuple
+
+from deepintest._utils import _is_unchanged, _read_sidecar_header
+from deepintest.io.reader import CompressedFileError, TextFileReader
+
+# first line of the sidecar files, changed when their format changes
+_MAGIC = b"deepintest block filter 1\n"
+
+# the length of the n-grams stored in the filters
+NGRAM_SIZE = 3
+
+# the keys of the header of the sidecar files
+_HEADER_KEYS = {"size", "mtime_ns", "encoding", "blocks"}
+
+
+@lru_cache(maxsize=1 << 16)
+def _get_word_ngrams(word: bytes) -> frozenset:
+    """Returns the n-grams of a word, the words of a text are often repeated."""
+    return frozenset(
+        word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)
+    )
+
+
+def _get_positions(ngram: bytes, bits: int, hashes: int) -> List[int]:
+    """\
+    Returns the positions of the bits of an n-gram in a filter of `bits` bits
+    with `hashes` hash functions (double hashing of the n-gram value, which is
+    the same in all the processes unlike `hash`).
+    """
+    value = int.from_bytes(ngram, "big")
+    first = (value * 2654435761) & 0xFFFFFFFF
+    second = ((value * 2246822519) & 0xFFFFFFFF) | 1
+    return [(first + i * second) % bits for i in range(hashes)]
+
+
+def _is_blocks(blocks) -> bool:
+    """\
+    Returns `True` if the blocks of a sidecar header are a `list` of the start,
+    the end, the bits, the hash functions and the position of each filter.
+    """
+    return isinstance(blocks, list) and all(
+        isinstance(block, list)
+        and len(block) == 5
+        and all(isinstance(value, int) for value in block)
+        for block in blocks
+    )
+
+
+class BlockFilter:
+    """\
+    Class to skip the blocks of a file that can't contain a term.
+
+    The file is split into blocks of about `block_size` bytes, aligned on the
+    line boundaries (see `TextFileReader.split`), and the byte n-grams of the
+    words (separated by spaces) of each block are stored in a small Bloom
+    filter. The filters are built once with `build` and written to a sidecar
+    file next to the file.
+
+    A block whose filter doesn't have all the n-grams of a search term
+    (encoded like the file) can't contain the term, so only the other blocks
+    need to be read and searched. A Bloom filter has false positives but no
+    false negatives, so the results are the same as a search of the whole
+    file. The search terms shorter than `NGRAM_SIZE` bytes can't skip a block.
+
+    The whole file is validated when the filters are built, and the sidecar
+    holds the size and the modification time of the file, so skipping blocks
+    doesn't skip the checks of `TextFileReader` as long as the file doesn't
+    change. The sidecar of a file that changed is not used.
+    """
+
+    _path: str
+    _filter_path: str
+    _reader: TextFileReader
+    _block_size: int
+    _error_rate: float
+    _header: Optional[Dict]
+
+    def __init__(
+        self,
+        path: str,
+        filter_path: str = None,
+        reader: TextFileReader = None,
+        block_size: int = 1 << 20,
+        error_rate: float = 0.01,
+    ) -> None:
+        """\
+        Constructor of the BlockFilter class, the filters are not read or built.
+
+        The constructor raises a `ValueError` if `block_size` is not a positive
+        `int` or if `error_rate` is not between 0 and 1 (excluded).
+
+        Parameters
+        ----------
+        path
+            The path of the file.
+        filter_path
+            The path of the sidecar file, `path` followed by ".bloom" if not
+            provided.
+        reader
+            The `TextFileReader` used to check the file, to split it and to get
+            its encoding. A default `TextFileReader` is used if not provided.
+        block_size
+            The size of the blocks in bytes, used by `build`.
+        error_rate
+            The rate of false positives of each filter, used by `build`.
+        """
+        if not isinstance(block_size, int) or block_size < 1:
+            raise ValueError(f"block size {block_size} is not a positive int.")
+
+        if not isinstance(error_rate, float) or not 0 < error_rate < 1:
+            raise ValueError(f"error rate {error_rate} is not between 0 and 1.")
+
+        self._path = path
+        self._filter_path = f"{path}.bloom" if filter_path is None else filter_path
+        self._reader = reader if reader is not None else TextFileReader()
+        self._block_size = block_size
+        self._error_rate = error_rate
+        self._header = None
+
+    @property
+    def path(self) -> str:
+        """Getter for _path."""
+        return self._path
+
+    @property
+    def filter_path(self) -> str:
+        """Getter for _filter_path."""
+        return self._filter_path
+
+    def build(self) -> int:
+        """\
+        Builds the filters of the blocks of the file and writes them to the
+        sidecar file.
+
+        The method returns the number of blocks.
+
+        The method raises the same errors as `TextFileReader.read`, and a
+        `CompressedFileError` (a `ValueError`) if the file is compressed (its
+        blocks are read at their offsets in the file).
+        """
+        if self._reader.get_compression(self._path) is not None:
+            raise CompressedFileError(
+                f"{self._path} is compressed, it can't be filtered."
+            )
+        status = stat(self._path)
+        parts = max(1, ceil(status.st_size / self._block_size))
+        blocks = []
+        filters = []
+        position = 0
+
+        with open(self._path, "rb") as file_obj:
+            for start, end in self._reader.split(self._path, parts):
+                file_obj.seek(start)
+                data = file_obj.read(end - start)
+                self._validate(data)
+                bloom, bits, hashes = self._get_filter(data)
+                blocks.append([start, end, bits, hashes, position])
+                filters.append(bloom)
+                position += len(bloom)
+
+        header = {
+            "size": status.st_size,
+            "mtime_ns": status.st_mtime_ns,
+            "encoding": self._reader.encoding,
+            "blocks": blocks,
+        }
+
+        with open(f"{self._filter_path}.tmp", "wb") as file_obj:
+            file_obj.write(_MAGIC)
+            file_obj.write(json.dumps(header).encode("utf-8"))
+            file_obj.write(b"\n")
+            file_obj.writelines(filters)
+
+        replace(f"{self._filter_path}.tmp", self._filter_path)
+        self._header = None
+
+        return len(blocks)
+
+    def get_ranges(
+        self, search_term: str, end: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, int]], int]:
+        """\
+        Returns the ranges of bytes of the blocks which may contain the search
+        term, and the number of blocks before `end`.
+
+        The ranges are sorted, they hold the offset of their first byte and the
+        offset after their last byte, and they start at the beginning of a
+        line, so they can be read with `TextFileReader.iter_lines`.
+
+        The method raises the same errors as `TextFileReader.check`, an
+        `OSError` if the sidecar file can't be read and a `ValueError` if the
+        sidecar file is not valid or if the file changed since the filters were
+        built.
+
+        Parameters
+        ----------
+        search_term
+            The term to search.
+        end
+            The byte offset where the last range ends. For example, the offset
+            returned by `TextFileReader.read_last_line`.
+        """
+        header = self._read_header()
+        end = header["size"] if end is None else end
+        ranges = []
+        count = 0
+
+        try:
+            encoded_term = search_term.encode(self._reader.encoding)
+        except UnicodeError:
+            # the file can't contain a term that can't be encoded
+            encoded_term = None
+
+        with open(self._filter_path, "rb") as file_obj:
+            for start, block_end, bits, hashes, position in header["blocks"]:
+                if start >= end:
+                    break
+
+                count += 1
+
+                if encoded_term is None:
+                    continue
+
+                file_obj.seek(header["blob"] + position)
+                bloom = file_obj.read((bits + 7) // 8)
+
+                if len(bloom) != (bits + 7) // 8:
+                    raise ValueError(f"{self._filter_path} is truncated.")
+
+                if all(
+                    bloom[bit >> 3] & 1 << (bit & 7)
+                    for i in range(len(encoded_term) - NGRAM_SIZE + 1)
+                    for bit in _get_positions(
+                        encoded_term[i : i + NGRAM_SIZE], bits, hashes
+                    )
+                ):
+                    ranges.append((start, min(block_end, end)))
+
+        return ranges, count
+
+    def _get_filter(self, data: bytes) -> Tuple[bytearray, int, int]:
+        """\
+        Returns the Bloom filter of the n-grams of a block of the file, with its
+        number of bits and of hash functions.
+        """
+        # the search terms don't have spaces or line endings
+        words = data.replace(b"\r", b" ").replace(b"\n", b" ").split(b" ")
+        ngrams = frozenset().union(*map(_get_word_ngrams, set(words)))
+        bits, hashes = self._get_parameters(len(ngrams))
+        bloom = bytearray((bits + 7) // 8)
+
+        for ngram in ngrams:
+            for bit in _get_positions(ngram, bits, hashes):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+
+        return bloom, bits, hashes
+
+    def _get_parameters(self, count: int) -> Tuple[int, int]:
+        """\
+        Returns the number of bits and of hash functions of a Bloom filter
+        holding `count` n-grams with the error rate.
+        """
+        bits = max(8, ceil(-count * log(self._error_rate) / log(2) ** 2))
+        hashes = max(1, round(bits / max(1, count) * log(2)))
+        return bits, hashes
+
+    def _validate(self, data: bytes) -> None:
+        """Checks that a block of the file is properly encoded."""
+        if data.isascii():
+            return
+
+        try:
+            data.decode(self._reader.encoding)
+        except UnicodeError as uni_err:
+            raise UnicodeError(
+                f"{self._path} is not encoded with {self._reader.encoding}."
+            ) from uni_err
+
+    def _read_header(self) -> Dict:
+        """\
+        Reads the header of the sidecar file (once) then checks that the file
+        didn't change since the filters were built.
+        """
+        self._reader.check(self._path)
+
+        if self._header is None:
+            header = _read_sidecar_header(self._filter_path, _MAGIC, _HEADER_KEYS)
+
+            if header is None or not _is_blocks(header["blocks"]):
+                raise ValueError(f"{self._filter_path} is not a block filter.")
+
+            self._header = header
+
+        if not _is_unchanged(self._path, self._header, self._reader.encoding):
+            raise ValueError(f"{self._path} changed since its filters were built.")
+
+        return self._header
@@ -0,0 +1,110 @@
+"""
+Module to share the character sets and the cleaners built for the same
+characters.
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from deepintest._conf import default_characters
+from deepintest._typing import Chars
+
+from .characters import CharacterSet
+from .cleaner import Cleaner
+
+# maximum number of character sets and of cleaners kept
+CACHE_SIZE = 64
+
+_CharacterKey = Tuple[Tuple[int, int], ...]
+
+
+def _denormalize(key: _CharacterKey) -> Chars:
+    """Returns the `characters` parameter of a normalized form."""
+    return [(chr(first), chr(last)) for first, last in key]
+
+
+def _new_character_set(key: _CharacterKey, backend: str) -> CharacterSet:
+    """Builds the character set of a normalized form."""
+    # pylint: disable=protected-access
+    return Cleaner._backends[backend](_denormalize(key))
+
+
+def _new_cleaner(
+    key: _CharacterKey, delimiter: str, engine: str, backend: str
+) -> Cleaner:
+    """Builds the cleaner of a normalized form."""
+    characters = _denormalize(key)
+    return Cleaner(
+        characters=characters, delimiter=delimiter, engine=engine, backend=backend
+    )
+
+
+# the caches are wrapped explicitly, so pylint knows their cache_info and
+# cache_clear methods don't take the parameters of the functions
+_build_character_set = lru_cache(maxsize=CACHE_SIZE)(_new_character_set)
+_build_cleaner = lru_cache(maxsize=CACHE_SIZE)(_new_cleaner)
+
+
+def get_character_set(characters: Chars, backend: str = "set") -> CharacterSet:
+    """\
+    Returns a character set of the characters, built once and shared by all the
+    calls with the same characters (see `CharacterSet.normalize`) and backend.
+
+    The last `CACHE_SIZE` character sets are kept. The function can be called
+    from several threads, and the character set returned should not be
+    modified.
+
+    The function returns a `TypeError` if the `characters` parameter is not
+    valid, and a `ValueError` if the backend is not supported.
+
+    Parameters
+    ----------
+    characters
+        A `list` of characters (`str` of size 1) and/or `tuple` of characters.
+    backend
+        The backend of the character set, see `Cleaner`.
+    """
+    # pylint: disable=protected-access
+    if backend not in Cleaner._backends:
+        raise ValueError(f"{backend} is not a supported backend.")
+
+    return _build_character_set(CharacterSet.normalize(characters), backend)
+
+
+def get_cleaner(
+    characters: Chars = None,
+    delimiter: str = " ",
+    engine: str = "loop",
+    backend: str = "set",
+) -> Cleaner:
+    """\
+    Returns a cleaner, built once and shared by all the calls with the same
+    characters (see `CharacterSet.normalize`), delimiter, engine and backend.
+
+    The last `CACHE_SIZE` cleaners are kept. The function can be called from
+    several threads, and the character set of the cleaner returned should not
+    be modified.
+
+    The function takes the same parameters and raises the same errors as the
+    `Cleaner` constructor.
+    """
+    key = CharacterSet.normalize(characters or default_characters)
+    return _build_cleaner(key, delimiter, engine, backend)
+
+
+def get_cache_info() -> Dict[str, Tuple[int, int, int, int]]:
+    """\
+    Returns the statistics of the caches, a `dict` with the statistics of the
+    "character_sets" and of the "cleaners" as returned by
+    `functools.lru_cache` (hits, misses, maxsize and currsize).
+    """
+    return {
+        "character_sets": _build_character_set.cache_info(),
+        "cleaners": _build_cleaner.cache_info(),
+    }
+
+
+def clear_cache() -> None:
+    """Removes the character sets and the cleaners from the caches."""
+    _build_character_set.cache_clear()
+    _build_cleaner.cache_clear()
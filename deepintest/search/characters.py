@@ -2,19 +2,38 @@
 Module for characters manipulation.
 """
 
-from typing import List, Set, Tuple
+from array import array
+from bisect import bisect_right
+from sys import getsizeof
+from typing import Iterator, List, Set, Tuple
 
 from deepintest._utils import _is_character
 from deepintest._typing import Chars
 
 
+def _get_byte_runs(byte: int) -> List[Tuple[int, int]]:
+    """Returns the runs of set bits of a byte as ranges of bit indices."""
+    runs = []
+    for bit in range(8):
+        if byte & (1 << bit):
+            if runs and runs[-1][1] == bit - 1:
+                runs[-1] = (runs[-1][0], bit)
+            else:
+                runs.append((bit, bit))
+    return runs
+
+
+# runs of set bits of each byte of a bitmap, see BitmapCharacterSet.get_ranges
+_BYTE_RUNS = [_get_byte_runs(byte) for byte in range(256)]
+
+
 class CharacterRange:
     """
     Convenience class used to return a character range in the unicode table.
     """
 
     _character_range: Tuple[str]
-    _characters: List[str]
+    _codes: Tuple[int, int]
 
     def __init__(self, character_range: Tuple[str]) -> None:
         """\
@@ -39,12 +58,12 @@ class CharacterRange:
                 'For example, ("A", "Z"), ("z", "a") or ("é", "ç") '
                 "are valid character ranges. "
             )
-        self._characters = self._create_character_list(self._character_range)
+        self._codes = tuple(sorted(map(ord, self._character_range)))
 
     @property
     def characters(self) -> List[str]:
         """Returns the characters list."""
-        return self._characters
+        return self._create_character_list(self._character_range)
 
     def _is_valid_range(self, character_range) -> bool:
         """Returns `True` if the provided character range is valid."""
@@ -65,8 +84,17 @@ class CharacterRange:
         return list(map(chr, code_range))
 
     def get_characters(self) -> List[int]:
-        """Returns the characters list of the range."""
-        return self._characters
+        """\
+        Returns the characters list of the range.
+
+        The list is created on each call, use `get_codes` to avoid expanding
+        large ranges.
+        """
+        return self._create_character_list(self._character_range)
+
+    def get_codes(self) -> Tuple[int, int]:
+        """Returns the first and the last code points of the range."""
+        return self._codes
 
 
 class CharacterSet:
@@ -101,6 +129,12 @@ class CharacterSet:
     def __contains__(self, character):
         return character in self._characters
 
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._characters)
+
+    def __len__(self) -> int:
+        return len(self._characters)
+
     @property
     def characters(self) -> List[str]:
         """Returns the characters list."""
@@ -110,6 +144,17 @@ class CharacterSet:
         """Returns the set of the supported characters."""
         charset = set()
 
+        for first, last in self._iter_code_ranges(characters):
+            charset.update(map(chr, range(first, last + 1)))
+
+        return charset
+
+    @staticmethod
+    def _iter_code_ranges(characters: Chars) -> Iterator[Tuple[int, int]]:
+        """\
+        Yields the first and the last code points of each element of the
+        `characters` parameter.
+        """
         # We want the characters parameter to be a collection of characters or
         # character range. The method raises a `TypeError` each time there
         # is an issue.
@@ -133,13 +178,13 @@ class CharacterSet:
                 except TypeError as type_err:
                     raise type_err
 
-                charset = charset.union(set(character_range.get_characters()))
+                yield character_range.get_codes()
 
             else:
 
                 # the element is a valid character
                 if _is_character(elem):
-                    charset.add(elem)
+                    yield ord(elem), ord(elem)
 
                 # the element is not character or character range
                 else:
@@ -149,12 +194,64 @@ class CharacterSet:
                         'For example, ("A", "Z"), "é", "à" or ("z", "b") are valid. '
                     )
 
-        return charset
+    @classmethod
+    def normalize(cls, characters: Chars) -> Tuple[Tuple[int, int], ...]:
+        """\
+        Returns a hashable form of a `characters` parameter, the sorted `tuple`
+        of the merged ranges of code points of the characters.
+
+        The parameters with the same characters have the same form, for example
+        `[("A", "C"), "D", "z"]` and `[("D", "A"), "z"]` both give
+        `((65, 68), (122, 122))`. The characters are not expanded.
+
+        The method returns a `TypeError` if the `characters` parameter is not
+        valid.
+
+        Parameters
+        ----------
+        characters
+            A `list` of characters (`str` of size 1) and/or `tuple` of characters.
+        """
+        ranges = []
+
+        for first, last in sorted(cls._iter_code_ranges(characters)):
+            if ranges and first <= ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], last))
+            else:
+                ranges.append((first, last))
+
+        return tuple(ranges)
 
     def get_characters(self) -> Set[str]:
         """Returns the set of supported characters."""
         return self._characters
 
+    def get_memory_footprint(self) -> int:
+        """\
+        Returns the memory used to store the characters in bytes (the `set` and
+        the `str` it contains).
+        """
+        return getsizeof(self._characters) + sum(map(getsizeof, self._characters))
+
+    def get_ranges(self) -> List[Tuple[int, int]]:
+        """\
+        Returns the supported characters as a sorted `list` of merged ranges of
+        code points.
+
+        Each range is a `tuple` holding the first and the last code points of
+        the range. For example, `[("A", "C"), "D", "z"]` gives
+        `[(65, 68), (122, 122)]`.
+        """
+        ranges = []
+
+        for code in sorted(map(ord, self._characters)):
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1] = (ranges[-1][0], code)
+            else:
+                ranges.append((code, code))
+
+        return ranges
+
     def add_character(self, character: str) -> None:
         """
         Adds a character to the set of supported characters.
@@ -175,3 +272,290 @@ class CharacterSet:
                 f"{character} can't be added as it is not a character. "
                 "It should be a `str` of length 1."
             )
+
+
+class IntervalCharacterSet(CharacterSet):
+    """\
+    Compact representation of a set of unicode characters.
+
+    The characters are stored as sorted and merged ranges of code points in two
+    `array`, so a range covering a whole unicode block or plane takes a few
+    bytes. The membership is tested with a binary search.
+    """
+
+    _starts: array
+    _ends: array
+
+    def __init__(self, characters: Chars) -> None:
+        """\
+        Constructor of the `IntervalCharacterSet` class.
+
+        The constructor returns a `TypeError` if the `characters` parameter is
+        is not valid.
+        The `characters` parameter should be a `list` of characters
+        (`str` of size 1) and/or `tuple` of characters.
+        For example, `["A", ("B", "E"), "g", ("z", "v")]` is valid.
+
+        Parameters
+        ----------
+        characters
+            A `list` of characters (`str` of size 1) and/or `tuple` of characters.
+            For example, `["A", ("B", "E"), "g", ("z", "v")]` is valid.
+        """
+        # the characters are stored as ranges, the set of the base class stays
+        # empty
+        super().__init__([])
+        self._starts = array("L")
+        self._ends = array("L")
+
+        try:
+            ranges = sorted(self._iter_code_ranges(characters))
+        except TypeError as type_err:
+            raise type_err
+
+        for first, last in ranges:
+            if self._ends and first <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], last)
+            else:
+                self._starts.append(first)
+                self._ends.append(last)
+
+    def __contains__(self, character):
+        if not _is_character(character):
+            return False
+        code = ord(character)
+        index = bisect_right(self._starts, code) - 1
+        return index > -1 and code <= self._ends[index]
+
+    def __iter__(self) -> Iterator[str]:
+        for first, last in zip(self._starts, self._ends):
+            yield from map(chr, range(first, last + 1))
+
+    def __len__(self) -> int:
+        return sum(last - first + 1 for first, last in zip(self._starts, self._ends))
+
+    @property
+    def characters(self) -> Set[str]:
+        """Returns the characters set."""
+        return self.get_characters()
+
+    def get_characters(self) -> Set[str]:
+        """\
+        Returns the set of supported characters.
+
+        The set is created on each call, iterate over the `IntervalCharacterSet`
+        or use `get_ranges` to avoid expanding large ranges.
+        """
+        return set(self)
+
+    def get_memory_footprint(self) -> int:
+        """Returns the memory used to store the ranges in bytes."""
+        return getsizeof(self._starts) + getsizeof(self._ends)
+
+    def get_ranges(self) -> List[Tuple[int, int]]:
+        """\
+        Returns the supported characters as a sorted `list` of merged ranges of
+        code points.
+
+        Each range is a `tuple` holding the first and the last code points of
+        the range. For example, `[("A", "C"), "D", "z"]` gives
+        `[(65, 68), (122, 122)]`.
+        """
+        return list(zip(self._starts, self._ends))
+
+    def add_character(self, character: str) -> None:
+        """
+        Adds a character to the set of supported characters.
+
+        The method returns a `TypeError` if the `character` parameter is
+        is not valid.
+        The `character` parameter should be a `str` of size 1.
+
+        Parameters
+        ----------
+        character
+            The character (`str` of size 1) to add.
+        """
+        if not _is_character(character):
+            raise TypeError(
+                f"{character} can't be added as it is not a character. "
+                "It should be a `str` of length 1."
+            )
+
+        code = ord(character)
+        index = bisect_right(self._starts, code) - 1
+
+        if index > -1 and code <= self._ends[index]:
+            return
+
+        # the character can extend the previous and/or the next ranges
+        extends_previous = index > -1 and self._ends[index] == code - 1
+        extends_next = (
+            index + 1 < len(self._starts) and self._starts[index + 1] == code + 1
+        )
+
+        if extends_previous and extends_next:
+            self._ends[index] = self._ends[index + 1]
+            del self._starts[index + 1]
+            del self._ends[index + 1]
+        elif extends_previous:
+            self._ends[index] = code
+        elif extends_next:
+            self._starts[index + 1] = code
+        else:
+            self._starts.insert(index + 1, code)
+            self._ends.insert(index + 1, code)
+
+
+class BitmapCharacterSet(CharacterSet):
+    """\
+    Representation of a set of unicode characters as a bitmap.
+
+    The bitmap holds one bit per code point of the unicode table (0x110000
+    bits, 136 KiB) whatever the number of characters, and the membership is
+    tested in constant time without hashing. The bitmap can be shared without
+    copy through the `buffer` property.
+    """
+
+    _size: int = 0x110000
+    _bitmap: bytearray
+
+    def __init__(self, characters: Chars) -> None:
+        """\
+        Constructor of the `BitmapCharacterSet` class.
+
+        The constructor returns a `TypeError` if the `characters` parameter is
+        is not valid.
+        The `characters` parameter should be a `list` of characters
+        (`str` of size 1) and/or `tuple` of characters.
+        For example, `["A", ("B", "E"), "g", ("z", "v")]` is valid.
+
+        Parameters
+        ----------
+        characters
+            A `list` of characters (`str` of size 1) and/or `tuple` of characters.
+            For example, `["A", ("B", "E"), "g", ("z", "v")]` is valid.
+        """
+        # the characters are stored in the bitmap, the set of the base class
+        # stays empty
+        super().__init__([])
+        self._bitmap = bytearray(self._size >> 3)
+
+        try:
+            for first, last in self._iter_code_ranges(characters):
+                self._set_range(first, last)
+        except TypeError as type_err:
+            raise type_err
+
+    def __contains__(self, character):
+        if not _is_character(character):
+            return False
+        code = ord(character)
+        return bool(self._bitmap[code >> 3] & (1 << (code & 7)))
+
+    def __iter__(self) -> Iterator[str]:
+        for index, byte in enumerate(self._bitmap):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield chr((index << 3) | bit)
+
+    def __len__(self) -> int:
+        return int.from_bytes(self._bitmap, "little").bit_count()
+
+    @property
+    def characters(self) -> Set[str]:
+        """Returns the characters set."""
+        return self.get_characters()
+
+    @property
+    def buffer(self) -> memoryview:
+        """\
+        Returns a `memoryview` of the bitmap.
+
+        The bit of the code point `code` is the bit `code & 7` of the byte
+        `code >> 3`.
+        """
+        return memoryview(self._bitmap)
+
+    def _set_range(self, first: int, last: int) -> None:
+        """Sets the bits of the code points from `first` to `last`."""
+        # the bytes fully covered by the range are set at once
+        first_byte = (first + 7) >> 3
+        last_byte = (last + 1) >> 3
+
+        if first_byte < last_byte:
+            self._bitmap[first_byte:last_byte] = b"\xff" * (last_byte - first_byte)
+            codes = [*range(first, first_byte << 3), *range(last_byte << 3, last + 1)]
+        else:
+            codes = range(first, last + 1)
+
+        for code in codes:
+            self._bitmap[code >> 3] |= 1 << (code & 7)
+
+    def get_characters(self) -> Set[str]:
+        """\
+        Returns the set of supported characters.
+
+        The set is created on each call, iterate over the `BitmapCharacterSet`
+        to avoid expanding large ranges.
+        """
+        return set(self)
+
+    def get_memory_footprint(self) -> int:
+        """Returns the memory used to store the bitmap in bytes."""
+        return getsizeof(self._bitmap)
+
+    def get_ranges(self) -> List[Tuple[int, int]]:
+        """\
+        Returns the supported characters as a sorted `list` of merged ranges of
+        code points.
+
+        Each range is a `tuple` holding the first and the last code points of
+        the range. For example, `[("A", "C"), "D", "z"]` gives
+        `[(65, 68), (122, 122)]`.
+        """
+        # re is slow to import and only needed by some cleaner engines
+        import re  # pylint: disable=import-outside-toplevel
+
+        ranges = []
+
+        # the 0x00 bytes are skipped and the runs of 0xff bytes are a single
+        # range, so only the bytes holding the bounds of a range are visited
+        for match in re.finditer(rb"\xff+|[^\x00\xff]", self._bitmap):
+            offset = match.start() << 3
+            byte = self._bitmap[match.start()]
+
+            if byte == 0xFF:
+                runs = [(0, ((match.end() - match.start()) << 3) - 1)]
+            else:
+                runs = _BYTE_RUNS[byte]
+
+            for first, last in runs:
+                if ranges and ranges[-1][1] == offset + first - 1:
+                    ranges[-1] = (ranges[-1][0], offset + last)
+                else:
+                    ranges.append((offset + first, offset + last))
+
+        return ranges
+
+    def add_character(self, character: str) -> None:
+        """
+        Adds a character to the set of supported characters.
+
+        The method returns a `TypeError` if the `character` parameter is
+        is not valid.
+        The `character` parameter should be a `str` of size 1.
+
+        Parameters
+        ----------
+        character
+            The character (`str` of size 1) to add.
+        """
+        if not _is_character(character):
+            raise TypeError(
+                f"{character} can't be added as it is not a character. "
+                "It should be a `str` of length 1."
+            )
+
+        self._set_range(ord(character), ord(character))
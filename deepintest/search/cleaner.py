@@ -2,23 +2,98 @@
 Cleaner module to remove unwanted characters from strings.
 """
 
-import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
 
 from deepintest._conf import default_characters
 from deepintest._typing import Chars
 
-from .characters import CharacterSet
+from .characters import BitmapCharacterSet, CharacterSet, IntervalCharacterSet
 
+# re and numpy are imported by the engines needing them, only for the annotations
+if TYPE_CHECKING:
+    import re
 
-class Cleaner:
+    import numpy
+
+# number of lines cleaned at once by the "numpy" engine
+_CHUNK_SIZE = 256
+
+
+class _TranslationTable(dict):
+    """\
+    Table for `str.translate` replacing the unsupported characters with the
+    delimiter.
+
+    The table is precomputed for the first 256 code points, the other code
+    points are added on first lookup, so large character sets are never
+    expanded.
+    """
+
+    _charset: CharacterSet
+    _delimiter_code: int
+
+    def __init__(self, charset: CharacterSet, delimiter: str) -> None:
+        super().__init__()
+        self._charset = charset
+        self._delimiter_code = ord(delimiter)
+
+        for code in range(256):
+            self.__missing__(code)
+
+    def __missing__(self, code: int) -> int:
+        value = code if chr(code) in self._charset else self._delimiter_code
+        self[code] = value
+        return value
+
+
+def _find_delimiters(
+    words: "numpy.ndarray", starts: "numpy.ndarray", ends: "numpy.ndarray"
+) -> "numpy.ndarray":
+    """\
+    Returns the positions of the characters becoming the delimiter in the code
+    points of lines: the character before each word but the first word of a
+    line. `words` tells if a code point is a character of a word, `starts` and
+    `ends` hold the offsets of the non-empty lines and of all the lines.
+    """
+    # the first characters of the words, a word can't span two lines
+    word_starts = words.copy()
+    word_starts[1:] &= ~words[:-1]
+    word_starts[starts] = words[starts]
+    positions = word_starts.nonzero()[0]
+    line_ids = ends.searchsorted(positions, side="right")
+
+    return positions[1:][line_ids[1:] == line_ids[:-1]] - 1
+
+
+# the tables of the engines are attributes too, each engine uses one of them
+class Cleaner:  # pylint: disable=too-many-instance-attributes
     """
     Class to removes unwanted characters from a string.
     """
 
+    _supported_engines: List[str] = ["loop", "translate", "regex", "numpy"]
+    _backends: Dict[str, Type[CharacterSet]] = {
+        "set": CharacterSet,
+        "interval": IntervalCharacterSet,
+        "bitmap": BitmapCharacterSet,
+    }
     _charset: CharacterSet
     _delimiter: str
+    _replacement: str
+    _engine: str
+    _table: Optional[Dict[int, int]] = None
+    _pattern: Optional["re.Pattern"] = None
+    _mask: Optional["numpy.ndarray"] = None
+    _ascii_table: Optional[bytes] = None
+    _split_whitespaces: bool = False
 
-    def __init__(self, characters: Chars = None, delimiter: str = " ") -> None:
+    def __init__(
+        self,
+        characters: Chars = None,
+        delimiter: str = " ",
+        engine: str = "loop",
+        backend: str = "set",
+    ) -> None:
         """\
         Constructor of the Cleaner class.
 
@@ -32,6 +107,10 @@ class Cleaner:
         is not valid.
         The `delimiter` parameter should be a character (`str` of size 1).
 
+        The constructor returns a `ValueError` if the `engine` or the `backend`
+        parameter is not supported, and an `ImportError` if the "numpy" engine
+        is used without NumPy installed.
+
         Parameters
         ----------
         characters
@@ -42,6 +121,26 @@ class Cleaner:
         delimiter
             Character (`str` of size 1) used to separated the words in a string.
             It is usually a space (" ").
+        engine
+            How the lines are cleaned. All the engines return the same result.
+
+                * "loop" checks the characters one by one
+                * "translate" uses `str.translate` with a precomputed table
+                * "regex" uses a single compiled regular expression
+                * "numpy" cleans the lines of `clean_lines` at once, as arrays
+                  of code points, it needs NumPy (an optional dependency)
+
+            The tables of the "translate", "regex" and "numpy" engines are
+            built by the constructor, so they don't see the characters added
+            later to the character set.
+        backend
+            How the supported characters are stored.
+
+                * "set" uses a `CharacterSet`
+                * "interval" uses an `IntervalCharacterSet`, which is more
+                  compact for large ranges of characters
+                * "bitmap" uses a `BitmapCharacterSet`, which has a constant
+                  size and membership time
         """
         # delimiter should be a single character not several character
         if isinstance(delimiter, str) and len(delimiter) == 1:
@@ -52,15 +151,26 @@ class Cleaner:
                 "It should be a `str` of length 1."
             )
 
+        # the delimiter as a replacement string of the re module
+        self._replacement = self._delimiter.replace("\\", r"\\")
+
+        if engine not in self._supported_engines:
+            raise ValueError(f"{engine} is not a supported engine.")
+
+        self._engine = engine
+
+        if backend not in self._backends:
+            raise ValueError(f"{backend} is not a supported backend.")
+
         # set up supported characters
         if characters:
             try:
-                self._charset = CharacterSet(characters)
+                self._charset = self._backends[backend](characters)
             except TypeError as type_err:
                 raise type_err
         else:
             try:
-                self._charset = CharacterSet(default_characters)
+                self._charset = self._backends[backend](default_characters)
             except TypeError as type_err:
                 raise type_err
 
@@ -70,12 +180,18 @@ class Cleaner:
         except TypeError as type_err:
             raise type_err
 
+        self._build_tables()
 
     @property
     def charsest(self):
         """Getter for character set."""
         return self._charset
 
+    @property
+    def engine(self):
+        """Getter for engine."""
+        return self._engine
+
     def clean_line(self, line: str) -> str:
         """\
         Removes the unsupported characters and extra delimiter from a string.
@@ -95,6 +211,18 @@ class Cleaner:
                 f"Here is the problematic line: {line}"
             )
 
+        if self._engine == "numpy":
+            return self._clean_arrays([line])[0]
+
+        if self._engine == "translate":
+            # replace unsupported characters then remove extra delimiters
+            words = line.translate(self._table).split(self._delimiter)
+            return self._delimiter.join(filter(None, words))
+
+        if self._engine == "regex":
+            # runs of unsupported characters and delimiters become one delimiter
+            return self._pattern.sub(self._replacement, line).strip(self._delimiter)
+
         new_line = ""
 
         # remove unsupported characters
@@ -104,9 +232,222 @@ class Cleaner:
             else:
                 new_line += self._delimiter
 
+        # re is slow to import and only needed by some engines
+        import re  # pylint: disable=import-outside-toplevel
+
         # remove extra spaces
-        new_line = re.sub(f"^{self._delimiter}+", "", new_line)
-        new_line = re.sub(f"{self._delimiter}+$", "", new_line)
-        new_line = re.sub(f"{self._delimiter}+", self._delimiter, new_line)
+        delimiter = re.escape(self._delimiter)
+        new_line = re.sub(f"^{delimiter}+", "", new_line)
+        new_line = re.sub(f"{delimiter}+\\Z", "", new_line)
+        new_line = re.sub(f"{delimiter}+", self._replacement, new_line)
 
         return new_line
+
+    def clean_lines(self, lines: List[str]) -> List[str]:
+        """\
+        Removes the unsupported characters and extra delimiter from strings.
+
+        The method returns a `list` of `str`, the same as `clean_line` returns
+        for each line. The "numpy" engine cleans all the lines at once, the
+        other engines clean them one by one.
+
+        The method returns a `TypeError` if an item of the `lines` parameter is
+        not a `str`.
+
+        Parameters
+        ----------
+        lines
+            Lines to clean as a `list` of `str`.
+        """
+        if self._engine != "numpy":
+            return [self.clean_line(line) for line in lines]
+
+        for line in lines:
+            if not isinstance(line, str):
+                raise TypeError(
+                    "The line parameter should be a str. "
+                    f"Here is the problematic line: {line}"
+                )
+
+        # the arrays of a chunk of lines stay small enough for the CPU caches
+        return [
+            new_line
+            for index in range(0, len(lines), _CHUNK_SIZE)
+            for new_line in self._clean_arrays(lines[index : index + _CHUNK_SIZE])
+        ]
+
+    def clean_byte_lines(self, lines: List[bytes]) -> List[bytes]:
+        """\
+        Removes the unsupported characters and extra delimiter from strings
+        encoded in UTF-8.
+
+        The method returns a `list` of `bytes`, the same as `clean_lines`
+        returns for the decoded lines, encoded in UTF-8. The ASCII lines are
+        cleaned without being decoded, whatever the engine, with `bytes.translate`
+        and a table of the ASCII characters built by the constructor, the other
+        lines are decoded and cleaned with `clean_line`.
+
+        The method returns a `TypeError` if an item of the `lines` parameter is
+        not `bytes`.
+
+        Parameters
+        ----------
+        lines
+            Lines to clean as a `list` of `bytes`.
+        """
+        for line in lines:
+            if not isinstance(line, bytes):
+                raise TypeError(
+                    "The line parameter should be bytes. "
+                    f"Here is the problematic line: {line}"
+                )
+
+        table = self._ascii_table
+
+        if table is None:
+            return list(map(self._clean_utf8_line, lines))
+
+        if self._split_whitespaces:
+            # the runs of ASCII whitespaces are the runs of delimiters
+            return [
+                (
+                    b" ".join(line.translate(table).split())
+                    if line.isascii()
+                    else self._clean_utf8_line(line)
+                )
+                for line in lines
+            ]
+
+        delimiter = self._delimiter.encode("ascii")
+
+        return [
+            (
+                delimiter.join(filter(None, line.translate(table).split(delimiter)))
+                if line.isascii()
+                else self._clean_utf8_line(line)
+            )
+            for line in lines
+        ]
+
+    def _clean_utf8_line(self, line: bytes) -> bytes:
+        """Cleans a line encoded in UTF-8 with `clean_line`."""
+        return self.clean_line(line.decode("utf-8")).encode("utf-8")
+
+    def _build_ascii_table(self) -> bytes:
+        """\
+        Builds the table of `bytes.translate` replacing the unsupported ASCII
+        characters with the delimiter. The lines can be split on the ASCII
+        whitespaces if the delimiter is a space and the only whitespace
+        supported.
+        """
+        delimiter = ord(self._delimiter)
+        table = bytes(
+            code if code < 128 and chr(code) in self._charset else delimiter
+            for code in range(256)
+        )
+
+        self._split_whitespaces = self._delimiter == " " and all(
+            table[code] == delimiter for code in b"\t\n\r\x0b\x0c"
+        )
+
+        return table
+
+    def _build_tables(self) -> None:
+        """Builds what the engine needs, and the table of the ASCII lines."""
+        if self._engine == "translate":
+            self._table = _TranslationTable(self._charset, self._delimiter)
+        elif self._engine == "regex":
+            self._pattern = self._compile_pattern()
+        elif self._engine == "numpy":
+            self._mask = self._build_mask()
+
+        # the ASCII lines are cleaned without being decoded, by all the engines
+        if self._delimiter.isascii():
+            self._ascii_table = self._build_ascii_table()
+
+    def _build_mask(self) -> "numpy.ndarray":
+        """\
+        Builds the boolean array telling if a code point is a supported
+        character other than the delimiter, its last item is `False` and stands
+        for all the larger code points.
+        """
+        try:
+            import numpy  # pylint: disable=import-outside-toplevel
+        except ImportError as import_err:
+            raise ImportError(
+                "The numpy engine needs NumPy, install deepintest[numpy]."
+            ) from import_err
+
+        ranges = self._charset.get_ranges()
+        mask = numpy.zeros(ranges[-1][1] + 2, dtype=bool)
+
+        for first, last in ranges:
+            mask[first : last + 1] = True
+
+        mask[ord(self._delimiter)] = False
+
+        return mask
+
+    def _clean_arrays(self, lines: List[str]) -> List[str]:
+        """\
+        Cleans lines as a single array of UTF-32 code points: the characters
+        of the words are the supported characters other than the delimiter,
+        and the character before each word but the first word of a line
+        becomes the delimiter, the other characters are removed.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        lengths = numpy.fromiter(map(len, lines), dtype=numpy.intp, count=len(lines))
+        ends = numpy.cumsum(lengths)
+        text = "".join(lines).encode("utf-32-le", "surrogatepass")
+        codes = numpy.frombuffer(text, dtype=numpy.uint32)
+
+        if not codes.size:
+            return ["" for _ in lines]
+
+        # the code points larger than the mask get its last item
+        words = numpy.take(self._mask, codes, mode="clip")
+        starts = (ends - lengths)[lengths > 0]
+
+        delimiters = _find_delimiters(words, starts, ends)
+
+        new_codes = codes.copy()
+        new_codes[delimiters] = ord(self._delimiter)
+        words[delimiters] = True
+        new_text = new_codes[words].tobytes().decode("utf-32-le", "surrogatepass")
+
+        new_lengths = numpy.zeros(len(lines), dtype=numpy.intp)
+        new_lengths[lengths > 0] = numpy.add.reduceat(words, starts, dtype=numpy.intp)
+        new_ends = numpy.cumsum(new_lengths).tolist()
+
+        return [
+            new_text[start:end] for start, end in zip([0, *new_ends[:-1]], new_ends)
+        ]
+
+    def _compile_pattern(self) -> "re.Pattern":
+        """\
+        Compiles the regular expression matching the runs of unsupported
+        characters and delimiters.
+        """
+        import re  # pylint: disable=import-outside-toplevel
+
+        delimiter = ord(self._delimiter)
+        ranges = []
+
+        # the delimiter is removed from the supported characters
+        for first, last in self._charset.get_ranges():
+            if first <= delimiter <= last:
+                ranges.extend([(first, delimiter - 1), (delimiter + 1, last)])
+            else:
+                ranges.append((first, last))
+
+        character_class = "".join(
+            f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+            for first, last in ranges
+            if first <= last
+        )
+
+        if not character_class:
+            return re.compile(r"[\s\S]+")
+
+        return re.compile(f"[^{character_class}]+")
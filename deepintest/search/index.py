@@ -0,0 +1,395 @@
+"""
+Module to search for terms in a file through a trigram index.
+"""
+
+import json
+import re
+import sys
+from array import array
+from collections import defaultdict, deque
+from functools import lru_cache
+from itertools import accumulate, repeat
+from mmap import ACCESS_READ, mmap
+from operator import sub
+from os import replace, stat
+from os.path import abspath, dirname
+from shutil import copyfileobj
+from tempfile import TemporaryFile
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from deepintest._utils import _is_unchanged, _read_sidecar_header
+from deepintest.io.reader import CompressedFileError, TextFileReader
+
+from .matcher import Matcher
+
+# first line of the index files, changed when their format changes
+_MAGIC = b"deepintest trigram index 1\n"
+
+# the line endings supported by TextFileReader
+_LINE_ENDING = re.compile(rb"\r\n|\r|\n")
+
+# smallest first, to store the deltas with the smallest items possible
+_TYPECODES = ["B", "H", "I", "Q"]
+
+# the keys of the header of the index files
+_HEADER_KEYS = {
+    "size",
+    "mtime_ns",
+    "encoding",
+    "byteorder",
+    "lines",
+    "offsets",
+    "postings",
+}
+
+
+@lru_cache(maxsize=1 << 16)
+def _get_word_trigrams(word: str) -> frozenset:
+    """Returns the trigrams of a word, the words of a text are often repeated."""
+    return frozenset(zip(word, word[1:], word[2:]))
+
+
+def _get_line_trigrams(line: str) -> frozenset:
+    """Returns the trigrams of the words of a line."""
+    return frozenset().union(*map(_get_word_trigrams, set(line.split(" "))))
+
+
+def _encode_deltas(values: array) -> Tuple[str, bytes]:
+    """\
+    Returns the typecode and the bytes of the differences between the
+    consecutive values of an increasing `array` (the first value is kept).
+    """
+    deltas = array("Q", values[:1])
+    deltas.extend(map(sub, values[1:], values))
+    largest = max(deltas, default=0)
+
+    for typecode in _TYPECODES:
+        if largest < 1 << (8 * array(typecode).itemsize):
+            return typecode, array(typecode, deltas).tobytes()
+
+    raise ValueError(f"{largest} is too large to be stored.")
+
+
+def _decode_deltas(typecode: str, data: bytes) -> List[int]:
+    """Returns the values encoded by `_encode_deltas`."""
+    deltas = array(typecode)
+    deltas.frombytes(data)
+    return list(accumulate(deltas))
+
+
+def _iter_line_ends(data: bytes) -> Iterator[int]:
+    """Yields the offsets where the lines of a buffer end, after their line ending."""
+    end = 0
+    for match in _LINE_ENDING.finditer(data):
+        end = match.end()
+        yield end
+
+    # the last line may not have a line ending
+    if end < len(data):
+        yield len(data)
+
+
+class TrigramIndex:
+    """\
+    Class to search for terms in a file through a trigram index.
+
+    The index maps each trigram (three consecutive characters) of the lines
+    of a file to the lines containing it. It is built once with `build` and
+    written next to the file. The search terms don't have spaces, so only the
+    trigrams of the words (separated by spaces) are indexed.
+
+    A search intersects the lines of the trigrams of the search term, then
+    only these candidate lines are read and checked with `Matcher.match`, so
+    the results are the same as a scan of all the lines. The search terms
+    shorter than three characters don't have a trigram, so all the lines are
+    scanned.
+
+    The index file starts with a header (JSON) holding the size and the
+    modification time of the file, the number of lines and where the lists of
+    each trigram are stored. The lists of lines and the offsets of the lines
+    are increasing, so their differences are stored instead, in `array` of the
+    smallest type they fit in. A search only reads the header and the lists of
+    the trigrams of the search term.
+
+    While the index is built, the lists of lines of the trigrams are written to
+    a temporary file every `_chunk_postings` items, then merged trigram by
+    trigram, so only the offsets of the lines (8 bytes per line) are kept in
+    memory whatever the size of the file.
+    """
+
+    _path: str
+    _index_path: str
+    _reader: TextFileReader
+    _header: Dict
+    _offsets: List[int]
+    _chunk_postings: int = 1 << 22
+
+    def __init__(
+        self, path: str, index_path: str = None, reader: TextFileReader = None
+    ) -> None:
+        """\
+        Constructor of the TrigramIndex class, the index is not read or built.
+
+        Parameters
+        ----------
+        path
+            The path of the file to index.
+        index_path
+            The path of the index file, `path` followed by ".tri" if not
+            provided.
+        reader
+            The `TextFileReader` used to check the file and to get its encoding.
+            A default `TextFileReader` is used if not provided.
+        """
+        self._path = path
+        self._index_path = f"{path}.tri" if index_path is None else index_path
+        self._reader = reader if reader is not None else TextFileReader()
+        self._header = None
+        self._offsets = None
+
+    @property
+    def path(self) -> str:
+        """Getter for _path."""
+        return self._path
+
+    @property
+    def index_path(self) -> str:
+        """Getter for _index_path."""
+        return self._index_path
+
+    def build(self) -> int:
+        """\
+        Builds the index of the file and writes it to the index file.
+
+        The method returns the number of lines indexed.
+
+        The method raises the same errors as `TextFileReader.read`, and a
+        `CompressedFileError` (a `ValueError`) if the file is compressed (the
+        lines are read from the memory-mapped file).
+        """
+        if self._reader.get_compression(self._path) is not None:
+            raise CompressedFileError(
+                f"{self._path} is compressed, it can't be indexed."
+            )
+        status = stat(self._path)
+        offsets = array("Q")
+        postings = defaultdict(lambda: array("I"))
+        # for each trigram, the position and the length of its chunks of lines
+        chunks = defaultdict(lambda: array("Q"))
+        count = 0
+
+        with open(self._path, "rb") as file_obj, self._temporary_file() as spill:
+            # empty files can't be mapped
+            data = b""
+            if status.st_size > 0:
+                data = mmap(file_obj.fileno(), 0, access=ACCESS_READ)
+
+            start = 0
+
+            for number, end in enumerate(_iter_line_ends(data)):
+                line = self._reader.decode(data[start:end], self._path).rstrip()
+                offsets.append(start)
+                start = end
+                trigrams = _get_line_trigrams(line)
+                # the line is appended to the list of each trigram without a
+                # Python loop, there are tens of trigrams per line
+                lists = map(postings.__getitem__, trigrams)
+                deque(map(array.append, lists, repeat(number)), maxlen=0)
+                count += len(trigrams)
+
+                if count >= self._chunk_postings:
+                    self._flush(postings, chunks, spill)
+                    count = 0
+
+            self._flush(postings, chunks, spill)
+            self._write(status, offsets, chunks, spill)
+
+        self._header = None
+        self._offsets = None
+
+        return len(offsets)
+
+    def get_candidates(self, search_term: str) -> List[int]:
+        """\
+        Returns the sorted numbers (starting at 0) of the lines having all the
+        trigrams of the search term, all the lines if the search term is
+        shorter than three characters.
+
+        The method raises the same errors as `search`.
+
+        Parameters
+        ----------
+        search_term
+            The term to search.
+        """
+        search_term = Matcher(search_term=search_term).search_term
+        header = self._read_header()
+
+        if len(search_term) < 3:
+            return list(range(header["lines"]))
+
+        trigrams = {search_term[i : i + 3] for i in range(len(search_term) - 2)}
+        postings = header["postings"]
+
+        if any(trigram not in postings for trigram in trigrams):
+            return []
+
+        # the shortest lists first, so the intersection stays small
+        trigrams = sorted(trigrams, key=lambda trigram: postings[trigram][2])
+
+        with open(self._index_path, "rb") as file_obj:
+            candidates = set(self._read_array(file_obj, *postings[trigrams[0]]))
+            for trigram in trigrams[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(
+                    self._read_array(file_obj, *postings[trigram])
+                )
+
+        return sorted(candidates)
+
+    def search(self, search_term: str) -> List[str]:
+        """\
+        Searches the lines of the file containing the search term.
+
+        The method returns the matched lines (without the trailing whitespaces)
+        in the same order as in the file, like a scan of the lines returned by
+        `TextFileReader.read` with `Matcher.match`.
+
+        The method raises the same errors as the `Matcher` constructor if the
+        search term is not valid, the same errors as `TextFileReader.read`, and
+        a `ValueError` if the index file is not valid or if the file changed
+        since the index was built.
+
+        Parameters
+        ----------
+        search_term
+            The term to search.
+        """
+        matcher = Matcher(search_term=search_term)
+
+        if len(search_term) < 3:
+            lines = []
+            for block in self._reader.iter_line_blocks(self._path):
+                lines.extend(block[index] for index in matcher.match_many(block))
+            return lines
+
+        candidates = self.get_candidates(search_term)
+
+        if not candidates:
+            return []
+
+        offsets = self._read_offsets()
+        lines = []
+
+        with open(self._path, "rb") as file_obj:
+            data = mmap(file_obj.fileno(), 0, access=ACCESS_READ)
+            with data:
+                for number in candidates:
+                    end = offsets[number + 1] if number + 1 < len(offsets) else None
+                    line = self._reader.decode(
+                        data[offsets[number] : end], self._path
+                    ).rstrip()
+                    if matcher.match(line):
+                        lines.append(line)
+
+        return lines
+
+    def _temporary_file(self) -> BinaryIO:
+        """\
+        Returns a temporary file next to the index file, so it is on the same
+        disk and not in memory.
+        """
+        return TemporaryFile(dir=dirname(abspath(self._index_path)))
+
+    @staticmethod
+    def _flush(postings: Dict, chunks: Dict, spill: BinaryIO) -> None:
+        """Writes the lists of lines of the trigrams to the spill file."""
+        for trigram, lines in postings.items():
+            chunks[trigram].extend([spill.tell(), len(lines)])
+            lines.tofile(spill)
+
+        postings.clear()
+
+    def _write(self, status, offsets: array, chunks: Dict, spill: BinaryIO) -> None:
+        """\
+        Writes the index file, through a temporary file renamed at the end. The
+        lists of lines are read back from the spill file one trigram at a time.
+        """
+        with self._temporary_file() as blob:
+
+            def add_array(values):
+                typecode, data = _encode_deltas(values)
+                blob.write(data)
+                return [typecode, blob.tell() - len(data), len(values)]
+
+            def read_lines(trigram_chunks):
+                lines = array("I")
+                for position, length in zip(*[iter(trigram_chunks)] * 2):
+                    spill.seek(position)
+                    lines.fromfile(spill, length)
+                return lines
+
+            header = {
+                "size": status.st_size,
+                "mtime_ns": status.st_mtime_ns,
+                "encoding": self._reader.encoding,
+                "byteorder": sys.byteorder,
+                "lines": len(offsets),
+                "offsets": add_array(offsets),
+                "postings": {
+                    "".join(trigram): add_array(read_lines(chunks[trigram]))
+                    for trigram in sorted(chunks)
+                },
+            }
+
+            with open(f"{self._index_path}.tmp", "wb") as file_obj:
+                file_obj.write(_MAGIC)
+                file_obj.write(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+                file_obj.write(b"\n")
+                blob.seek(0)
+                copyfileobj(blob, file_obj)
+
+        replace(f"{self._index_path}.tmp", self._index_path)
+
+    def _read_header(self) -> Dict:
+        """\
+        Reads the header of the index file (once) then checks that the file
+        didn't change since the index was built.
+        """
+        self._reader.check(self._path)
+
+        if self._header is None:
+            header = _read_sidecar_header(self._index_path, _MAGIC, _HEADER_KEYS)
+
+            if header is None:
+                raise ValueError(f"{self._index_path} is not a trigram index.")
+
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError(f"{self._index_path} was built on another platform.")
+
+            self._header = header
+
+        if not _is_unchanged(self._path, self._header, self._reader.encoding):
+            raise ValueError(f"{self._path} changed since its index was built.")
+
+        return self._header
+
+    def _read_offsets(self) -> List[int]:
+        """Reads the offsets of the lines (once)."""
+        if self._offsets is None:
+            with open(self._index_path, "rb") as file_obj:
+                self._offsets = self._read_array(file_obj, *self._header["offsets"])
+
+        return self._offsets
+
+    def _read_array(self, file_obj, typecode: str, position: int, count: int):
+        """Reads an `array` of values stored by `_write`."""
+        file_obj.seek(self._header["blob"] + position)
+        size = count * array(typecode).itemsize
+        data = file_obj.read(size)
+
+        if len(data) != size:
+            raise ValueError(f"{self._index_path} is truncated.")
+
+        return _decode_deltas(typecode, data)
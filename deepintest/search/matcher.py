@@ -2,6 +2,16 @@
 Module to search for a term in a string.
 """
 
+from array import array
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate, repeat
+from operator import add
+from typing import Dict, List
+
+# the ASCII characters removed by `str.rstrip`, `bytes.rstrip` keeps "\x1c" to "\x1f"
+_ASCII_WHITESPACES = bytes(code for code in range(128) if chr(code).isspace())
+
 
 class Matcher:
     """
@@ -59,3 +69,253 @@ class Matcher:
             raise TypeError("The line parameter is not a str.")
 
         return line.find(self._search_term) > -1
+
+    def match_many(self, lines: List[str]) -> array:
+        """\
+        This method returns the indices of the lines containing the search term.
+
+        The lines are joined with new line characters and the resulting buffer
+        is searched with repeated `find`. The hits are mapped back to the lines
+        with a table of the line offsets, so there is no Python call per line.
+
+        The method returns the indices as an `array` of unsigned integers.
+
+        The method returns a `TypeError` if one of the lines is not a `str`.
+
+        Parameters
+        ----------
+        lines
+            The strings to search in.
+        """
+        if not isinstance(lines, list):
+            raise TypeError("The lines parameter is not a list.")
+
+        try:
+            text = "\n".join(lines)
+        except TypeError as type_err:
+            raise TypeError(
+                "The lines parameter contains a line that is not a str."
+            ) from type_err
+
+        # a search term with a new line would match across the lines
+        if "\n" in self._search_term:
+            matches = map(self.match, lines)
+            return array("L", (index for index, match in enumerate(matches) if match))
+
+        indices = array("L")
+        position = text.find(self._search_term)
+
+        if position < 0:
+            return indices
+
+        # the offset where each line ends, new line character included
+        ends = array("L", accumulate(map(add, map(len, lines), repeat(1))))
+
+        while position > -1:
+            index = bisect_right(ends, position)
+            indices.append(index)
+            position = text.find(self._search_term, ends[index])
+
+        return indices
+
+    def match_bytes(self, data: bytes) -> List[bytes]:
+        """\
+        This method returns the lines of a buffer of bytes containing the
+        search term.
+
+        The buffer is made of ASCII lines with their line endings, for example
+        a block of `TextFileReader.iter_byte_blocks`. It is searched for the
+        search term encoded in UTF-8 with repeated `find`, and the line
+        boundaries are only looked for around the hits, so the lines are
+        neither decoded nor split.
+
+        The method returns the matched lines as a `list` of `bytes`, without
+        their trailing whitespaces, which are the lines `match_many` would
+        match once decoded.
+
+        The method returns a `TypeError` if the `data` parameter is not `bytes`.
+
+        Parameters
+        ----------
+        data
+            The lines, with their line endings, to search in.
+        """
+        if not isinstance(data, bytes):
+            raise TypeError("The data parameter is not bytes.")
+
+        term = self._search_term.encode("utf-8")
+
+        # a search term with a line ending would match across the lines
+        if b"\n" in term or b"\r" in term:
+            return []
+
+        lines = []
+        stop = 0
+        position = data.find(term)
+
+        # lines can end with "\n", "\r\n" or "\r", the line of a hit starts
+        # after the end of the line of the previous hit
+        while position > -1:
+            start = data.rfind(b"\n", stop, position)
+            start = max(start, data.rfind(b"\r", max(start, stop), position))
+            stop = data.find(b"\n", position + len(term))
+            stop = len(data) if stop < 0 else stop
+            stop_cr = data.find(b"\r", position + len(term), stop)
+            stop = stop if stop_cr < 0 else stop_cr
+
+            lines.append(data[start + 1 : stop].rstrip(_ASCII_WHITESPACES))
+
+            position = data.find(term, stop)
+
+        return lines
+
+    def match_buffer(self, text: str) -> array:
+        """\
+        This method returns the indices of the lines of a buffer containing the
+        search term.
+
+        The buffer is made of lines separated by new line characters. It is
+        searched with repeated `find` and the line of each hit is found by
+        counting the new line characters since the previous hit.
+
+        The method returns the indices as an `array` of unsigned integers.
+
+        The method returns a `TypeError` if the `text` parameter is not a `str`.
+
+        Parameters
+        ----------
+        text
+            The lines, separated by new line characters, to search in.
+        """
+        if not isinstance(text, str):
+            raise TypeError("The text parameter is not a str.")
+
+        # a search term with a new line would match across the lines
+        if "\n" in self._search_term:
+            return self.match_many(text.split("\n"))
+
+        indices = array("L")
+        index = 0
+        start = 0
+        position = text.find(self._search_term)
+
+        while position > -1:
+            index += text.count("\n", start, position)
+            indices.append(index)
+
+            # the search goes on from the next line
+            start = text.find("\n", position + len(self._search_term))
+            if start < 0:
+                break
+            position = text.find(self._search_term, start)
+
+        return indices
+
+
+class MultiMatcher:
+    """\
+    Class to search for several terms in a string at once.
+
+    The terms are compiled into an Aho-Corasick automaton, so a string is read
+    once whatever the number of terms.
+    """
+
+    _search_terms: List[str]
+    _goto: List[Dict[str, int]]
+    _fail: List[int]
+    _output: List[List[int]]
+
+    def __init__(self, search_terms: List[str]) -> None:
+        """\
+        Constructor of the MultiMatcher class.
+
+        The constructor raises a `TypeError` if the `search_terms` parameter is
+        not a `list` or if one of its elements is not a `str`.
+
+        The constructor raises a `ValueError` if the `search_terms` parameter is
+        an empty `list` or if one of its elements is an empty `str` or contains
+        spaces.
+
+        Parameters
+        ----------
+        search_terms
+            The terms to search. The duplicated terms are ignored.
+        """
+        if not isinstance(search_terms, list):
+            raise TypeError(
+                f"The search_terms parameter is of type: {type(search_terms)}. "
+                "The search_terms parameter should be a list of str."
+            )
+
+        if len(search_terms) == 0:
+            raise ValueError("The search_terms parameter is an empty list.")
+
+        # each term is checked like the Matcher does
+        self._search_terms = list(
+            dict.fromkeys(Matcher(term).search_term for term in search_terms)
+        )
+
+        self._build_automaton()
+
+    @property
+    def search_terms(self):
+        """Getter for search terms."""
+        return self._search_terms
+
+    def _build_automaton(self) -> None:
+        """Builds the goto, fail and output functions of the automaton."""
+        self._goto = [{}]
+        self._output = [[]]
+
+        # the trie of the terms
+        for index, term in enumerate(self._search_terms):
+            state = 0
+            for character in term:
+                if character not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append([])
+                    self._goto[state][character] = len(self._goto) - 1
+                state = self._goto[state][character]
+            self._output[state].append(index)
+
+        # the failure links are computed breadth first
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and character not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(character, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def match(self, line: str) -> List[str]:
+        """
+        This method returns the search terms that are substrings of the line,
+        in the order of the `search_terms` parameter.
+
+        The method returns a `TypeError` the `line` parameter is not a `str`.
+
+        Parameters
+        ----------
+        line
+            The string to search in.
+        """
+        if not isinstance(line, str):
+            raise TypeError("The line parameter is not a str.")
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+
+        for character in line:
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return [self._search_terms[index] for index in sorted(found)]
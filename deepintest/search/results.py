@@ -0,0 +1,211 @@
+"""
+Module to keep the results of the searches on disk.
+"""
+
+import json
+from hashlib import sha256
+from os import getpid, makedirs, remove, replace, scandir, stat, utime
+from os.path import join
+from typing import Optional
+
+from deepintest._typing import Chars
+
+from .characters import CharacterSet
+
+# changed when the format of the entries changes, so old entries are missed
+_VERSION = 1
+
+
+class ResultCache:
+    """\
+    Class keeping the results of the searches in a directory, so searching an
+    unchanged file again doesn't read it.
+
+    A result is stored under a key made of the identity of the file (device,
+    inode, size and modification time in nanoseconds), the search term and
+    the characters kept by the cleaner (see `CharacterSet.normalize`). A file
+    that changes gets another key, so its old results are never served.
+
+    Each entry is a file named after the hash of its key, holding its key and
+    the size of the result before the result. The key and the size are checked
+    before the result is returned, so a collision or a corrupted entry is a
+    miss. The entries are written to a temporary file then renamed, so several
+    processes can share the directory.
+
+    When the entries hold more than `max_size` bytes, the least recently used
+    ones are removed.
+    """
+
+    _directory: str
+    _max_size: int
+
+    def __init__(self, directory: str, max_size: int = int(1e8)) -> None:
+        """\
+        Constructor of the ResultCache class, the directory is created if it
+        doesn't exist.
+
+        The constructor raises a `ValueError` if `max_size` is not a positive
+        `int`, and an `OSError` if the directory can't be created.
+
+        Parameters
+        ----------
+        directory
+            The path of the directory holding the entries.
+        max_size
+            The maximum size of the entries in bytes.
+        """
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError(f"max size {max_size} is not a positive int.")
+
+        makedirs(directory, exist_ok=True)
+
+        self._directory = directory
+        self._max_size = max_size
+
+    @property
+    def directory(self) -> str:
+        """Getter for _directory."""
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        """Getter for _max_size."""
+        return self._max_size
+
+    @staticmethod
+    def get_key(path: str, search_term: str, characters: Chars) -> str:
+        """\
+        Returns the key of the result of a search of a file.
+
+        The method raises an `OSError` if the status of the file can't be read
+        and a `TypeError` if the `characters` parameter is not valid.
+
+        Parameters
+        ----------
+        path
+            The path of the file searched.
+        search_term
+            The term searched.
+        characters
+            The characters kept by the cleaner.
+        """
+        status = stat(path)
+
+        return json.dumps(
+            [
+                _VERSION,
+                status.st_dev,
+                status.st_ino,
+                status.st_size,
+                status.st_mtime_ns,
+                search_term,
+                CharacterSet.normalize(characters),
+            ]
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """\
+        Returns the result stored under a key, or `None` if there is no valid
+        entry for the key.
+
+        Parameters
+        ----------
+        key
+            A key returned by `get_key`.
+        """
+        path = self._get_entry_path(key)
+
+        try:
+            with open(path, "rb") as file_obj:
+                header = json.loads(file_obj.readline())
+                data = file_obj.read()
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(header, dict):
+            return None
+
+        if header.get("key") != key or header.get("size") != len(data):
+            self._remove(path)
+            return None
+
+        # the modification time orders the entries from the least recently used
+        try:
+            utime(path)
+        except OSError:
+            pass
+
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """\
+        Stores a result under a key, then removes the least recently used
+        entries if the entries exceed `max_size`. A result larger than
+        `max_size` is not stored.
+
+        The method raises an `OSError` if the entry can't be written.
+
+        Parameters
+        ----------
+        key
+            A key returned by `get_key`.
+        data
+            The result.
+        """
+        header = json.dumps({"key": key, "size": len(data)}).encode("utf-8") + b"\n"
+
+        if len(header) + len(data) > self._max_size:
+            return
+
+        path = self._get_entry_path(key)
+        tmp_path = f"{path}.{getpid()}.tmp"
+
+        with open(tmp_path, "wb") as file_obj:
+            file_obj.write(header)
+            file_obj.write(data)
+
+        replace(tmp_path, path)
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes all the entries."""
+        for entry in self._iter_entries():
+            self._remove(entry.path)
+
+    def _get_entry_path(self, key: str) -> str:
+        """Returns the path of the entry of a key."""
+        return join(self._directory, sha256(key.encode("utf-8")).hexdigest())
+
+    def _iter_entries(self):
+        """Yields the entries of the directory (without the temporary files)."""
+        with scandir(self._directory) as entries:
+            for entry in entries:
+                if len(entry.name) == 64 and entry.is_file():
+                    yield entry
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries exceeding `max_size`."""
+        entries = []
+
+        for entry in self._iter_entries():
+            try:
+                status = entry.stat()
+            except OSError:
+                continue
+            entries.append((status.st_mtime_ns, status.st_size, entry.path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+
+        for _, entry_size, path in sorted(entries):
+            if size <= self._max_size:
+                break
+            self._remove(path)
+            size -= entry_size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Removes an entry, which may have been removed by another process."""
+        try:
+            remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,222 @@
+"""
+Module to search for a term in a memory-mapped file.
+"""
+
+from codecs import getincrementaldecoder
+from mmap import ACCESS_READ, mmap
+from typing import Iterator, Optional
+
+from deepintest._typing import Buffer
+from deepintest.io.reader import (
+    CompressedFileError,
+    TextFileReader,
+    detect_compression,
+)
+
+from .matcher import Matcher
+
+
+class MappedScanner:
+    """\
+    Class to search for a term in a memory-mapped file.
+
+    The search term is encoded once, then the file is scanned at the byte level
+    with `find`. The line boundaries are only computed around the hits, so only
+    the matched lines are decoded. When the file is validated, the bytes
+    between the matched lines are checked as the scan reaches them (the ASCII
+    blocks are skipped), and the matched lines are checked by decoding them.
+    """
+
+    _search_term: str
+    _encoded_term: bytes
+    _reader: TextFileReader
+    _validate: bool
+    _validation_block_size: int = 1 << 20
+
+    def __init__(
+        self, search_term: str, reader: TextFileReader = None, validate: bool = True
+    ) -> None:
+        """\
+        Constructor of the MappedScanner class.
+
+        The constructor raises the same errors as the `Matcher` constructor if
+        the `search_term` parameter is not valid.
+
+        Parameters
+        ----------
+        search_term
+            The term to search.
+        reader
+            The `TextFileReader` used to check the files and to get their
+            encoding. A default `TextFileReader` is used if not provided.
+        validate
+            If `True`, the whole file is checked to be properly encoded (and not
+            only the matched lines) so the scanner raises the same errors as
+            `TextFileReader`. The bytes are checked lazily, in order, so the
+            `UnicodeError` is raised when the faulty line is reached, like
+            `TextFileReader.iter_lines` does.
+        """
+        self._search_term = Matcher(search_term=search_term).search_term
+        self._reader = reader if reader is not None else TextFileReader()
+        self._encoded_term = self._search_term.encode(self._reader.encoding)
+        self._validate = validate
+
+    @property
+    def search_term(self):
+        """Getter for search term."""
+        return self._search_term
+
+    def scan(
+        self, path: str, end: Optional[int] = None, start: int = 0
+    ) -> Iterator[str]:
+        """\
+        Searches the lines of a file containing the search term.
+
+        The method is a generator yielding the matched lines (without the
+        trailing whitespaces) in the same order as in the file.
+
+        The method raises the same errors as `TextFileReader.read`, and a
+        `CompressedFileError` (a `ValueError`) if the file is compressed (it
+        can't be memory-mapped).
+
+        Parameters
+        ----------
+        path
+            The path of the file to search in.
+        end
+            The byte offset where to stop searching (the byte at `end` is not
+            read). For example, the offset returned by
+            `TextFileReader.read_last_line`.
+        start
+            The byte offset where to start searching. It should be the start of
+            a line, for example one of the offsets returned by
+            `TextFileReader.split`.
+        """
+        self._reader.check(path)
+
+        with open(path, "rb") as file_obj:
+            size = file_obj.seek(0, 2)
+            end = size if end is None else min(end, size)
+
+            # empty files can't be mapped
+            if end <= start:
+                return
+
+            with mmap(file_obj.fileno(), 0, access=ACCESS_READ) as data:
+                if detect_compression(data[:6]) is not None:
+                    raise CompressedFileError(
+                        f"{path} is compressed, it can't be mapped."
+                    )
+
+                yield from self._scan(path, data, end, start, self._validate)
+
+    def scan_buffer(
+        self, path: str, data: Buffer, end: Optional[int] = None, start: int = 0
+    ) -> Iterator[str]:
+        """\
+        Searches the lines of a file already in memory (or memory-mapped)
+        containing the search term.
+
+        The method is a generator yielding the matched lines like `scan`, but
+        the file is neither checked nor validated, only the matched lines are
+        decoded. It allows to search the same mapping many times.
+
+        The method raises an `UnicodeError` if a matched line can't be decoded.
+
+        Parameters
+        ----------
+        path
+            The path of the file, only used in the error messages.
+        data
+            The content of the file, as `bytes` or a `mmap`.
+        end
+            The byte offset where to stop searching.
+        start
+            The byte offset where to start searching, it should be the start of
+            a line.
+        """
+        end = len(data) if end is None else min(end, len(data))
+        yield from self._scan(path, data, end, start, False)
+
+    def check_encoding(
+        self, path: str, data: Buffer, start: int = 0, end: Optional[int] = None
+    ) -> None:
+        """\
+        Checks that the bytes of a file in memory (or memory-mapped) can be
+        decoded.
+
+        The bytes are decoded by blocks which are not kept, and the ASCII blocks
+        are skipped.
+
+        The method raises an `UnicodeError` if the bytes from `start` to `end`
+        can't be decoded.
+
+        Parameters
+        ----------
+        path
+            The path of the file, only used in the error messages.
+        data
+            The content of the file, as `bytes` or a `mmap`.
+        start
+            The byte offset where to start checking.
+        end
+            The byte offset where to stop checking.
+        """
+        end = len(data) if end is None else min(end, len(data))
+        decoder = getincrementaldecoder(self._reader.encoding)(errors="strict")
+
+        try:
+            for first in range(start, end, self._validation_block_size):
+                block = data[first : min(first + self._validation_block_size, end)]
+
+                if not block.isascii() or decoder.getstate()[0]:
+                    decoder.decode(block)
+
+            # raises an error if the bytes end in the middle of a character
+            decoder.decode(b"", True)
+        except UnicodeError as uni_err:
+            raise UnicodeError(
+                f"{path} is not encoded with {self._reader.encoding}."
+            ) from uni_err
+
+    def _scan(
+        self, path: str, data: Buffer, end: int, start: int, validate: bool
+    ) -> Iterator[str]:
+        """\
+        Yields the matched lines between `start` and `end`, see `scan_buffer`.
+        If `validate` is `True`, the bytes that are not matched are checked too.
+        """
+        position = data.find(self._encoded_term, start, end)
+        checked = start
+
+        while position > -1:
+            after = position + len(self._encoded_term)
+
+            # lines can end with "\n", "\r\n" or "\r", the line starts after
+            # the end of the previous matched line
+            line_start = max(
+                data.rfind(b"\n", checked, position),
+                data.rfind(b"\r", checked, position),
+                start - 1,
+            )
+            # a "\r" ending the line is before the next "\n"
+            stop = self._find_or_end(data, b"\n", after, end)
+            stop = self._find_or_end(data, b"\r", after, stop)
+
+            # the bytes between the matched lines are checked before them
+            if validate and checked <= line_start:
+                self.check_encoding(path, data, checked, line_start + 1)
+            checked = stop
+
+            yield self._reader.decode(data[line_start + 1 : stop], path).rstrip()
+
+            position = data.find(self._encoded_term, stop, end)
+
+        if validate and checked < end:
+            self.check_encoding(path, data, checked, end)
+
+    @staticmethod
+    def _find_or_end(data: Buffer, sub: bytes, start: int, end: int) -> int:
+        """Returns the position of `sub` after `start`, or `end` if not found."""
+        position = data.find(sub, start, end)
+        return end if position < 0 else position
@@ -0,0 +1,165 @@
+"""
+Testing module for the deepingtest.search.bloom module.
+"""
+
+import gzip
+import json
+import random
+
+import pytest
+
+from deepintest.io.reader import TextFileReader
+from ..bloom import BlockFilter
+from ..matcher import Matcher
+
+WORDS = ["the", "lazy", "dog", "été", "garçon", "ab", "x", "a\tb"]
+
+
+@pytest.fixture(name="text_file")
+def fixture_text_file(tmp_path):
+    """
+    Returns the path of a file of random lines, with all the line endings,
+    and of rare words found in a single line.
+    """
+    rand = random.Random(0)
+    lines = [" ".join(rand.choices(WORDS, k=rand.randint(0, 8))) for _ in range(2000)]
+    endings = rand.choices(["\n", "\r\n", "\r"], k=len(lines))
+    lines[1000] = "the rare zyzzyva ÆØÅ"
+    text = "".join(line + ending for line, ending in zip(lines, endings))
+    path = tmp_path / "file.txt"
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def _search(path, ranges, search_term):
+    """Returns the lines of the ranges of a file containing a term."""
+    reader = TextFileReader()
+    matcher = Matcher(search_term)
+    return [
+        line
+        for start, end in ranges
+        for line in reader.iter_lines(path, end=end, start=start)
+        if matcher.match(line)
+    ]
+
+
+class TestBlockFilter:
+    """
+    Testing class for the BlockFilter class.
+    """
+
+    def test_init_fails_when_parameter_is_wrong(self, text_file):
+        """
+        Tests if the constructor returns a `ValueError` if the block size or the
+        error rate are not valid.
+        """
+        for block_size in [0, -1, 1.5, "1"]:
+            with pytest.raises(ValueError):
+                BlockFilter(text_file, block_size=block_size)
+        for error_rate in [0.0, 1.0, 1, "0.1"]:
+            with pytest.raises(ValueError):
+                BlockFilter(text_file, error_rate=error_rate)
+
+    def test_init_sets_filter_path(self, text_file):
+        """Tests if the sidecar path is the file path followed by .bloom."""
+        assert BlockFilter(text_file).filter_path == f"{text_file}.bloom"
+        assert BlockFilter(text_file, "other").filter_path == "other"
+
+    def test_get_ranges_keeps_blocks_with_term(self, text_file):
+        """
+        Tests if the lines of the ranges returned by get_ranges containing a
+        term are the lines of the file containing it, and if the blocks without
+        a rare term are skipped.
+        """
+        block_filter = BlockFilter(text_file, block_size=1000)
+        blocks = block_filter.build()
+        assert blocks > 10
+        lines = TextFileReader().read(text_file)
+
+        for term in WORDS + ["zyzzyva", "ÆØÅ", "rare", "e", "azy", "zzz", "ÅÆ"]:
+            matcher = Matcher(term)
+            ranges, count = block_filter.get_ranges(term)
+            assert count == blocks
+            assert _search(text_file, ranges, term) == [
+                line for line in lines if matcher.match(line)
+            ]
+
+        assert len(block_filter.get_ranges("zyzzyva")[0]) < 3
+        assert len(block_filter.get_ranges("e")[0]) == blocks
+
+    def test_get_ranges_stops_at_end(self, text_file):
+        """
+        Tests if get_ranges only returns and counts the blocks before end, and
+        cuts the last range at end.
+        """
+        block_filter = BlockFilter(text_file, block_size=1000)
+        block_filter.build()
+        end = TextFileReader().read_last_line(text_file)[1]
+
+        ranges, count = block_filter.get_ranges("the", end=end)
+        assert ranges[-1][1] == end
+        assert count == len(ranges)
+        assert block_filter.get_ranges("the", end=0) == ([], 0)
+
+    def test_get_ranges_empty_file(self, tmp_path):
+        """Tests if an empty file has no block."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        block_filter = BlockFilter(str(path))
+        assert block_filter.build() == 0
+        assert block_filter.get_ranges("abc") == ([], 0)
+
+    def test_get_ranges_fails_when_file_changed(self, text_file):
+        """
+        Tests if get_ranges returns a `FileNotFoundError` without sidecar and a
+        `ValueError` if the sidecar isn't valid (including its header) or if the
+        file changed.
+        """
+        block_filter = BlockFilter(text_file)
+
+        with pytest.raises(FileNotFoundError):
+            block_filter.get_ranges("abc")
+
+        with open(block_filter.filter_path, "wb") as file_obj:
+            file_obj.write(b"not a sidecar\n")
+        with pytest.raises(ValueError):
+            BlockFilter(text_file).get_ranges("abc")
+
+        # headers missing keys or with invalid blocks
+        block_filter.build()
+        with open(block_filter.filter_path, "rb") as file_obj:
+            magic = file_obj.readline()
+            header = json.loads(file_obj.readline())
+        for update in [None, {"blocks": None}, {"blocks": [[0, 1]]}, {"blocks": 1}]:
+            new_header = {} if update is None else {**header, **update}
+            with open(block_filter.filter_path, "wb") as file_obj:
+                file_obj.write(magic + json.dumps(new_header).encode() + b"\n")
+            with pytest.raises(ValueError):
+                BlockFilter(text_file).get_ranges("abc")
+
+        block_filter.build()
+        with open(text_file, "ab") as file_obj:
+            file_obj.write(b"zyzzyva\n")
+        with pytest.raises(ValueError):
+            block_filter.get_ranges("abc")
+
+    def test_build_fails_when_file_not_valid(self, tmp_path, unsupported_encoding):
+        """
+        Tests if build returns the same errors as TextFileReader.read, and a
+        `ValueError` if the file is compressed.
+        """
+        path = tmp_path / "file.txt"
+
+        with pytest.raises(FileNotFoundError):
+            BlockFilter(str(path)).build()
+
+        path.write_bytes("abc\nété\n".encode(unsupported_encoding))
+        with pytest.raises(UnicodeError):
+            BlockFilter(str(path)).build()
+
+        with pytest.raises(MemoryError):
+            BlockFilter(str(path), reader=TextFileReader(max_size=1)).build()
+
+        path.write_bytes(gzip.compress(b"abc\nabc\n"))
+        with pytest.raises(ValueError):
+            BlockFilter(str(path)).build()
@@ -0,0 +1,103 @@
+"""
+Testing module for the deepingtest.search.cache module.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from deepintest._conf import default_characters
+from ..cache import (
+    CACHE_SIZE,
+    clear_cache,
+    get_cache_info,
+    get_character_set,
+    get_cleaner,
+)
+from ..characters import BitmapCharacterSet, CharacterSet
+from ..cleaner import Cleaner
+
+
+@pytest.fixture(autouse=True, name="empty_cache")
+def fixture_empty_cache():
+    """Empties the caches before and after each test."""
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_get_character_set_returns_shared_character_set():
+    """
+    Tests if get_character_set returns the same character set for the same
+    characters and backend, and counts the hits and the misses.
+    """
+    charset = get_character_set([("a", "c"), "d"])
+    assert isinstance(charset, CharacterSet)
+    assert set(charset) == set("abcd")
+    assert get_character_set([("d", "a")]) is charset
+    assert get_character_set(["a", "b", "c", "d"]) is charset
+    assert isinstance(get_character_set([("a", "d")], "bitmap"), BitmapCharacterSet)
+    assert get_character_set(["a"]) is not charset
+
+    info = get_cache_info()["character_sets"]
+    assert (info.hits, info.misses, info.maxsize) == (2, 3, CACHE_SIZE)
+
+
+def test_get_character_set_fails_when_parameter_is_wrong(not_str_list):
+    """
+    Tests if get_character_set returns a `TypeError` if the characters are not
+    valid and a `ValueError` if the backend is not supported.
+    """
+    for elem in not_str_list:
+        with pytest.raises(TypeError):
+            get_character_set(elem)
+    with pytest.raises(ValueError):
+        get_character_set(["a"], "tree")
+
+
+def test_get_cleaner_returns_shared_cleaner():
+    """
+    Tests if get_cleaner returns the same cleaner for the same parameters, and
+    a cleaner cleaning like a new Cleaner.
+    """
+    line = "a,b  été-ß ,"
+    for engine in ["loop", "translate", "regex"]:
+        for delimiter in [" ", ","]:
+            cleaner = get_cleaner(None, delimiter, engine)
+            assert get_cleaner(default_characters, delimiter, engine) is cleaner
+            assert cleaner.engine == engine
+            expected = Cleaner(delimiter=delimiter, engine=engine).clean_line(line)
+            assert cleaner.clean_line(line) == expected
+
+    info = get_cache_info()["cleaners"]
+    assert (info.hits, info.misses, info.currsize) == (6, 6, 6)
+
+
+def test_get_cleaner_fails_when_parameter_is_wrong():
+    """
+    Tests if get_cleaner returns the same errors as the Cleaner constructor and
+    doesn't cache them.
+    """
+    for kwargs in [{"characters": ["ab"]}, {"delimiter": "ab"}]:
+        with pytest.raises(TypeError):
+            get_cleaner(**kwargs)
+    for kwargs in [{"engine": "sed"}, {"backend": "tree"}]:
+        with pytest.raises(ValueError):
+            get_cleaner(**kwargs)
+    assert get_cache_info()["cleaners"].currsize == 0
+
+
+def test_get_cleaner_keeps_last_cleaners():
+    """
+    Tests if get_cleaner keeps at most CACHE_SIZE cleaners, and shares them
+    between threads.
+    """
+    characters = [[chr(code)] for code in range(97, 97 + CACHE_SIZE + 1)]
+    for elem in characters:
+        get_cleaner(elem)
+    assert get_cache_info()["cleaners"].currsize == CACHE_SIZE
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        cleaners = list(executor.map(get_cleaner, characters[1:] * 4))
+    assert cleaners[:CACHE_SIZE] == cleaners[CACHE_SIZE : 2 * CACHE_SIZE]
+    assert get_cache_info()["cleaners"].misses == CACHE_SIZE + 1
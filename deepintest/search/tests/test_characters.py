@@ -2,10 +2,11 @@
 Testing module for the deepingtest.search.characters module.
 """
 
-
 import pytest
 from ..characters import CharacterRange
 from ..characters import CharacterSet
+from ..characters import IntervalCharacterSet
+from ..characters import BitmapCharacterSet
 
 
 class TestCharacterRange:
@@ -35,6 +36,20 @@ class TestCharacterRange:
             crange = CharacterRange(character_range=char_range)
             assert crange.get_characters() == result
 
+    def test_get_codes_returns_the_sorted_code_points(self):
+        """
+        Tests if CharactersRange.get_codes return the first and the last code
+        points of the range.
+        """
+        tests = [
+            (("A", "C"), (65, 67)),
+            (("z", "w"), (119, 122)),
+            (("a", "a"), (97, 97)),
+        ]
+        for char_range, result in tests:
+            crange = CharacterRange(character_range=char_range)
+            assert crange.get_codes() == result
+
 
 class TestCharacterSet:
     """The test class associated with the CharacterSet class."""
@@ -83,3 +98,186 @@ class TestCharacterSet:
         charset = CharacterSet(characters=[("A", "C")])
         charset.add_character("D")
         assert charset.get_characters() == {"A", "B", "C", "D"}
+
+    def test_get_memory_footprint_grows_with_characters(self):
+        """
+        Tests if CharactersSet.get_memory_footprint grows with the number of
+        characters.
+        """
+        small = CharacterSet(characters=[("A", "C")])
+        large = CharacterSet(characters=[("A", "z")])
+        assert 0 < small.get_memory_footprint() < large.get_memory_footprint()
+
+    def test_get_ranges_returns_merged_ranges(self):
+        """
+        Tests if CharactersSet.get_ranges returns the sorted and merged ranges
+        of code points.
+        """
+        tests = [
+            ([("A", "C"), "D", "z"], [(65, 68), (122, 122)]),
+            (["z", ("c", "a"), ("b", "d")], [(97, 100), (122, 122)]),
+            (["a"], [(97, 97)]),
+        ]
+        for characters, result in tests:
+            charset = CharacterSet(characters=characters)
+            assert charset.get_ranges() == result
+
+    def test_normalize_returns_merged_ranges(self, not_str_list):
+        """
+        Tests if CharactersSet.normalize returns the same ranges as
+        CharacterSet.get_ranges as a tuple, and returns a `TypeError` if the
+        characters parameter is not valid.
+        """
+        tests = [
+            [("A", "C"), "D", "z"],
+            ["z", ("c", "a"), ("b", "d")],
+            [("a", "z"), ("b", "c"), "a"],
+        ]
+        for characters in tests:
+            result = tuple(CharacterSet(characters=characters).get_ranges())
+            assert CharacterSet.normalize(characters) == result
+        for elem in not_str_list + [["ab"], [("a", "b", "c")]]:
+            with pytest.raises(TypeError):
+                CharacterSet.normalize(elem)
+
+
+class TestIntervalCharacterSet:
+    """The test class associated with the IntervalCharacterSet class."""
+
+    def test_constructor_fails_with_wrong_parameter(self):
+        """
+        Tests if IntervalCharactersSet's constructor returns a `TypeError` when
+        the provided parameter is not a list of characters or character ranges.
+        """
+        tests = ["a", 1, {"one": 1}, ("a", ("a", "b")), [1, ("a", "b")], [1, (1, "b")]]
+        for elem in tests:
+            with pytest.raises(TypeError):
+                IntervalCharacterSet(elem)
+
+    def test_get_ranges_returns_merged_ranges(self):
+        """
+        Tests if IntervalCharactersSet.get_ranges returns the sorted and merged
+        ranges of code points.
+        """
+        tests = [
+            ([("A", "C"), "D", "z"], [(65, 68), (122, 122)]),
+            (["z", ("c", "a"), ("b", "d")], [(97, 100), (122, 122)]),
+            ([("\U00010000", "\U0010ffff"), "a"], [(97, 97), (0x10000, 0x10FFFF)]),
+        ]
+        for characters, result in tests:
+            charset = IntervalCharacterSet(characters=characters)
+            assert charset.get_ranges() == result
+
+    def test_contains_behaves_like_character_set(self):
+        """
+        Tests if IntervalCharactersSet and CharacterSet contain the same
+        characters.
+        """
+        characters = [("A", "C"), "E", ("z", "x"), ("À", "Â")]
+        charset = CharacterSet(characters=characters)
+        interval_charset = IntervalCharacterSet(characters=characters)
+        assert interval_charset.get_characters() == charset.get_characters()
+        assert len(interval_charset) == len(charset)
+        for code in range(0x300):
+            assert (chr(code) in interval_charset) == (chr(code) in charset)
+        assert "AB" not in interval_charset
+        assert 65 not in interval_charset
+
+    def test_add_character_fails_with_wrong_parameter(self):
+        """
+        Tests if IntervalCharactersSet.add_character returns a `TypeError` when
+        the provided parameter is not a character.
+        """
+        charset = IntervalCharacterSet(characters=[("A", "C")])
+        tests = [1, 0.5, 0x45, "aa", ["a", 5], ("ab", "cd"), {"one": 1}]
+        for elem in tests:
+            with pytest.raises(TypeError):
+                charset.add_character(elem)
+
+    def test_add_character_merges_the_ranges(self):
+        """
+        Tests if IntervalCharactersSet.add_character adds the character and
+        merges the adjacent ranges.
+        """
+        charset = IntervalCharacterSet(characters=[("A", "C"), ("E", "F"), "Z"])
+        charset.add_character("D")
+        charset.add_character("X")
+        charset.add_character("B")
+        assert charset.get_ranges() == [(65, 70), (88, 88), (90, 90)]
+        charset.add_character("Y")
+        assert charset.get_ranges() == [(65, 70), (88, 90)]
+        assert list(charset) == list("ABCDEFXYZ")
+
+
+class TestBitmapCharacterSet:
+    """The test class associated with the BitmapCharacterSet class."""
+
+    def test_constructor_fails_with_wrong_parameter(self):
+        """
+        Tests if BitmapCharactersSet's constructor returns a `TypeError` when
+        the provided parameter is not a list of characters or character ranges.
+        """
+        tests = ["a", 1, {"one": 1}, ("a", ("a", "b")), [1, ("a", "b")], [1, (1, "b")]]
+        for elem in tests:
+            with pytest.raises(TypeError):
+                BitmapCharacterSet(elem)
+
+    def test_contains_behaves_like_character_set(self):
+        """
+        Tests if BitmapCharactersSet and CharacterSet contain the same
+        characters.
+        """
+        characters = [("A", "C"), "E", ("z", "x"), ("À", "Â"), ("\x00", "\x0f")]
+        charset = CharacterSet(characters=characters)
+        bitmap_charset = BitmapCharacterSet(characters=characters)
+        assert bitmap_charset.get_characters() == charset.get_characters()
+        assert bitmap_charset.get_ranges() == charset.get_ranges()
+        assert len(bitmap_charset) == len(charset)
+        for code in range(0x300):
+            assert (chr(code) in bitmap_charset) == (chr(code) in charset)
+        assert "AB" not in bitmap_charset
+        assert 65 not in bitmap_charset
+
+    def test_get_ranges_returns_merged_ranges(self):
+        """
+        Tests if BitmapCharactersSet.get_ranges returns the same ranges as
+        CharacterSet.get_ranges, whether the ranges start and end on the bounds
+        of the bytes of the bitmap or inside them.
+        """
+        tests = [
+            [],
+            [("\x00", "\U0010ffff")],
+            ["\x00", "\x02", ("\x04", "\x07"), ("\x08", "\x0f"), ("\x11", "\x1e")],
+            [("\x07", "\x18"), ("\x1a", "\x1a"), ("\x20", "\x27")],
+            [("A", "C"), "E", ("z", "x"), ("À", "Â"), ("\u4e00", "\u9fff")],
+            [chr(code) for code in range(0, 0x300, 2)],
+            ["\U0010ffff", ("\U0010fff0", "\U0010fffd")],
+        ]
+        for characters in tests:
+            result = CharacterSet(characters=characters).get_ranges()
+            assert BitmapCharacterSet(characters=characters).get_ranges() == result
+
+    def test_add_character_adds_the_character(self):
+        """
+        Tests if BitmapCharactersSet.add_character add the character to the set
+        of supported characters.
+        """
+        charset = BitmapCharacterSet(characters=[("A", "C")])
+        charset.add_character("D")
+        charset.add_character("\U0010ffff")
+        assert charset.get_characters() == {"A", "B", "C", "D", "\U0010ffff"}
+        with pytest.raises(TypeError):
+            charset.add_character("aa")
+
+    def test_buffer_and_memory_footprint_have_constant_size(self):
+        """
+        Tests if the bitmap has the same size whatever the number of
+        characters, and if the buffer shares the bitmap.
+        """
+        small = BitmapCharacterSet(characters=["a"])
+        large = BitmapCharacterSet(characters=[("\x00", "\U0010ffff")])
+        assert small.buffer.nbytes == large.buffer.nbytes == 0x110000 // 8
+        assert small.get_memory_footprint() == large.get_memory_footprint()
+        assert len(large) == 0x110000
+        small.add_character("b")
+        assert small.buffer[ord("b") >> 3] & (1 << (ord("b") & 7))
@@ -2,8 +2,11 @@
 Testing module for the deepingtest.search.cleaner module.
 """
 
+import random
+import sys
 
 import pytest
+from deepintest._conf import solution_characters
 from ..cleaner import Cleaner
 
 
@@ -53,3 +56,171 @@ class TestCleaner:
         ]
         for line, result in tests:
             assert cleaner.clean_line(line) == result
+
+    def test_constructor_with_wrong_engine_parameter_fails(self):
+        """
+        Tests if constructor returns a `ValueError` when the provided engine is
+        not supported.
+        """
+        for elem in ["", "Loop", "numpy-like"]:
+            with pytest.raises(ValueError):
+                Cleaner(engine=elem)
+
+    def test_constructor_with_wrong_backend_parameter_fails(self):
+        """
+        Tests if constructor returns a `ValueError` when the provided backend is
+        not supported.
+        """
+        for elem in ["", "Set", "tree"]:
+            with pytest.raises(ValueError):
+                Cleaner(backend=elem)
+
+    def test_clean_line_returns_same_result_with_all_backends(self):
+        """
+        Tests if Cleaner.clean_line returns the same str whatever the backend
+        is.
+        """
+        line = """===--le-!!!**manège:*&""$":enchanté 😀 \\ ."""
+        for engine in ["loop", "translate", "regex"]:
+            results = {
+                Cleaner(engine=engine, backend=backend).clean_line(line)
+                for backend in ["set", "interval", "bitmap"]
+            }
+            assert results == {"le manège enchanté"}
+
+    def test_clean_line_returns_same_result_with_all_engines(self):
+        """
+        Tests if Cleaner.clean_line returns the same str whatever the engine
+        is, including with delimiters that are special characters for the re
+        module.
+        """
+        lines = [
+            """908^)-234 923this-++-23is./<.";][}"another-=&^5""",
+            """::the ^----;:[]}< <!!<**& little:lazy $$$~~~)))dog""",
+            """===--le-!!!**manège:*&""$":enchanté  \\ .""",
+            "",
+            "$$$",
+        ]
+        for delimiter in [" ", ":", ".", "\\", "]", "^"]:
+            cleaners = [
+                Cleaner(delimiter=delimiter, engine=engine)
+                for engine in ["loop", "translate", "regex"]
+            ]
+            for line in lines:
+                results = {cleaner.clean_line(line) for cleaner in cleaners}
+                assert len(results) == 1
+
+    def test_clean_line_with_loop_engine_returns_previous_result(self):
+        """
+        Tests if Cleaner.clean_line with the loop engine and the default
+        delimiter returns the same str as before the delimiter was escaped and
+        the end of the line matched with `\\Z`.
+        """
+        tests = [
+            ("", ""),
+            (" ", ""),
+            ("   ", ""),
+            ("a", "a"),
+            (" a ", "a"),
+            ("  a  b  ", "a b"),
+            ("a\tb", "a b"),
+            ("a\nb", "a b"),
+            ("a \n", "a"),
+            ("a b\n", "a b"),
+            ("\na\n", "a"),
+            ("été garçon", "été garçon"),
+            ("a-b_c", "a b c"),
+            ("#hash# tag#", "hash tag"),
+            ("ÆØ  å", "ÆØ å"),
+            ("a\r\n", "a"),
+            ("日本 語", ""),
+            ("x  \t y ", "x y"),
+            ("a$b", "a b"),
+            (".*+?", ""),
+            ("a\\b", "a b"),
+        ]
+        for characters in [None, solution_characters]:
+            cleaner = Cleaner(characters=characters, engine="loop")
+            for line, result in tests:
+                assert cleaner.clean_line(line) == result
+
+        # with "\n" kept, the delimiters before it are kept too, as with the other
+        # engines, where `$` used to strip them
+        cleaner = Cleaner(characters=[("a", "z"), "\n"], engine="loop")
+        assert cleaner.clean_line("a \n") == "a \n"
+
+    def test_clean_lines_returns_same_result_as_clean_line(self):
+        """
+        Tests if Cleaner.clean_lines returns the str returned by clean_line for
+        each line, and a `TypeError` if a line is not a str.
+        """
+        lines = ["the ^---- lazy $$$dog", "", "le-!!!manège"]
+        for engine in ["loop", "translate", "regex"]:
+            cleaner = Cleaner(engine=engine)
+            assert cleaner.clean_lines(lines) == list(map(cleaner.clean_line, lines))
+            assert cleaner.clean_lines([]) == []
+            with pytest.raises(TypeError):
+                cleaner.clean_lines(["abc", 1])
+
+    def test_clean_byte_lines_returns_same_result_as_clean_line(self):
+        """
+        Tests if Cleaner.clean_byte_lines returns the str returned by clean_line
+        encoded in UTF-8, for ASCII lines or not, whatever the delimiter and the
+        supported whitespaces, and a `TypeError` if a line is not bytes.
+        """
+        rand = random.Random(0)
+        characters = "ab :.\\!é\t\r\x0b\x1c"
+        lines = [
+            "".join(rand.choices(characters, k=rand.randint(0, 12)))
+            for _ in range(1000)
+        ]
+
+        for delimiter in [" ", ":", "\\", "é"]:
+            for supported in [None, [("a", "z"), "\t"], [("\t", "\r"), "a"]]:
+                cleaner = Cleaner(supported, delimiter=delimiter, engine="regex")
+                assert cleaner.clean_byte_lines([line.encode() for line in lines]) == [
+                    cleaner.clean_line(line).encode() for line in lines
+                ]
+
+        with pytest.raises(TypeError):
+            Cleaner().clean_byte_lines([b"abc", "abc"])
+
+    def test_numpy_engine_returns_same_result(self):
+        """
+        Tests if the numpy engine returns the same str as the other engines, for
+        random lines with all kinds of characters, many lines at once or not.
+        """
+        pytest.importorskip("numpy")
+        rand = random.Random(0)
+        characters = "ab :.\\!é😀\t\ud800\U0010ffff"
+
+        for delimiter in [" ", ":", "\\", "😀"]:
+            for backend in ["set", "interval", "bitmap"]:
+                cleaner = Cleaner(delimiter=delimiter, engine="numpy", backend=backend)
+                expected = Cleaner(delimiter=delimiter, engine="translate")
+                lines = [
+                    "".join(rand.choices(characters, k=rand.randint(0, 12)))
+                    for _ in range(1000)
+                ]
+                assert cleaner.clean_lines(lines) == [
+                    expected.clean_line(line) for line in lines
+                ]
+                for line in lines[:50]:
+                    assert cleaner.clean_line(line) == expected.clean_line(line)
+
+        cleaner = Cleaner(engine="numpy")
+        assert cleaner.clean_lines([]) == []
+        assert cleaner.clean_lines(["", "$$"]) == ["", ""]
+        with pytest.raises(TypeError):
+            cleaner.clean_line(1)
+        with pytest.raises(TypeError):
+            cleaner.clean_lines(["abc", None])
+
+    def test_numpy_engine_fails_without_numpy(self, monkeypatch):
+        """
+        Tests if the constructor returns an `ImportError` with the numpy engine
+        when NumPy can't be imported.
+        """
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        with pytest.raises(ImportError):
+            Cleaner(engine="numpy")
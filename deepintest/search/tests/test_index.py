@@ -0,0 +1,194 @@
+"""
+Testing module for the deepingtest.search.index module.
+"""
+
+import gzip
+import os
+import random
+
+import pytest
+
+from deepintest.io.reader import TextFileReader
+from ..index import TrigramIndex, _decode_deltas, _encode_deltas
+from ..matcher import Matcher
+
+WORDS = ["the", "lazy", "dog", "été", "garçon", "ab", "abc", "x", "a\tb", "ÆØ"]
+
+
+@pytest.fixture(name="text_file")
+def fixture_text_file(tmp_path):
+    """
+    Returns the path of a file of random lines, with all the line endings,
+    blank lines, trailing whitespaces and without a final line ending.
+    """
+    rand = random.Random(0)
+    lines = [" ".join(rand.choices(WORDS, k=rand.randint(0, 8))) for _ in range(500)]
+    endings = rand.choices(["\n", "\r\n", "\r", " \n", "\t\r\n"], k=len(lines))
+    text = "".join(line + ending for line, ending in zip(lines, endings))
+    path = tmp_path / "file.txt"
+    path.write_bytes(text.encode("utf-8") + "garçon abc".encode("utf-8"))
+    return str(path)
+
+
+def test_deltas_round_trip():
+    """
+    Tests if the increasing values encoded by _encode_deltas are decoded back,
+    with the smallest type possible.
+    """
+    tests = [
+        ([], "B"),
+        ([0, 1, 2, 255], "B"),
+        ([3, 300, 301], "H"),
+        ([0, 70000], "I"),
+        ([1, 1 << 40], "Q"),
+    ]
+    for values, typecode in tests:
+        assert _encode_deltas(values)[0] == typecode
+        assert _decode_deltas(*_encode_deltas(values)) == values
+
+
+class TestTrigramIndex:
+    """
+    Testing class for the TrigramIndex class.
+    """
+
+    def test_init_sets_index_path(self, text_file):
+        """Tests if the index path is the file path followed by .tri by default."""
+        assert TrigramIndex(text_file).index_path == f"{text_file}.tri"
+        assert TrigramIndex(text_file, "other.tri").index_path == "other.tri"
+
+    def test_search_returns_same_lines_as_scan(self, text_file):
+        """
+        Tests if search returns the same lines as a scan of the lines, for terms
+        of any length, found or not.
+        """
+        reader = TextFileReader()
+        trigram_index = TrigramIndex(text_file, reader=reader)
+        lines = reader.read(text_file)
+        assert trigram_index.build() == len(lines)
+
+        terms = WORDS + ["a", "he", "laz", "azy", "été", "garçonabc", "zzz", "b\tc"]
+        for term in terms:
+            matcher = Matcher(term)
+            expected = [line for line in lines if matcher.match(line)]
+            assert trigram_index.search(term) == expected
+
+    def test_build_writes_same_index_by_chunks(self, text_file):
+        """
+        Tests if building the index with the lists of lines of the trigrams
+        flushed every few items writes the same index file.
+        """
+        trigram_index = TrigramIndex(text_file)
+        trigram_index.build()
+        with open(trigram_index.index_path, "rb") as file_obj:
+            expected = file_obj.read()
+
+        for chunk_postings in [1, 7, 1000]:
+            trigram_index = TrigramIndex(text_file, f"{text_file}.{chunk_postings}")
+            # pylint: disable=protected-access
+            trigram_index._chunk_postings = chunk_postings
+            trigram_index.build()
+            with open(trigram_index.index_path, "rb") as file_obj:
+                assert file_obj.read() == expected
+
+    def test_get_candidates_returns_lines_with_trigrams(self, text_file):
+        """
+        Tests if get_candidates returns the lines having all the trigrams of the
+        term, all the lines for a short term and no line for a missing trigram.
+        """
+        reader = TextFileReader()
+        trigram_index = TrigramIndex(text_file, reader=reader)
+        trigram_index.build()
+        lines = reader.read(text_file)
+
+        candidates = trigram_index.get_candidates("abc")
+        assert candidates == [i for i, line in enumerate(lines) if "abc" in line]
+        assert trigram_index.get_candidates("ab") == list(range(len(lines)))
+        assert trigram_index.get_candidates("zzz") == []
+
+    def test_search_empty_file(self, tmp_path):
+        """Tests if the index of an empty file has no line."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        trigram_index = TrigramIndex(str(path))
+        assert trigram_index.build() == 0
+        assert not trigram_index.search("abc")
+        assert not trigram_index.search("a")
+
+    def test_search_fails_when_file_changed(self, text_file):
+        """
+        Tests if search returns a `ValueError` if the file changed since the
+        index was built.
+        """
+        trigram_index = TrigramIndex(text_file)
+        trigram_index.build()
+
+        with open(text_file, "ab") as file_obj:
+            file_obj.write(b"\nabc")
+
+        with pytest.raises(ValueError):
+            trigram_index.search("abc")
+
+        trigram_index.build()
+        assert trigram_index.search("abc")[-1] == "abc"
+
+    def test_search_fails_when_index_not_valid(self, text_file):
+        """
+        Tests if search returns a `FileNotFoundError` if there is no index and
+        a `ValueError` if the index file is not valid.
+        """
+        trigram_index = TrigramIndex(text_file)
+
+        with pytest.raises(FileNotFoundError):
+            trigram_index.search("abc")
+
+        tests = [
+            b"",
+            b"not an index\n",
+            b"deepintest trigram index 1\n[]\n",
+            b'deepintest trigram index 1\n{"size": 0, "lines": 0}\n',
+        ]
+        for content in tests:
+            with open(trigram_index.index_path, "wb") as file_obj:
+                file_obj.write(content)
+            with pytest.raises(ValueError):
+                TrigramIndex(text_file).search("abc")
+
+        trigram_index.build()
+        os.truncate(trigram_index.index_path, 40)
+        with pytest.raises(ValueError):
+            TrigramIndex(text_file).search("abc")
+
+    def test_build_fails_when_file_not_valid(self, tmp_path, unsupported_encoding):
+        """
+        Tests if build returns the same errors as TextFileReader.read, and a
+        `ValueError` if the file is compressed.
+        """
+        path = tmp_path / "file.txt"
+
+        with pytest.raises(FileNotFoundError):
+            TrigramIndex(str(path)).build()
+
+        path.write_bytes("abc\nété\n".encode(unsupported_encoding))
+        with pytest.raises(UnicodeError):
+            TrigramIndex(str(path)).build()
+
+        with pytest.raises(MemoryError):
+            TrigramIndex(str(path), reader=TextFileReader(max_size=1)).build()
+
+        path.write_bytes(gzip.compress(b"abc\nabc\n"))
+        with pytest.raises(ValueError):
+            TrigramIndex(str(path)).build()
+
+    def test_search_fails_when_term_not_valid(self, text_file):
+        """
+        Tests if search returns the same errors as the Matcher constructor.
+        """
+        trigram_index = TrigramIndex(text_file)
+        trigram_index.build()
+
+        with pytest.raises(TypeError):
+            trigram_index.search(1)
+        for term in ["", "a b"]:
+            with pytest.raises(ValueError):
+                trigram_index.search(term)
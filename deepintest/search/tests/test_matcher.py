@@ -2,9 +2,9 @@
 Testing module for the deepingtest.search.matcher module.
 """
 
-
 import pytest
 from ..matcher import Matcher
+from ..matcher import MultiMatcher
 
 
 class TestMatcher:
@@ -51,3 +51,135 @@ class TestMatcher:
         assert matcher.match("ac ab a")
         assert not matcher.match("ac")
         assert not matcher.match("ac a b a")
+
+    def test_match_many_fails_when_lines_are_wrong_type(self):
+        """
+        Tests if Matcher.match_many returns a `TypeError` when the lines
+        parameter is not a list of str.
+        """
+        tests = [1, "a", ["a", 1], [["a"]]]
+        matcher = Matcher("A")
+        for elem in tests:
+            with pytest.raises(TypeError):
+                matcher.match_many(elem)
+
+    def test_match_many_returns_the_matched_indices(self):
+        """
+        Tests if Matcher.match_many returns the indices of the same lines as
+        Matcher.match.
+        """
+        lines = ["ab", "", "ac ab a", "ac", "abab", "a", "b", "xab"]
+        matcher = Matcher("ab")
+        assert list(matcher.match_many(lines)) == [0, 2, 4, 7]
+        assert not list(matcher.match_many([]))
+        assert list(Matcher("a\nb").match_many(["a", "b", "a\nb"])) == [2]
+
+    def test_match_buffer_fails_when_text_is_wrong_type(self):
+        """
+        Tests if Matcher.match_buffer returns a `TypeError` when the text
+        parameter is not a str.
+        """
+        tests = [1, ["a"], b"a"]
+        matcher = Matcher("A")
+        for elem in tests:
+            with pytest.raises(TypeError):
+                matcher.match_buffer(elem)
+
+    def test_match_buffer_returns_the_matched_indices(self):
+        """
+        Tests if Matcher.match_buffer returns the indices of the lines of the
+        buffer containing the search term.
+        """
+        matcher = Matcher("ab")
+        text = "ab\n\nac ab a\nac\nabab\na\nb\nxab"
+        assert list(matcher.match_buffer(text)) == [0, 2, 4, 7]
+        assert not list(matcher.match_buffer("a\nb"))
+
+    def test_match_bytes_fails_when_data_is_wrong_type(self):
+        """
+        Tests if Matcher.match_bytes returns a `TypeError` when the data
+        parameter is not bytes.
+        """
+        tests = [1, ["a"], "a", bytearray(b"a")]
+        matcher = Matcher("A")
+        for elem in tests:
+            with pytest.raises(TypeError):
+                matcher.match_bytes(elem)
+
+    def test_match_bytes_returns_the_matched_lines(self):
+        """
+        Tests if Matcher.match_bytes returns the lines of the buffer matched by
+        Matcher.match_many, without their trailing whitespaces, with all the
+        line endings.
+        """
+        lines = ["ab", "", "ac ab a", "ac", "abab", "a", "b", "xab \t\x1c"]
+        expected = [b"ab", b"ac ab a", b"abab", b"xab"]
+        matcher = Matcher("ab")
+        for ending in ["\n", "\r\n", "\r"]:
+            data = ending.join(lines).encode("utf-8")
+            assert matcher.match_bytes(data) == expected
+            assert matcher.match_bytes(data + ending.encode("utf-8")) == expected
+        assert not matcher.match_bytes(b"")
+        assert not Matcher("a\nb").match_bytes(b"a\nb")
+        assert not Matcher("é").match_bytes(b"e\nabc")
+
+
+class TestMultiMatcher:
+    """The test class associated with the MultiMatcher class."""
+
+    def test_constructor_fails_when_terms_are_wrong_type(self):
+        """
+        Tests if MultiMatcher's constructor returns a `TypeError` when the
+        search_terms parameter is not a list of str.
+        """
+        tests = [1, "a", ("a", "b"), [1], ["a", ["b"]]]
+        for elem in tests:
+            with pytest.raises(TypeError):
+                MultiMatcher(search_terms=elem)
+
+    def test_constructor_fails_when_terms_are_wrong_value(self):
+        """
+        Tests if MultiMatcher's constructor returns a `ValueError` when the
+        search_terms parameter is empty or contains an empty str or a str with
+        spaces.
+        """
+        tests = [[], [""], ["a", " "], ["ab cd", "a"]]
+        for elem in tests:
+            with pytest.raises(ValueError):
+                MultiMatcher(search_terms=elem)
+
+    def test_match_fails_when_line_is_wrong_type(self):
+        """
+        Tests if MultiMatcher.match returns a `TypeError` when the line
+        parameter is not a str.
+        """
+        tests = [1, ["a"], {"one": 1}]
+        matcher = MultiMatcher(["A"])
+        for elem in tests:
+            with pytest.raises(TypeError):
+                matcher.match(elem)
+
+    def test_match_returns_the_proper_value(self):
+        """
+        Tests if MultiMatcher.match returns the terms contained in the line, in
+        the order of the search_terms parameter.
+        """
+        matcher = MultiMatcher(["he", "she", "his", "hers", "é", "she"])
+        assert matcher.search_terms == ["he", "she", "his", "hers", "é"]
+        assert matcher.match("ushers") == ["he", "she", "hers"]
+        assert matcher.match("this été") == ["his", "é"]
+        assert matcher.match("ahishe") == ["he", "she", "his"]
+        assert not matcher.match("h e s")
+
+    def test_match_returns_same_result_as_matcher(self):
+        """
+        Tests if MultiMatcher.match returns the same terms as one Matcher per
+        term.
+        """
+        terms = ["a", "ab", "bab", "abc", "cab", "bc", "c"]
+        lines = ["", "abc", "babcab", "cbacba", "aaaa", "xbabx abc"]
+        matcher = MultiMatcher(terms)
+        matchers = [Matcher(term) for term in terms]
+        for line in lines:
+            expected = [elem.search_term for elem in matchers if elem.match(line)]
+            assert matcher.match(line) == expected
@@ -0,0 +1,147 @@
+"""
+Testing module for the deepingtest.search.results module.
+"""
+
+import json
+import os
+
+import pytest
+
+from deepintest._conf import default_characters
+from ..results import ResultCache
+
+
+@pytest.fixture(name="text_file")
+def fixture_text_file(tmp_path):
+    """Returns the path of a small text file."""
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"a line\nterm\n")
+    return str(path)
+
+
+class TestResultCache:
+    """
+    Testing class for the ResultCache class.
+    """
+
+    def test_init_creates_directory(self, tmp_path):
+        """Tests if the constructor creates the directory of the entries."""
+        directory = str(tmp_path / "a" / "cache")
+        cache = ResultCache(directory, max_size=100)
+        assert os.path.isdir(directory)
+        assert (cache.directory, cache.max_size) == (directory, 100)
+
+    def test_init_fails_when_max_size_not_positive_int(self, tmp_path):
+        """
+        Tests if the constructor returns a `ValueError` if max_size is not a
+        positive int.
+        """
+        for max_size in [0, -1, 1.5, "1"]:
+            with pytest.raises(ValueError):
+                ResultCache(str(tmp_path), max_size=max_size)
+
+    def test_get_key_changes_with_file_term_and_characters(self, text_file):
+        """
+        Tests if get_key returns the same key for the same search and another
+        key when the file, the search term or the characters change.
+        """
+        key = ResultCache.get_key(text_file, "term", default_characters)
+        assert key == ResultCache.get_key(text_file, "term", default_characters)
+        assert key == ResultCache.get_key(
+            text_file, "term", list(reversed(default_characters))
+        )
+        assert key != ResultCache.get_key(text_file, "other", default_characters)
+        assert key != ResultCache.get_key(text_file, "term", ["a"])
+
+        status = os.stat(text_file)
+        os.utime(text_file, ns=(status.st_atime_ns, status.st_mtime_ns + 1))
+        assert key != ResultCache.get_key(text_file, "term", default_characters)
+
+        mtime_key = ResultCache.get_key(text_file, "term", default_characters)
+        with open(text_file, "ab") as file_obj:
+            file_obj.write(b"x")
+        assert mtime_key != ResultCache.get_key(text_file, "term", default_characters)
+
+    def test_get_key_fails_when_file_not_exist(self, tmp_path):
+        """Tests if get_key returns an `OSError` if the file doesn't exist."""
+        with pytest.raises(OSError):
+            ResultCache.get_key(str(tmp_path / "missing"), "term", default_characters)
+
+    def test_put_then_get_returns_data(self, tmp_path, text_file):
+        """Tests if get returns the data stored under a key, or `None`."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        key = ResultCache.get_key(text_file, "term", default_characters)
+        other_key = ResultCache.get_key(text_file, "other", default_characters)
+
+        assert cache.get(key) is None
+        for data in [b"", b"\n", b"a line\n", "é\n".encode("utf-8")]:
+            cache.put(key, data)
+            assert cache.get(key) == data
+        assert cache.get(other_key) is None
+
+    def test_get_validates_entries(self, tmp_path, text_file):
+        """
+        Tests if get returns `None` and removes the entry if its key or its size
+        don't match.
+        """
+        cache = ResultCache(str(tmp_path / "cache"))
+        key = ResultCache.get_key(text_file, "term", default_characters)
+        cache.put(key, b"result\n")
+        (entry,) = os.listdir(cache.directory)
+        entry = os.path.join(cache.directory, entry)
+
+        tests = [
+            json.dumps({"key": "other", "size": 7}).encode("utf-8") + b"\nresult\n",
+            json.dumps({"key": key, "size": 7}).encode("utf-8") + b"\nresu",
+            b"not json\nresult\n",
+            b"[1]\nresult\n",
+        ]
+
+        for content in tests:
+            with open(entry, "wb") as file_obj:
+                file_obj.write(content)
+            assert cache.get(key) is None
+
+        cache.put(key, b"result\n")
+        assert cache.get(key) == b"result\n"
+
+    def test_put_evicts_least_recently_used_entries(self, tmp_path, text_file):
+        """
+        Tests if put removes the least recently used entries when the entries
+        exceed max_size, and doesn't store data larger than max_size.
+        """
+        keys = [
+            ResultCache.get_key(text_file, f"term{i}", default_characters)
+            for i in range(4)
+        ]
+        entry_size = len(json.dumps({"key": keys[0], "size": 100})) + 1 + 100
+        cache = ResultCache(str(tmp_path / "cache"), max_size=3 * entry_size)
+
+        for i, key in enumerate(keys[:3]):
+            cache.put(key, b"x" * 100)
+            # the modification times are set so the order doesn't depend on the
+            # resolution of the clock
+            for name in os.listdir(cache.directory):
+                entry = os.path.join(cache.directory, name)
+                if os.path.getmtime(entry) > i:
+                    os.utime(entry, (i + 1, i + 1))
+
+        # the first entry becomes the most recently used
+        assert cache.get(keys[0]) == b"x" * 100
+        cache.put(keys[3], b"x" * 100)
+
+        assert cache.get(keys[1]) is None
+        for key in [keys[0], keys[2], keys[3]]:
+            assert cache.get(key) == b"x" * 100
+
+        cache.put(keys[1], b"x" * (3 * entry_size))
+        assert cache.get(keys[1]) is None
+
+    def test_clear_removes_entries(self, tmp_path, text_file):
+        """Tests if clear removes all the entries."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        key = ResultCache.get_key(text_file, "term", default_characters)
+        cache.put(key, b"result\n")
+        cache.clear()
+        assert cache.get(key) is None
+        assert os.listdir(cache.directory) == []
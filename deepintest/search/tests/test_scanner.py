@@ -0,0 +1,129 @@
+"""
+Testing module for the deepingtest.search.scanner module.
+"""
+
+import gzip
+import pytest
+from deepintest.io.reader import TextFileReader
+from ..matcher import Matcher
+from ..scanner import MappedScanner
+
+
+class TestMappedScanner:
+    """The test class associated with the MappedScanner class."""
+
+    def test_constructor_fails_when_term_is_wrong(self):
+        """
+        Tests if MappedScanner's constructor returns the same errors as Matcher
+        when the search_term parameter is not valid.
+        """
+        for elem in [1, ["a"], {"one": 1}]:
+            with pytest.raises(TypeError):
+                MappedScanner(search_term=elem)
+        for elem in ["", " ", "ab cd"]:
+            with pytest.raises(ValueError):
+                MappedScanner(search_term=elem)
+
+    def test_scan_returns_the_same_lines_as_matcher(self, tmp_path):
+        """
+        Tests if MappedScanner.scan yields the same lines as Matcher.match over
+        the lines of TextFileReader.iter_lines.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write("ét a\r\nb été \rc\n\nété\nd été".encode("utf-8"))
+        reader = TextFileReader()
+        for term in ["été", "é", "a", "d", "z"]:
+            matcher = Matcher(term)
+            expected = [line for line in reader.iter_lines(path) if matcher.match(line)]
+            assert list(MappedScanner(term).scan(path)) == expected
+
+    def test_scan_stops_at_end(self, tmp_path):
+        """
+        Tests if MappedScanner.scan only searches the bytes before the end
+        parameter.
+        """
+        path = tmp_path / "file"
+        with open(path, "w", encoding="utf-8") as file_obj:
+            file_obj.write("a1\nb\na2\na\n")
+        _, offset = TextFileReader().read_last_line(path)
+        assert list(MappedScanner("a").scan(path, end=offset)) == ["a1", "a2"]
+
+    def test_scan_starts_at_start(self, tmp_path):
+        """
+        Tests if MappedScanner.scan only searches the bytes after the start
+        parameter.
+        """
+        path = tmp_path / "file"
+        with open(path, "w", encoding="utf-8") as file_obj:
+            file_obj.write("a1\nb\na2\na\n")
+        assert list(MappedScanner("a").scan(path, end=8, start=3)) == ["a2"]
+
+    def test_scan_returns_nothing_when_file_is_empty(self, tmp_path):
+        """Tests if MappedScanner.scan yields nothing for an empty file."""
+        path = tmp_path / "file"
+        path.touch()
+        assert not list(MappedScanner("a").scan(path))
+
+    def test_scan_fails_when_file_has_unsupported_encoding(self, tmp_path):
+        """
+        Tests if MappedScanner.scan returns an `UnicodeError` when the file is
+        not properly encoded, even if the faulty bytes are not matched.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write(b"a\n\xff\na\n")
+        with pytest.raises(UnicodeError):
+            list(MappedScanner("a").scan(path))
+        assert list(MappedScanner("a", validate=False).scan(path)) == ["a", "a"]
+
+    def test_scan_validates_file_lazily(self, tmp_path):
+        """
+        Tests if MappedScanner.scan yields the matched lines before the faulty
+        bytes, then returns an `UnicodeError` when they are reached.
+        """
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write("a1\nb\né a2\n".encode("utf-8") + b"\xff\na3\n")
+        lines = MappedScanner("a").scan(path)
+        assert [next(lines), next(lines)] == ["a1", "é a2"]
+        with pytest.raises(UnicodeError):
+            next(lines)
+
+    def test_scan_fails_when_file_is_compressed(self, tmp_path):
+        """
+        Tests if MappedScanner.scan returns a `ValueError` when the file is
+        compressed, it can't be searched at the byte level.
+        """
+        path = tmp_path / "file.gz"
+        path.write_bytes(gzip.compress(b"a\nb\n"))
+        with pytest.raises(ValueError):
+            list(MappedScanner("a").scan(path))
+
+    def test_scan_buffer_returns_the_same_lines_as_scan(self, tmp_path):
+        """
+        Tests if MappedScanner.scan_buffer yields the same lines as
+        MappedScanner.scan when searching the bytes of the file.
+        """
+        data = "ét a\r\nb été \rc\n\nété\nd été".encode("utf-8")
+        path = tmp_path / "file"
+        with open(path, "wb") as file_obj:
+            file_obj.write(data)
+        for term in ["été", "é", "a", "d", "z"]:
+            scanner = MappedScanner(term)
+            for end in [None, 6, len(data) - 7]:
+                expected = list(scanner.scan(path, end=end))
+                assert list(scanner.scan_buffer(path, data, end=end)) == expected
+
+    def test_check_encoding_fails_when_bytes_not_decoded(self):
+        """
+        Tests if MappedScanner.check_encoding returns an `UnicodeError` only if
+        the checked bytes can't be decoded.
+        """
+        scanner = MappedScanner("a")
+        data = "a\né".encode("utf-8")
+        scanner.check_encoding("file", data)
+        scanner.check_encoding("file", data + b"\xff", end=len(data))
+        for elem in [data + b"\xff", data[:-1]]:
+            with pytest.raises(UnicodeError):
+                scanner.check_encoding("file", elem)
@@ -0,0 +1,98 @@
+"""
+Testing module for the deepingtest.aio module.
+"""
+
+import asyncio
+import gzip
+from os.path import dirname, join
+
+import pytest
+
+from ..aio import AsyncSearcher
+
+EXAMPLES_DIR = join(dirname(__file__), "..", "scripts", "tests", "examples")
+
+
+def _read_lines(path):
+    """Returns the lines of a file."""
+    with open(path, encoding="utf-8") as file_obj:
+        return file_obj.read().splitlines()
+
+
+class TestAsyncSearcher:
+    """The test class associated with the AsyncSearcher class."""
+
+    def test_constructor_fails_when_max_concurrency_not_positive_int(self):
+        """
+        Tests if the constructor returns a `ValueError` when max_concurrency is
+        not a positive int.
+        """
+        for elem in [0, -1, "a", 1.5]:
+            with pytest.raises(ValueError):
+                AsyncSearcher(max_concurrency=elem)
+
+    def test_search_returns_same_lines_as_solution(self):
+        """
+        Tests if AsyncSearcher.search yields the same lines as the solution
+        script, with many concurrent searches.
+        """
+        searcher = AsyncSearcher(max_concurrency=3)
+        indices = list(range(1, 6)) * 20
+        paths = [join(EXAMPLES_DIR, f"example{i}.txt") for i in indices]
+
+        async def search_all():
+            return await asyncio.gather(*map(searcher.search_lines, paths))
+
+        results = asyncio.run(search_all())
+
+        for i, lines in zip(indices, results):
+            assert lines == _read_lines(join(EXAMPLES_DIR, f"result{i}.txt"))
+
+    def test_search_with_search_term_searches_all_lines(self, tmp_path):
+        """
+        Tests if AsyncSearcher.search searches all the lines when the search
+        term is provided.
+        """
+        path = tmp_path / "file"
+        with open(path, "w", encoding="utf-8") as file_obj:
+            file_obj.write("a-b\nc\nab\n")
+
+        async def search():
+            return [line async for line in AsyncSearcher().search(path, "a")]
+
+        assert asyncio.run(search()) == ["[a b]", "[ab]"]
+
+    def test_search_fails_when_file_has_no_search_term(self, tmp_path):
+        """
+        Tests if AsyncSearcher.search returns the errors of TextFileReader, or a
+        `ValueError` when the file doesn't have a search term.
+        """
+        searcher = AsyncSearcher()
+        path = tmp_path / "file"
+        with open(path, "w", encoding="utf-8") as file_obj:
+            file_obj.write("term\n\n")
+
+        with pytest.raises(ValueError):
+            asyncio.run(searcher.search_lines(path))
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(searcher.search_lines(tmp_path / "missing"))
+
+    def test_search_decompresses_compressed_files(self, tmp_path):
+        """
+        Tests if AsyncSearcher.search yields the same lines for a compressed
+        file as for the decompressed file, and returns a `MemoryError` when
+        the decompressed content exceeds max_size.
+        """
+        path = join(EXAMPLES_DIR, "example1.txt")
+        compressed_path = tmp_path / "example1.txt.gz"
+        with open(path, "rb") as file_obj:
+            compressed_path.write_bytes(gzip.compress(file_obj.read()))
+
+        lines = asyncio.run(AsyncSearcher().search_lines(compressed_path))
+        assert lines == _read_lines(join(EXAMPLES_DIR, "result1.txt"))
+
+        compressed_path.write_bytes(gzip.compress(b"a tree\n" * 1000 + b"tree\n"))
+        searcher = AsyncSearcher(max_size=1000)
+        with pytest.raises(MemoryError):
+            asyncio.run(searcher.search_lines(compressed_path))
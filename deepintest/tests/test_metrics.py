@@ -0,0 +1,87 @@
+"""
+Testing module for the deepingtest.metrics module.
+"""
+
+import pickle
+
+from ..metrics import Metrics
+
+
+class TestMetrics:
+    """The test class associated with the Metrics class."""
+
+    def test_record_and_count_add_values(self):
+        """
+        Tests if Metrics.record and Metrics.count add the values of the stages
+        and the counters.
+        """
+        metrics = Metrics()
+        metrics.record("read", 0.5, 10, 100)
+        metrics.record("read", 0.25, 5)
+        metrics.record("clean", 0.125)
+        metrics.count("matches")
+        metrics.count("matches", 2)
+
+        result = metrics.as_dict()
+        assert result["seconds"] > 0
+        assert result["stages"] == {
+            "read": {"seconds": 0.75, "lines": 15, "bytes": 100},
+            "clean": {"seconds": 0.125, "lines": 0, "bytes": 0},
+        }
+        assert result["counters"] == {"matches": 3}
+
+    def test_merge_adds_other_metrics(self):
+        """
+        Tests if Metrics.merge adds the stages and the counters of another
+        Metrics, also after a round trip through pickle.
+        """
+        metrics, other = Metrics(), Metrics()
+        metrics.record("read", 0.5, 10, 100)
+        other.record("read", 0.25, 5, 50)
+        other.record("match", 0.125, 5, 50)
+        other.count("matches", 2)
+
+        metrics.merge(pickle.loads(pickle.dumps(other)))
+
+        result = metrics.as_dict()
+        assert result["stages"] == {
+            "read": {"seconds": 0.75, "lines": 15, "bytes": 150},
+            "match": {"seconds": 0.125, "lines": 5, "bytes": 50},
+        }
+        assert result["counters"] == {"matches": 2}
+
+    def test_to_prometheus_returns_text_format(self, tmp_path):
+        """
+        Tests the output of Metrics.to_prometheus and the file written by
+        Metrics.write_prometheus.
+        """
+        metrics = Metrics()
+        metrics.record("read", 0.5, 10, 100)
+        metrics.count("matches", 2)
+
+        text = metrics.to_prometheus(prefix="test")
+        lines = text.splitlines()
+        assert lines[:2] == [
+            "# HELP test_run_seconds Wall time of the run.",
+            "# TYPE test_run_seconds gauge",
+        ]
+        assert lines[3:] == [
+            "# HELP test_stage_seconds_total Wall time spent in each stage.",
+            "# TYPE test_stage_seconds_total counter",
+            'test_stage_seconds_total{stage="read"} 0.5',
+            "# HELP test_stage_lines_total Lines handled by each stage.",
+            "# TYPE test_stage_lines_total counter",
+            'test_stage_lines_total{stage="read"} 10',
+            "# HELP test_stage_bytes_total Bytes handled by each stage.",
+            "# TYPE test_stage_bytes_total counter",
+            'test_stage_bytes_total{stage="read"} 100',
+            "# HELP test_matches_total Number of matches.",
+            "# TYPE test_matches_total counter",
+            "test_matches_total 2",
+        ]
+
+        path = tmp_path / "metrics.prom"
+        metrics.write_prometheus(str(path), prefix="test")
+        with open(path, encoding="utf-8") as file_obj:
+            assert file_obj.read().splitlines()[3:] == lines[3:]
+        assert [child.name for child in tmp_path.iterdir()] == ["metrics.prom"]
@@ -13,5 +13,11 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=["click"],
-    entry_points={"console_scripts": ["solution = deepintest.scripts.solution:main"]},
+    extras_require={"numpy": ["numpy"]},
+    entry_points={
+        "console_scripts": [
+            "solution = deepintest.scripts.solution:main",
+            "deepintest = deepintest.scripts.commands:main",
+        ]
+    },
 )